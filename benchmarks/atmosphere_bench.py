@@ -0,0 +1,72 @@
+"""Cruise-only mission solve time with tabulated vs fitted atmosphere
+
+Usage:
+    python benchmarks/atmosphere_bench.py [--segments 4 8 16] [--repeat 3]
+
+Each mission flies level segments at fixed altitudes between 3 and 6 km.
+With altitudes passed to Mission, the atmosphere is tabulated; otherwise
+the same altitudes are substituted into the signomial atmosphere fits.
+Prints signomial constraint counts, SP iterations, solve times and costs;
+solves that fail are reported by exception name in the cost column.
+"""
+
+import argparse
+import time
+import warnings
+
+import numpy as np
+from cases import MISSION_SUBS
+from gpkit import units
+
+from gpkitmodels.SP.SimPleAC.SimPleAC_mission import Mission, SimPleAC
+
+
+def cruise_mission(altitudes, tabulated):
+    "level-flight mission at the given altitudes [m]"
+    m = Mission(
+        SimPleAC(),
+        len(altitudes),
+        altitudes=altitudes if tabulated else np.full(len(altitudes), np.nan),
+    )
+    m.substitutions.update(MISSION_SUBS)
+    m.substitutions[m.state.get_var("h")] = altitudes
+    m.cost = m.get_var("W_{f_m}") * units("1/N") + m.get_var("C_m") * m.get_var("t_m")
+    return m
+
+
+def run(altitudes, tabulated, repeat):
+    "(signomial constraints, SP iterations, best solve time, cost or error)"
+    times = []
+    for _ in range(repeat):
+        m = cruise_mission(altitudes, tabulated)
+        tic = time.perf_counter()
+        try:
+            sol = m.localsolve(verbosity=0)
+        except Exception as e:  # noqa: BLE001
+            return _n_signomial(m), 0, 0.0, type(e).__name__
+        times.append(time.perf_counter() - tic)
+    return _n_signomial(m), len(m.program.gps), min(times), "%.2f" % sol.cost
+
+
+def _n_signomial(m):
+    return sum(hasattr(c, "as_gpconstr") for c in m.flat())
+
+
+def main():
+    "command line entry point"
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--segments", type=int, nargs="+", default=[4, 8, 16])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    warnings.simplefilter("ignore")  # SP non-convergence chatter
+
+    print("%4s  %-9s %6s %6s %8s %10s" % ("N", "atmos", "SP", "iters", "solve", "cost"))
+    for N in args.segments:
+        altitudes = np.linspace(3000, 6000, N)
+        for tabulated, label in ((False, "fit"), (True, "table")):
+            n_sp, iters, dt, cost = run(altitudes, tabulated, args.repeat)
+            print("%4d  %-9s %6d %6d %7.3fs %10s" % (N, label, n_sp, iters, dt, cost))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Benchmark model factories, configured as in the component tests
+
+Each factory takes a size and returns (model, program, kwargs): the model
+to compile, "gp" or "sp", and keyword arguments for compiling and solving
+it the way the component's test does.
+"""
+
+from gpkit import Model, units
+
+from gpkitmodels.GP.aircraft.prop.prop_test import PropellerSizing
+from gpkitmodels.GP.aircraft.tail.horizontal_tail import HorizontalTail
+from gpkitmodels.GP.aircraft.tail.tail_boom import TailBoom
+from gpkitmodels.GP.aircraft.tail.tail_tests import EmpennageSizing
+from gpkitmodels.GP.aircraft.wing.wing_test import FlightState, WingSizing
+from gpkitmodels.SP.SimPleAC.SimPleAC import SimPleAC
+from gpkitmodels.SP.SimPleAC.SimPleAC_mission import Mission
+from gpkitmodels.SP.SimPleAC.SimPleAC_mission import SimPleAC as MissionAircraft
+from gpkitmodels.SP.SimPleAC.SimPleAC_multimission import Multimission
+
+BEAM_TIP_VARS = ["\\bar{M}_{tip}", "\\bar{\\delta}_{root}", "\\theta_{root}"]
+
+
+def wing(N):
+    "wing_test configuration with N spanwise stations"
+    return WingSizing(N), "gp", {}
+
+
+def empennage(N):
+    "tail_tests.test_emp configuration with an N-station tail boom"
+    return EmpennageSizing(N), "gp", {"use_leqs": False}
+
+
+def tailboom(N):
+    "an N-station tail boom sized for its own weight under horizontal tail load"
+    tb = TailBoom(N=N)
+    ht = HorizontalTail()
+    fs = FlightState()
+    tb.substitutions[tb.l] = 5
+    tbperf = tb.flight_model(tb, fs)
+    load = tb.tailLoad(tb, ht, fs)
+    m = Model(tb.W / units("lbf") + tbperf.Cf, [tb, fs, tbperf, load])
+    m.substitutions[ht.planform.S] = 4
+    for v in BEAM_TIP_VARS:
+        m.substitutions[load.beam.get_var(v)] = 1e-3
+    return m, "gp", {}
+
+
+def blade_element_prop(N):
+    "prop_test.ME_eta_test configuration with N blade elements"
+    return PropellerSizing(N), "sp", {"iteration_limit": 400}
+
+
+def simpleac(n):
+    "n independent SimPleAC designs for ranges from 1000 to 6000 km"
+    designs = [SimPleAC() for _ in range(n)]
+    for i, ac in enumerate(designs):
+        ac.substitutions[ac.get_var("Range")] = 1000 + 5000 * i / max(n - 1, 1)
+    m = Model(sum(ac.get_var("W_f") for ac in designs), designs)
+    return m, "sp", {}
+
+
+MISSION_SUBS = {
+    "h_{cruise_m}": 5000 * units("m"),
+    "Range_m": 3000 * units("km"),
+    "W_{p_m}": 3000 * units("N"),
+    "\\rho_{p_m}": 1500 * units("kg/m^3"),
+    "C_m": 120 * units("1/hr"),
+    "V_{min_m}": 35 * units("m/s"),
+    "T/O factor_m": 2,
+}
+
+
+def mission(Nsegments):
+    "SimPleAC_mission.test configuration with Nsegments flight segments"
+    m = Mission(MissionAircraft(), Nsegments)
+    m.substitutions.update(MISSION_SUBS)
+    m.cost = m.get_var("W_{f_m}") * units("1/N") + m.get_var("C_m") * m.get_var("t_m")
+    return m, "sp", {}
+
+
+def multimission(Nmissions, Nsegments=4, vectorized=False):
+    "Nmissions missions minimizing total fuel plus the cost of every flight time"
+    m = Multimission(MissionAircraft(), Nmissions, Nsegments, vectorized=vectorized)
+    m.substitutions.update(
+        {
+            m.hcruise: [5000] * Nmissions,
+            m.Range: [3000 - 1000 * (i % 2) for i in range(Nmissions)],
+            m.W_p: [6250 + 1750 * (i % 2) for i in range(Nmissions)],
+            m.rho_p: [1500 + 500 * (i % 2) for i in range(Nmissions)],
+            m.cost_index: [120 + 240 * (i % 2) for i in range(Nmissions)],
+        }
+    )
+    C, t = m.mission_var("cost_index"), m.mission_var("t_m")
+    m.cost = m.W_f_mm * units("1/N") + (C * t).sum()
+    return m, "sp", {}
+
+
+def vectorized_multimission(Nmissions, Nsegments=4):
+    "multimission with the missions vectorized into one Mission"
+    return multimission(Nmissions, Nsegments, vectorized=True)
+
+
+CASES = {
+    "Wing": (wing, (5, 10, 20, 40)),
+    "Empennage": (empennage, (5, 10, 20)),
+    "TailBoom": (tailboom, (5, 10, 20, 40)),
+    "BladeElementProp": (blade_element_prop, (3, 5, 10)),
+    "SimPleAC": (simpleac, (1, 3, 9)),
+    "Mission": (mission, (3, 4, 8, 16)),
+    "Multimission": (multimission, (1, 2, 4)),
+    "VectorizedMultimission": (vectorized_multimission, (1, 2, 4)),
+}
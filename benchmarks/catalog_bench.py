@@ -0,0 +1,65 @@
+"""Setup time, solve time and size of catalog models against their budgets
+
+Usage:
+    python benchmarks/catalog_bench.py [--repeat 3] [--record]
+
+Measures each catalog.toml model's default() the way test_catalog.py's
+timing check does with GPKITMODELS_TIME_BUDGETS=1 and prints the
+measurements, the recorded budgets and the limits the catalog's
+tolerances allow. With --record, also prints the measurements as
+catalog.toml lines to paste over the old budgets.
+"""
+
+import argparse
+import tomllib
+import warnings
+from pathlib import Path
+
+from gpkitmodels.tools.modelbudget import TOLERANCES, measure, over_budget
+
+CATALOG = Path(__file__).resolve().parents[1] / "catalog.toml"
+
+
+def main():
+    "command line entry point"
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--record", action="store_true")
+    args = parser.parse_args()
+    warnings.simplefilter("ignore")  # SP non-convergence chatter
+
+    with open(CATALOG, "rb") as f:
+        catalog = tomllib.load(f)
+    tolerances = dict(TOLERANCES, **catalog.get("budget_tolerances", {}))
+    print(
+        "%-18s %9s %9s %9s %9s %6s %6s  %s"
+        % ("id", "setup", "budget", "solve", "budget", "vars", "budget", "status")
+    )
+    records = []
+    for entry in catalog["models"]:
+        measured = measure(entry, args.repeat)
+        problems = over_budget(entry, measured, tolerances)
+        print(
+            "%-18s %8.3fs %8.3fs %8.3fs %8.3fs %6d %6d  %s"
+            % (
+                entry["id"],
+                measured["setup_time"],
+                entry.get("setup_time", float("nan")),
+                measured["solve_time"],
+                entry.get("solve_time", float("nan")),
+                measured["variables"],
+                entry.get("variables", 0),
+                "OVER" if problems else "ok",
+            )
+        )
+        records.append((entry["id"], measured))
+    if args.record:
+        for name, measured in records:
+            print("\n# %s" % name)
+            print("setup_time = %.3g" % measured["setup_time"])
+            print("solve_time = %.3g" % measured["solve_time"])
+            print("variables = %d" % measured["variables"])
+
+
+if __name__ == "__main__":
+    main()
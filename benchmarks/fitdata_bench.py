@@ -0,0 +1,91 @@
+"""Model construction time with pandas-parsed vs registry-cached fit data
+
+Usage: python benchmarks/fitdata_bench.py [repeats]
+"""
+
+import sys
+from contextlib import ExitStack
+from time import perf_counter
+from unittest.mock import patch
+
+import pandas as pd
+from gpkit import Vectorize
+
+from gpkitmodels.GP.aircraft.prop.propeller import Propeller
+from gpkitmodels.GP.aircraft.tail.empennage import Empennage
+from gpkitmodels.GP.aircraft.wing import wing as wing_module
+from gpkitmodels.GP.aircraft.wing.wing import Wing
+from gpkitmodels.GP.aircraft.wing.wing_test import FlightState
+from gpkitmodels.SP.aircraft.prop.propeller import BladeElementProp
+from gpkitmodels.tools.fitdata import (
+    clear_fitdata_cache,
+    fitdata_path,
+    load_fitdata,
+)
+
+# modules whose setup() loads fit data, patched to the pre-registry behaviour
+LOADERS = [
+    "gpkitmodels.GP.aircraft.wing.wing.load_fitdata",
+    "gpkitmodels.GP.aircraft.wing.gustloading.load_fitdata",
+    "gpkitmodels.GP.aircraft.tail.tail_aero.load_fitdata",
+    "gpkitmodels.GP.aircraft.engine.gas_engine.load_fitdata",
+    "gpkitmodels.SP.aircraft.prop.propeller.load_fitdata",
+]
+
+
+def pandas_fitdata(path):
+    "the per-instantiation parse that setup() used before the registry"
+    return pd.read_csv(path).to_dict(orient="records")[0]
+
+
+def build(nsegments):
+    "a vectorized wing, tail and propeller flight model set"
+    wing = Wing()
+    emp = Empennage()
+    prop = Propeller()
+    with Vectorize(nsegments):
+        fs = FlightState()
+        models = [
+            wing.flight_model(wing, fs),
+            emp.htail.flight_model(emp.htail, fs),
+            emp.vtail.flight_model(emp.vtail, fs),
+        ]
+    fs = FlightState()
+    models += [wing.spar.gustloading(wing, fs), BladeElementProp(prop, fs)]
+    return models
+
+
+def timeit(fn, repeats):
+    "best-of wall time in seconds"
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = perf_counter()
+        fn()
+        best = min(best, perf_counter() - t0)
+    return best
+
+
+def main(repeats=5):
+    "print construction times for each fit loading strategy"
+    path = fitdata_path(wing_module.__file__, "jho_fitdata.csv")
+    parse = timeit(lambda: pandas_fitdata(path), repeats)
+    clear_fitdata_cache()
+    load_fitdata(path)
+    cached = timeit(lambda: load_fitdata(path), repeats)
+    print(f"single fit load: pandas {parse * 1e6:.0f} us, cached {cached * 1e6:.2f} us")
+    print(f"{'segments':>8} {'pandas [ms]':>12} {'cached [ms]':>12} {'speedup':>8}")
+    for nseg in [1, 5, 20, 50]:
+        with ExitStack() as stack:
+            for target in LOADERS:
+                stack.enter_context(patch(target, pandas_fitdata))
+            before = timeit(lambda n=nseg: build(n), repeats)
+        clear_fitdata_cache()
+        after = timeit(lambda n=nseg: build(n), repeats)
+        print(
+            f"{nseg:>8} {before * 1e3:>12.1f} {after * 1e3:>12.1f}"
+            f" {before / after:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
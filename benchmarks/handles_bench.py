@@ -0,0 +1,78 @@
+"""Variable lookup by name vs by handle in the SimPleAC mission models
+
+Usage:
+    python benchmarks/handles_bench.py [--segments 4 16 64] [--number 200]
+
+For Missions of increasing size, times looking up variables the models
+use from each other by name (`get_var`, as the models used to) and
+through their attribute handles, and prints the time to build the Mission.
+Lookups of vector variables by name scan the model's variables, so they
+slow down as the model grows; handle lookups don't.
+"""
+
+import argparse
+import timeit
+
+from gpkitmodels.SP.SimPleAC.SimPleAC_mission import Mission, SimPleAC
+
+# (submodel path, variable name, handle) of lookups Mission.setup makes
+LOOKUPS = [
+    ("state", "\\rho", "rho"),
+    ("state", "h", "alt"),
+    ("aircraft", "W", "W"),
+    ("aircraft.wing", "S", "S"),
+    ("aircraft.fuse", "W_{fuse}", "W_fuse"),
+    ("aircraft.engine", "P_{shaft,max}", "P_shaft_max"),
+    ("aircraftP", "V", "V"),
+    ("aircraftP.wingP", "C_L", "C_L"),
+    ("aircraftP.engineP", "BSFC", "BSFC"),
+    ("aircraftP.engineP", "P_{shaft}", "P_shaft"),
+]
+
+
+def submodel(m, path):
+    "the submodel of m at a dotted attribute path"
+    for attr in path.split("."):
+        m = getattr(m, attr)
+    return m
+
+
+def main():
+    "command line entry point"
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--segments", type=int, nargs="+", default=[4, 16, 64])
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    print(
+        "%8s %10s %14s %14s %10s"
+        % ("segments", "variables", "by name [us]", "handle [us]", "build [s]")
+    )
+    aircraft = SimPleAC()
+    for N in args.segments:
+        build = min(timeit.repeat(lambda: Mission(aircraft, N), number=1, repeat=3))
+        m = Mission(aircraft, N)
+        lookups = [(submodel(m, path), name, attr) for path, name, attr in LOOKUPS]
+        by_name = min(
+            timeit.repeat(
+                lambda: [model.get_var(name) for model, name, _ in lookups],
+                number=args.number,
+                repeat=3,
+            )
+        )
+        handle = min(
+            timeit.repeat(
+                lambda: [getattr(model, attr) for model, _, attr in lookups],
+                number=args.number,
+                repeat=3,
+            )
+        )
+        scale = 1e6 / args.number / len(LOOKUPS)
+        print(
+            "%8d %10d %14.1f %14.2f %10.3f"
+            % (N, len(m.vks), by_name * scale, handle * scale, build)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Import time of gpkitmodels runtime modules against their budgets
+
+Usage:
+    python benchmarks/import_bench.py [--repeat 5]
+
+Imports gpkit and then each module in gpkitmodels.tools.importtime.BUDGETS
+in fresh interpreters, and prints the fastest time each import adds, its
+budget (checked by test_importtime.py when GPKITMODELS_TIME_BUDGETS is
+set) and any heavy packages loaded.
+"""
+
+import argparse
+
+from gpkitmodels.tools.importtime import BUDGETS, measure
+
+
+def main():
+    "command line entry point"
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    result = measure(repeat=args.repeat)
+    print("%-55s %8.1f ms" % ("gpkit", 1e3 * result["gpkit"]))
+    total = 0.0
+    for name, seconds in result["modules"].items():
+        total += seconds
+        print(
+            "%-55s %8.1f ms  budget %4.0f ms  %s"
+            % (
+                name,
+                1e3 * seconds,
+                1e3 * BUDGETS[name],
+                ", ".join(result["heavy"][name]),
+            )
+        )
+    print("%-55s %8.1f ms" % ("gpkitmodels total over gpkit", 1e3 * total))
+
+
+if __name__ == "__main__":
+    main()
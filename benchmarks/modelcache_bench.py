@@ -0,0 +1,111 @@
+"""Time to build benchmark models against loading them from a ModelCache
+
+Usage:
+    python benchmarks/modelcache_bench.py [--repeat 3] [--cases Wing Mission]
+
+For the largest size of each case, prints the fastest setup time, the
+fastest load of the stored IR, and both again in fresh interpreters (the
+start of a new process, where nothing is cached in memory yet), along with
+the stored entry's size. Linked substitutions are stored frozen.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import cases
+from gpkit.util.globals import NamedVariables
+
+from gpkitmodels.tools.modelcache import ModelCache
+
+# times one build or cache.get in a new interpreter
+_PROBE = """
+import sys, time
+sys.path.insert(0, %r)
+from modelcache_bench import model, open_cache
+cache = open_cache(sys.argv[1])
+name, size = sys.argv[3], int(sys.argv[4])
+tic = time.perf_counter()
+model(name, size) if sys.argv[2] == "build" else cache.get(model, name, size)
+print(time.perf_counter() - tic)
+"""
+
+
+def model(name, size):
+    "the model of a benchmark case"
+    return cases.CASES[name][0](size)[0]
+
+
+def open_cache(directory):
+    "the benchmark's cache in directory"
+    return ModelCache(directory, freeze_linked=True, sources=[cases.__file__])
+
+
+def best(fn, repeat):
+    "fastest of repeat calls, in seconds"
+    times = []
+    for _ in range(repeat):
+        NamedVariables.reset_modelnumbers()
+        tic = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - tic)
+    return min(times)
+
+
+def fresh(directory, mode, name, size):
+    "seconds for one build or load in a new interpreter"
+    probe = _PROBE % os.path.dirname(os.path.abspath(__file__))
+    out = subprocess.run(
+        [sys.executable, "-c", probe, directory, mode, name, str(size)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(out.stdout.split()[-1])
+
+
+def main():
+    "command line entry point"
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--cases", nargs="+", default=list(cases.CASES))
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    cache = open_cache(directory)
+    print(
+        "%-22s %5s %9s %9s %6s %9s %9s %6s %8s"
+        % ("case", "size", "build", "load", "x", "new build", "new load", "x", "kB")
+    )
+    for name in args.cases:
+        size = cases.CASES[name][1][-1]
+        cache.get(model, name, size)  # store it
+        build = best(lambda: model(name, size), args.repeat)  # noqa: B023
+        load = best(lambda: cache.get(model, name, size), args.repeat)  # noqa: B023
+        new_build = min(
+            fresh(directory, "build", name, size) for _ in range(args.repeat)
+        )
+        new_load = min(fresh(directory, "load", name, size) for _ in range(args.repeat))
+        path = os.path.join(directory, cache.key(model, (name, size)) + ".json")
+        print(
+            "%-22s %5d %8.3fs %8.3fs %6.2f %8.3fs %8.3fs %6.2f %8.0f"
+            % (
+                name,
+                size,
+                build,
+                load,
+                build / load,
+                new_build,
+                new_load,
+                new_build / new_load,
+                os.path.getsize(path) / 1e3,
+            )
+        )
+    print("cache hits %d, misses %d" % (cache.hits, cache.misses))
+
+
+if __name__ == "__main__":
+    main()
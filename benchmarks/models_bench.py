@@ -0,0 +1,144 @@
+"""Setup, compile and solve time for each packaged component at several sizes
+
+Usage:
+    python benchmarks/models_bench.py [-o results.json] [--compare old.json]
+                                      [--repeat N] [--cases Wing Mission ...]
+
+Each case is timed in four phases: setup (building the Model), compile
+(forming the GP or SP), solve, and process (post-solve checks such as fit
+bounds). The fastest of --repeat runs is kept. Results are written as JSON;
+--compare prints the ratio of each phase to a previous results file.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import gpkit
+from cases import CASES
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def run_case(factory, size):
+    "time one build/compile/solve; returns a dict of phase times and stats"
+    row = {}
+    try:
+        tic = time.perf_counter()
+        m, program, kwargs = factory(size)
+        row["setup"] = time.perf_counter() - tic
+        tic = time.perf_counter()
+        prog = getattr(m, program)(**kwargs)
+        row["compile"] = time.perf_counter() - tic
+        tic = time.perf_counter()
+        solve = prog.solve if program == "gp" else prog.localsolve
+        result = solve(verbosity=0, **kwargs)
+        row["solve"] = time.perf_counter() - tic
+        tic = time.perf_counter()
+        m.process_result(result)
+        row["process"] = time.perf_counter() - tic
+    except Exception as err:  # noqa: BLE001
+        row["error"] = "%s: %s" % (type(err).__name__, str(err).splitlines()[0])
+        return row
+    row["cost"] = float(getattr(result.cost, "magnitude", result.cost))
+    row["n_free"] = m.n_free
+    row["n_constraints"] = m.n_constraints
+    if program == "sp":
+        row["sp_iterations"] = len(prog.gps)
+    return row
+
+
+def run(names, repeat=1):
+    "benchmark each size of each named case; returns a list of result rows"
+    rows = []
+    for name in names:
+        factory, sizes = CASES[name]
+        for size in sizes:
+            runs = [run_case(factory, size) for _ in range(repeat)]
+            best = dict(runs[0])
+            for phase in ("setup", "compile", "solve", "process"):
+                times = [r[phase] for r in runs if phase in r]
+                if times:
+                    best[phase] = min(times)
+            best.update(model=name, size=size)
+            rows.append(best)
+            print(_format(best), flush=True)
+    return rows
+
+
+def _format(row):
+    phases = "  ".join(
+        "%s %7.3fs" % (p, row[p])
+        for p in ("setup", "compile", "solve", "process")
+        if p in row
+    )
+    line = "%-17s %4d  %s" % (row["model"], row["size"], phases)
+    if "error" in row:
+        line += "  (%s)" % row["error"]
+    return line
+
+
+def compare(rows, old_rows):
+    "print phase time ratios new/old for rows present in both"
+    old = {(r["model"], r["size"]): r for r in old_rows}
+    print("\nratio to previous results (new/old):")
+    for row in rows:
+        prev = old.get((row["model"], row["size"]))
+        if prev is None:
+            continue
+        ratios = "  ".join(
+            "%s %5.2fx" % (p, row[p] / prev[p])
+            for p in ("setup", "compile", "solve", "process")
+            if row.get(p) and prev.get(p)
+        )
+        print("%-17s %4d  %s" % (row["model"], row["size"], ratios))
+
+
+def main(argv=None):
+    "command line entry point"
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-o", "--output", default="models_bench.json")
+    parser.add_argument("--compare", help="previous results file")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--cases", nargs="*", default=list(CASES), choices=CASES)
+    args = parser.parse_args(argv)
+
+    rows = run(args.cases, args.repeat)
+    results = {
+        "meta": {
+            "commit": _git_commit(),
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "gpkit": getattr(gpkit, "__version__", None),
+            "solver": gpkit.settings.get("default_solver"),
+            "repeat": args.repeat,
+        },
+        "results": rows,
+    }
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=1)
+    print("wrote %s" % args.output)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(rows, json.load(f)["results"])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
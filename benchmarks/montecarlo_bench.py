@@ -0,0 +1,92 @@
+"""Throughput of Monte Carlo sampling of a fixed SimPleAC design
+
+Usage:
+    python benchmarks/montecarlo_bench.py [--samples 10000] [--workers 1 2]
+
+Fixes SimPleAC's wing (A and S) at its nominal optimum and samples its 12
+`pr`-tagged constants. Prints the percentiles of the fuel weight as the
+samples come in, then samples per second and speedup over one worker,
+and the time per sample of rebuilding and localsolving the model instead.
+"""
+
+import argparse
+import os
+import time
+import warnings
+
+from gpkitmodels.SP.SimPleAC.SimPleAC import SimPleAC
+from gpkitmodels.tools.montecarlo import MonteCarlo, sample
+from gpkitmodels.tools.warmstart import canonical_names
+
+DESIGN = ["A", "S"]
+
+
+def simpleac():
+    "the default SimPleAC"
+    return SimPleAC.default()
+
+
+def rebuild_each_sample(mc, n):
+    "baseline: build, fix and localsolve a new model for every sample"
+    for factors in sample(list(mc.prs.values()), n, mc.distribution, mc.seed):
+        m = simpleac()
+        keys = {name: vk for vk, name in canonical_names(m.varkeys).items()}
+        for name, value in mc.design.items():
+            m.substitutions[keys[name]] = value
+        for name, factor in zip(mc.prs, factors):
+            m.substitutions[keys[name]] = m.substitutions[keys[name]] * factor
+        try:
+            m.localsolve(verbosity=0)
+        except Exception:  # noqa: BLE001, S112
+            continue
+
+
+def main():
+    "command line entry point"
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=10000)
+    parser.add_argument("--chunk", type=int, default=100)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2])
+    parser.add_argument("--rebuilds", type=int, default=20)
+    args = parser.parse_args()
+    warnings.simplefilter("ignore")  # SP non-convergence chatter
+    print("cpus: %d" % os.cpu_count())
+    mc = MonteCarlo(simpleac, design=DESIGN, outputs=["W_f"])
+
+    rates = {}
+    for workers in args.workers:
+        print("%d workers" % workers)
+        print(
+            "%8s %7s %9s %9s %9s %9s"
+            % ("samples", "failed", "W_f 5%", "50%", "95%", "s")
+        )
+        tic = time.perf_counter()
+        for stats in mc.run(args.samples, args.chunk, max_workers=workers):
+            W_f = stats["outputs"]["W_f"]
+            print(
+                "%8d %7d %9.1f %9.1f %9.1f %9.1f"
+                % (
+                    stats["samples"],
+                    stats["failed"],
+                    W_f[5],
+                    W_f[50],
+                    W_f[95],
+                    time.perf_counter() - tic,
+                )
+            )
+        rates[workers] = stats["samples"] / (time.perf_counter() - tic)
+    base = rates[args.workers[0]]
+    print("%8s %12s %8s" % ("workers", "samples/s", "speedup"))
+    for workers, rate in rates.items():
+        print("%8d %12.1f %7.2fx" % (workers, rate, rate / base))
+
+    tic = time.perf_counter()
+    rebuild_each_sample(mc, args.rebuilds)
+    print(
+        "rebuild and localsolve: %.3fs per sample"
+        % ((time.perf_counter() - tic) / args.rebuilds)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Setup and solve time of per-mission vs vectorized Multimission
+
+Usage:
+    python benchmarks/multimission_bench.py [--missions 1 2 5 10 20 50]
+        [--solve 1 2] [--segments 4]
+
+Builds Multimission with separately built missions and with one Mission
+vectorized over the missions, and prints setup time, variable and
+constraint counts for each. For the sizes in --solve it also solves both
+and prints the solve times and the relative difference between the costs.
+"""
+
+import argparse
+import time
+import warnings
+
+from cases import multimission
+
+
+def build(Nmissions, Nsegments, vectorized):
+    "(model, setup seconds)"
+    tic = time.perf_counter()
+    m = multimission(Nmissions, Nsegments, vectorized=vectorized)[0]
+    return m, time.perf_counter() - tic
+
+
+def solve(m):
+    "(cost, solve seconds), or (exception name, seconds) if the solve fails"
+    tic = time.perf_counter()
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            cost = m.localsolve(verbosity=0).cost
+    except Exception as e:  # noqa: BLE001
+        cost = type(e).__name__
+    return cost, time.perf_counter() - tic
+
+
+def main():
+    "command line entry point"
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--missions", type=int, nargs="+", default=[1, 2, 5, 10, 20, 50]
+    )
+    parser.add_argument("--solve", type=int, nargs="*", default=[1, 2])
+    parser.add_argument("--segments", type=int, default=4)
+    args = parser.parse_args()
+
+    print(
+        "%8s %11s %8s %8s %9s %9s %9s"
+        % ("missions", "mode", "setup", "vars", "constrs", "solve", "cost")
+    )
+    for N in args.missions:
+        costs = []
+        for vectorized in (False, True):
+            m, t_setup = build(N, args.segments, vectorized)
+            cost, t_solve = solve(m) if N in args.solve else ("", float("nan"))
+            costs.append(cost)
+            print(
+                "%8d %11s %7.2fs %8d %9d %8.2fs %9s"
+                % (
+                    N,
+                    "vectorized" if vectorized else "per-mission",
+                    t_setup,
+                    len(m.vks),
+                    len(list(m.flat())),
+                    t_solve,
+                    "%.6g" % cost if isinstance(cost, float) else cost,
+                )
+            )
+        if all(isinstance(c, float) for c in costs):
+            print("%8s cost difference %.2e" % ("", abs(costs[1] / costs[0] - 1)))
+
+
+if __name__ == "__main__":
+    main()
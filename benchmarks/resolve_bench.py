@@ -0,0 +1,77 @@
+"""Per-point time of re-solving GP wing and tail models with new constants
+
+Usage:
+    python benchmarks/resolve_bench.py [--points 10] [--cases Wing Empennage]
+
+Sweeps the flight speed V of each case and prints the time per point of
+rebuilding the model, of updating its substitutions and solving it again,
+and of a Resolver, along with the solver's share of the Resolver's time.
+"""
+
+import argparse
+import time
+
+import cases
+import numpy as np
+
+from gpkitmodels.tools.resolve import Resolver
+
+
+def per_point(fn, points):
+    "mean seconds of fn(point) over points"
+    tic = time.perf_counter()
+    for point in points:
+        fn(point)
+    return (time.perf_counter() - tic) / len(points)
+
+
+def main():
+    "command line entry point"
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=int, default=10)
+    parser.add_argument("--cases", nargs="+", default=["Wing", "Empennage"])
+    args = parser.parse_args()
+    speeds = np.linspace(30, 60, args.points)
+
+    print(
+        "%-10s %4s %9s %9s %9s %9s %7s"
+        % ("case", "N", "rebuild", "re-solve", "resolver", "solver", "solver%")
+    )
+    for name in args.cases:
+        factory, sizes = cases.CASES[name]
+        for N in sizes[:-1]:
+            m, _, kwargs = factory(N)
+
+            def rebuild(V):
+                model, _, kwargs = factory(N)  # noqa: B023
+                model.substitutions[model.state.V] = V
+                model.solve(verbosity=0, **kwargs)
+
+            def resolve(V):
+                m.substitutions[m.state.V] = V  # noqa: B023
+                m.solve(verbosity=0, **kwargs)  # noqa: B023
+
+            resolver = Resolver(m, [m.state.V], **kwargs)
+            soltimes = []
+            resolved = per_point(
+                lambda V: soltimes.append(
+                    resolver.solve({m.state.V: V}).meta["soltime"]  # noqa: B023
+                ),
+                speeds,
+            )
+            print(
+                "%-10s %4d %8.3fs %8.3fs %8.3fs %8.3fs %6.1f%%"
+                % (
+                    name,
+                    N,
+                    per_point(rebuild, speeds),
+                    per_point(resolve, speeds),
+                    resolved,
+                    np.mean(soltimes),
+                    100 * np.mean(soltimes) / resolved,
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
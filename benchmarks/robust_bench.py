@@ -0,0 +1,85 @@
+"""Robust SimPleAC designs from one solve against Monte Carlo sampling
+
+Usage:
+    python benchmarks/robust_bench.py [--samples 500] [--gammas 0.5 1]
+
+Sizes SimPleAC nominally and robustly to its `pr` uncertainties (box and
+ellipsoidal, scaled by each gamma), then fixes each design's wing (A and
+S) and samples it with gpkitmodels.tools.montecarlo. Prints each design's
+time to size, its cost premium over nominal, and its sampled failure rate
+and fuel-weight percentiles with the time sampling took.
+"""
+
+import argparse
+import time
+import warnings
+
+from gpkitmodels.SP.SimPleAC.SimPleAC import SimPleAC
+from gpkitmodels.tools.montecarlo import MonteCarlo
+from gpkitmodels.tools.robust import price_of_robustness
+
+DESIGN = ["A", "S"]
+
+
+def simpleac():
+    "the default SimPleAC"
+    return SimPleAC.default()
+
+
+def main():
+    "command line entry point"
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=500)
+    parser.add_argument("--gammas", type=float, nargs="+", default=[0.5, 1.0])
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+    warnings.simplefilter("ignore")  # SP non-convergence chatter
+
+    designs = [("nominal", 0.0)]
+    designs += [(u, g) for u in ("box", "ellipsoidal") for g in args.gammas]
+    print(
+        "%-12s %5s %8s %8s %8s %9s %9s %9s %8s"
+        % (
+            "design",
+            "gamma",
+            "size",
+            "premium",
+            "failed",
+            "W_f 5%",
+            "50%",
+            "95%",
+            "sample",
+        )
+    )
+    for uncertainty, gamma in designs:
+        tic = time.perf_counter()
+        price = price_of_robustness(
+            simpleac(),
+            DESIGN,
+            "box" if uncertainty == "nominal" else uncertainty,
+            gamma,
+        )
+        sized = time.perf_counter() - tic
+        design = {name: price["robust"][name] for name in DESIGN}
+        tic = time.perf_counter()
+        mc = MonteCarlo(simpleac, design=design, outputs=["W_f"])
+        *_, stats = mc.run(args.samples, max_workers=args.workers, rtol=0)
+        W_f = stats["outputs"]["W_f"]
+        print(
+            "%-12s %5.2f %7.2fs %7.1f%% %7.1f%% %9.1f %9.1f %9.1f %7.1fs"
+            % (
+                uncertainty,
+                gamma,
+                sized,
+                100 * price["premium"],
+                100 * stats["failed"] / stats["samples"],
+                W_f[5],
+                W_f[50],
+                W_f[95],
+                time.perf_counter() - tic,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Wing cost error against station count for spacings and adaptive meshes
+
+Usage:
+    python benchmarks/stations_bench.py [--sizes 5 8 12 16] [--reference 40]
+                                        [--tol 5e-4]
+
+Solves the wing_test configuration with uniform stations at --reference
+for a reference cost, then with each spacing in stations.SPACINGS at
+each size and with stations.adapt, printing each mesh's relative cost
+error and solve time. Ends with the fewest stations each method needed
+to come within --tol of the reference.
+"""
+
+import argparse
+import time
+
+from gpkitmodels.GP.aircraft.wing.stations import SPACINGS, adapt, spacing
+from gpkitmodels.GP.aircraft.wing.wing_test import WingSizing
+
+
+def solve(eta):
+    "(cost, seconds) of the wing_test configuration with stations eta"
+    tic = time.perf_counter()
+    cost = WingSizing(eta=eta).solve(verbosity=0).cost
+    return cost, time.perf_counter() - tic
+
+
+def main():
+    "command line entry point"
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 8, 12, 16])
+    parser.add_argument("--reference", type=int, default=40)
+    parser.add_argument("--tol", type=float, default=5e-4)
+    parser.add_argument("--max-stations", type=int, default=24)
+    args = parser.parse_args()
+
+    ref, seconds = solve(spacing(args.reference))
+    print(
+        "reference: %d uniform stations, cost %.6g (%.1fs)"
+        % (args.reference, ref, seconds)
+    )
+    print("%-11s %4s %10s %8s" % ("stations", "N", "error", "solve"))
+    fewest = {}
+    for kind in SPACINGS:
+        for N in args.sizes:
+            cost, seconds = solve(spacing(N, kind))
+            error = abs(cost / ref - 1)
+            print("%-11s %4d %10.2e %7.2fs" % (kind, N, error, seconds))
+            if error < args.tol:
+                fewest.setdefault(kind, N)
+    tic = time.perf_counter()
+    for eta, sol in adapt(
+        lambda eta: WingSizing(eta=eta), tol=0, max_stations=args.max_stations
+    ):
+        error = abs(sol.cost / ref - 1)
+        print(
+            "%-11s %4d %10.2e %7.2fs"
+            % ("adapt", len(eta), error, time.perf_counter() - tic)
+        )
+        if error < args.tol:
+            fewest.setdefault("adapt", len(eta))
+        tic = time.perf_counter()
+    print("fewest stations within %.1e:" % args.tol)
+    for kind in (*SPACINGS, "adapt"):
+        print("%-11s %s" % (kind, fewest.get(kind, "-")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Double-counting checks of SummingConstraintSet on large assemblies
+
+Usage:
+    python benchmarks/summing_bench.py [--components 100 300 1000] [--parts 10]
+
+Builds an assembly of N components, each summing the weights of its
+parts, whose total weight sums every component and every part, so that
+the parts must be recognized as already summed. Prints the build time,
+which includes indexing what each component sums, and the time to look
+that up again for every component.
+"""
+
+import argparse
+import time
+
+from gpkit import Model, Var
+
+from gpkitmodels.tools.summing_constraintset import (
+    SummingConstraintSet,
+    already_summed,
+)
+
+
+class Part(Model):
+    "a part of given weight"
+
+    W = Var("lbf", "weight", value=1)
+
+    def setup(self):
+        return []
+
+
+class Component(Model):
+    "a component weighing as much as its parts"
+
+    W = Var("lbf", "weight")
+
+    def setup(self, Nparts):
+        self.parts = [Part() for _ in range(Nparts)]
+        return [SummingConstraintSet(self.W, "W", self.parts), self.parts]
+
+
+class Assembly(Model):
+    "an assembly weighing as much as its components and their parts"
+
+    W = Var("lbf", "weight")
+
+    def setup(self, N, Nparts):
+        self.components = [Component(Nparts) for _ in range(N)]
+        parts = [p for c in self.components for p in c.parts]
+        return [
+            SummingConstraintSet(self.W, "W", self.components + parts),
+            self.components,
+        ]
+
+
+def timed(fn, *args):
+    "(result, seconds)"
+    tic = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - tic
+
+
+def main():
+    "command line entry point"
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--components", type=int, nargs="+", default=[100, 300, 1000])
+    parser.add_argument("--parts", type=int, default=10)
+    args = parser.parse_args()
+
+    print(
+        "%10s %11s %10s %11s" % ("components", "constraints", "build [s]", "lookup [s]")
+    )
+    for N in args.components:
+        m, t_build = timed(Assembly, N, args.parts)
+        summed, t_summed = timed(
+            lambda cs: [already_summed(c) for c in cs], m.components
+        )
+        assert all(len(s) == args.parts for s in summed)
+        print("%10d %11d %10.2f %11.6f" % (N, len(list(m.flat())), t_build, t_summed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Throughput of gpkitmodels.tools.sweep on a SimPleAC mission sweep
+
+Usage:
+    python benchmarks/sweep_bench.py [--points 24] [--workers 1 2 4]
+
+Sweeps Range_m and W_{p_m} for a 4-segment SimPleAC mission at each worker
+count and prints points per second and speedup over one worker. The
+one-worker sweep is also compared with rebuilding the model at every
+point, the cost the sweep runner avoids.
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+from cases import mission
+
+from gpkitmodels.tools.sweep import grid_points, sweep
+
+
+def make_mission():
+    "the benchmark Mission case with 4 segments"
+    return mission(4)[0]
+
+
+def grid(npoints):
+    "Range_m x W_{p_m} grid of about npoints points"
+    n = max(int(npoints**0.5), 1)
+    return {
+        "Range_m": np.linspace(1000, 4000, n),
+        "W_{p_m}": np.linspace(2000, 4000, max(npoints // n, 1)),
+    }
+
+
+def rebuild_each_point(points):
+    "baseline: build and solve a new model for every point"
+    for point in points:
+        m = make_mission()
+        m.substitutions.update(point)
+        try:
+            m.localsolve(verbosity=0)
+        except Exception:  # noqa: BLE001, S110
+            pass
+
+
+def main():
+    "command line entry point"
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=int, default=24)
+    parser.add_argument("--workers", type=int, nargs="+", default=None)
+    args = parser.parse_args()
+    workers = args.workers or sorted({1, 2, os.cpu_count() or 1})
+    g = grid(args.points)
+    npoints = len(g["Range_m"]) * len(g["W_{p_m}"])
+    print("%d points, %d cores" % (npoints, os.cpu_count()))
+
+    base = None
+    for w in workers:
+        tic = time.perf_counter()
+        records = sweep(make_mission, g, max_workers=w)
+        dt = time.perf_counter() - tic
+        base = base or dt
+        failed = sum("error" in r for r in records)
+        print(
+            "%2d workers: %6.2fs  %5.2f points/s  speedup %4.2fx  (%d failed)"
+            % (w, dt, npoints / dt, base / dt, failed)
+        )
+
+    tic = time.perf_counter()
+    rebuild_each_point(grid_points(g))
+    dt = time.perf_counter() - tic
+    print("rebuild per point: %6.2fs  %5.2f points/s" % (dt, npoints / dt))
+
+
+if __name__ == "__main__":
+    main()
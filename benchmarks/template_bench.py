@@ -0,0 +1,63 @@
+"""Setup time of Multimission missions built by setup vs cloned from a template
+
+Usage:
+    python benchmarks/template_bench.py [--missions 1 5 20 50 100] [--segments 4]
+
+For each number of missions, times building that many SimPleAC missions
+around one shared aircraft by calling Mission's setup each time and by
+cloning the first from a Template, then times the whole Multimission
+(which clones) for reference.
+"""
+
+import argparse
+import time
+
+from gpkitmodels.SP.SimPleAC.SimPleAC_mission import Mission, SimPleAC
+from gpkitmodels.SP.SimPleAC.SimPleAC_multimission import Multimission
+from gpkitmodels.tools.template import Template
+
+
+def setup_loop(aircraft, Nmissions, Nsegments):
+    "missions built by setup"
+    return [
+        Mission(aircraft, Nsegments, include_aircraft=False) for _ in range(Nmissions)
+    ]
+
+
+def clone_loop(aircraft, Nmissions, Nsegments):
+    "missions cloned from the first"
+    template = Template(Mission(aircraft, Nsegments, include_aircraft=False))
+    return [template.model] + [template.clone() for _ in range(1, Nmissions)]
+
+
+def timed(fn, *args):
+    "seconds taken by fn(*args)"
+    tic = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - tic
+
+
+def main():
+    "command line entry point"
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--missions", type=int, nargs="+", default=[1, 5, 20, 50, 100])
+    parser.add_argument("--segments", type=int, default=4)
+    args = parser.parse_args()
+
+    print(
+        "%8s %10s %10s %8s %14s"
+        % ("missions", "setup [s]", "clone [s]", "speedup", "Multimission")
+    )
+    for N in args.missions:
+        aircraft = SimPleAC()
+        t_setup = timed(setup_loop, aircraft, N, args.segments)
+        t_clone = timed(clone_loop, aircraft, N, args.segments)
+        t_mm = timed(Multimission, SimPleAC(), N, args.segments)
+        print(
+            "%8d %10.2f %10.2f %7.1fx %12.2f s"
+            % (N, t_setup, t_clone, t_setup / t_clone, t_mm)
+        )
+
+
+if __name__ == "__main__":
+    main()
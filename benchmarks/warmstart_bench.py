@@ -0,0 +1,58 @@
+"""SP iterations and time of cold vs warm-started mission sweeps
+
+Usage:
+    python benchmarks/warmstart_bench.py [--points 13] [--segments 4]
+
+Sweeps Range_m for a SimPleAC mission, once solving every point from
+scratch and once through a WarmStartStore, and prints the SP iteration
+counts, total solve time and the largest cost difference between the two.
+"""
+
+import argparse
+import time
+import warnings
+
+import numpy as np
+from cases import mission
+
+from gpkitmodels.tools.warmstart import WarmStartStore
+
+
+def run(ranges, segments, store=None):
+    "solve the mission at each range; returns (costs, iterations, seconds)"
+    m = mission(segments)[0]
+    costs, iterations = [], []
+    tic = time.perf_counter()
+    for Range in ranges:
+        m.substitutions["Range_m"] = Range
+        if store is None:
+            sol = m.localsolve(verbosity=0)
+        else:
+            sol = store.localsolve(m, verbosity=0)
+        costs.append(sol.cost)
+        iterations.append(len(m.program.gps))
+    return np.array(costs), iterations, time.perf_counter() - tic
+
+
+def main():
+    "command line entry point"
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=int, default=13)
+    parser.add_argument("--segments", type=int, default=4)
+    args = parser.parse_args()
+    warnings.simplefilter("ignore")  # SP non-convergence chatter
+    ranges = np.linspace(1000, 4000, args.points)
+
+    cold, cold_its, cold_t = run(ranges, args.segments)
+    store = WarmStartStore()
+    warm, warm_its, warm_t = run(ranges, args.segments, store)
+    print("%d points, %d segments" % (len(ranges), args.segments))
+    print("cold: %3d SP iterations  %6.2fs" % (sum(cold_its), cold_t))
+    print("warm: %3d SP iterations  %6.2fs" % (sum(warm_its), warm_t))
+    print("iterations per point: cold %s" % cold_its)
+    print("                      warm %s" % warm_its)
+    print("max relative cost difference: %.2e" % np.max(np.abs(warm / cold - 1)))
+
+
+if __name__ == "__main__":
+    main()
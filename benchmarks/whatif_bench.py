@@ -0,0 +1,74 @@
+"""What-if answers from sensitivities against localsolving each question
+
+Usage:
+    python benchmarks/whatif_bench.py [--questions 200] [--checks 10]
+
+Asks a 4-segment SimPleAC mission random "what if W_{p_m} and Range_m
+change by up to 8%" questions and prints the time per predicted answer,
+how many needed a solve, and for the first few, the predicted cost's
+actual relative error (from a localsolve) beside its estimate.
+"""
+
+import argparse
+import time
+import warnings
+
+import numpy as np
+from cases import mission
+
+from gpkitmodels.tools.whatif import WhatIf
+
+PARAMS = ["W_{p_m}", "Range_m"]
+
+
+def main():
+    "command line entry point"
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--questions", type=int, default=200)
+    parser.add_argument("--checks", type=int, default=10)
+    args = parser.parse_args()
+    warnings.simplefilter("ignore")  # SP non-convergence chatter
+    rng = np.random.default_rng(0)
+    factors = [
+        dict(zip(PARAMS, f)) for f in rng.uniform(0.92, 1.08, (args.questions, 2))
+    ]
+
+    m = mission(4)[0]
+    baseline = {name: m.substitutions[name] for name in PARAMS}
+    tic = time.perf_counter()
+    whatif = WhatIf(m, PARAMS, outputs=["W_{f_m}"])
+    whatif.scale(factors[0])  # the two solves per param happen here
+    print("baseline and calibration: %.2fs" % (time.perf_counter() - tic))
+
+    times = []
+    for f in factors:
+        tic = time.perf_counter()
+        answer = whatif.scale(f)
+        if not answer["solved"]:
+            times.append(time.perf_counter() - tic)
+    print(
+        "%d questions: %d predicted in %.1f us each, %d solved"
+        % (len(factors), len(times), 1e6 * np.mean(times), whatif.stats["solved"])
+    )
+
+    print("%9s %9s %9s %9s %9s" % ("W_{p_m}", "Range_m", "error", "estimate", "solve"))
+    for f in factors[: args.checks]:
+        answer = whatif.scale(f)
+        for name in PARAMS:
+            m.substitutions[name] = baseline[name] * f[name]
+        tic = time.perf_counter()
+        cost = m.localsolve(verbosity=0).cost
+        print(
+            "%8.1f%% %8.1f%% %8.3f%% %8.3f%% %8.3fs"
+            % (
+                100 * (f["W_{p_m}"] - 1),
+                100 * (f["Range_m"] - 1),
+                100 * abs(answer["cost"] / cost - 1),
+                100 * answer["error"],
+                time.perf_counter() - tic,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""How wing setup/solve cost and the optimum scale with spanwise stations N
+
+Usage:
+    python benchmarks/wing_scaling.py [--sizes 3 5 10 ... 200] [--tol 0.005]
+                                      [-o wing_scaling.json]
+
+Each N runs the wing_test configuration in a fresh process, recording
+setup and solve wall time, peak resident memory, the number of free
+variables and constraints, and the optimal cost. Costs are compared with
+the finest mesh, and the smallest N whose cost (and every finer mesh's
+cost) is within --tol of it is recommended.
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+from cases import wing
+
+SIZES = (3, 5, 8, 12, 16, 20, 30, 40, 60, 80, 100, 150, 200)
+
+
+def measure(N):
+    "build and solve the wing_test configuration with N stations"
+    rss0 = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tic = time.perf_counter()
+    m, _, kwargs = wing(N)
+    row = {"N": N, "setup": time.perf_counter() - tic}
+    tic = time.perf_counter()
+    sol = m.solve(verbosity=0, **kwargs)
+    row["solve"] = time.perf_counter() - tic
+    row["cost"] = float(getattr(sol.cost, "magnitude", sol.cost))
+    row["n_free"] = m.n_free
+    row["n_constraints"] = m.n_constraints
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    row["peak_rss_mb"] = rss / 1024.0
+    row["model_rss_mb"] = (rss - rss0) / 1024.0
+    return row
+
+
+def run(N, timeout=None):
+    "measure() in a fresh interpreter, so peak memory is per-N"
+    try:
+        out = subprocess.run(
+            [sys.executable, __file__, "--worker", str(N)],
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+            check=False,
+        )
+    except subprocess.TimeoutExpired:
+        return {"N": N, "error": "timed out after %ss" % timeout}
+    if out.returncode:
+        lines = out.stderr.strip().splitlines() or ["exit %d" % out.returncode]
+        return {"N": N, "error": lines[-1]}
+    return json.loads(out.stdout.splitlines()[-1])
+
+
+def recommend(rows, tol):
+    """Smallest N whose cost, and every finer mesh's, is within tol of the finest
+
+    Adds each row's "cost_change" relative to the finest solved mesh and
+    returns the recommended N, or None if nothing solved.
+    """
+    solved = sorted((r for r in rows if "cost" in r), key=lambda r: r["N"])
+    if not solved:
+        return None
+    finest = solved[-1]["cost"]
+    for r in solved:
+        r["cost_change"] = r["cost"] / finest - 1
+    best = solved[-1]["N"]
+    for r in reversed(solved):
+        if abs(r["cost_change"]) > tol:
+            break
+        best = r["N"]
+    return best
+
+
+def main(argv=None):
+    "command line entry point"
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--tol", type=float, default=0.005)
+    parser.add_argument("--timeout", type=float, default=None)
+    parser.add_argument("-o", "--output", default="wing_scaling.json")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker is not None:
+        print(json.dumps(measure(args.worker)))
+        return
+
+    rows = []
+    for N in sorted(args.sizes):
+        rows.append(run(N, args.timeout))
+        print(
+            "N=%-4d %s" % (N, rows[-1].get("error") or "solved"),
+            flush=True,
+        )
+    best = recommend(rows, args.tol)
+    print(
+        "\n%5s %8s %8s %9s %7s %7s %11s"
+        % ("N", "setup", "solve", "peak MB", "free", "cons", "cost change")
+    )
+    for r in rows:
+        if "cost" not in r:
+            print("%5d  %s" % (r["N"], r["error"]))
+            continue
+        print(
+            "%5d %7.3fs %7.3fs %9.1f %7d %7d %+10.3f%%"
+            % (
+                r["N"],
+                r["setup"],
+                r["solve"],
+                r["peak_rss_mb"],
+                r["n_free"],
+                r["n_constraints"],
+                100 * r["cost_change"],
+            )
+        )
+    print("\nsmallest N within %g of the finest mesh: %s" % (args.tol, best))
+    with open(args.output, "w") as f:
+        json.dump(
+            {"tol": args.tol, "recommended_N": best, "results": rows}, f, indent=1
+        )
+
+
+if __name__ == "__main__":
+    main()
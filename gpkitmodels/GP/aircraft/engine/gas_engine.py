@@ -1,11 +1,9 @@
 "engine_model.py"
 
-import os
-
-import pandas as pd
 from gpkit import Model, Var, Variable, units
 
 from gpkitmodels.tools.fit_constraintset import FitCS
+from gpkitmodels.tools.fitdata import fitdata_path, load_fitdata
 
 
 class Engine(Model):
@@ -22,10 +20,7 @@ class Engine(Model):
     def setup(self, DF70=False):
         self.DF70 = DF70
 
-        path = os.path.dirname(__file__)
-        df = pd.read_csv(path + os.sep + "power_lawfit.csv").to_dict(orient="records")[
-            0
-        ]
+        df = load_fitdata(fitdata_path(__file__, "power_lawfit.csv"))
 
         constraints = [
             FitCS(df, self.W_eng / self.W_engref, [self.P_sl_max / self.P_ref]),
@@ -63,10 +58,7 @@ class EnginePerf(Model):
         Pshaftmax = Variable("P_{shaft-max}", "hp", "Max shaft power at altitude")
         mfac = Variable("m_{fac}", 1.0, "-", "BSFC margin factor")
 
-        path = os.path.dirname(__file__)
-        df = pd.read_csv(path + os.sep + "powerBSFCfit.csv").to_dict(orient="records")[
-            0
-        ]
+        df = load_fitdata(fitdata_path(__file__, "powerBSFCfit.csv"))
 
         constraints = [
             FitCS(df, self.BSFC / mfac / static.bsfc_min, [self.P_total / Pshaftmax]),
@@ -2,13 +2,12 @@
 
 from builtins import zip
 
-import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
 
 
 def fit_setup(filename):
     "set up fitting variables"
+    import pandas as pd  # noqa: PLC0415
 
     df = pd.read_csv(filename)
 
@@ -43,6 +42,8 @@ def return_fit(u_1, u_2, u_3):
 
 def plot_fits(filename):
     "plot fit against data"
+    import matplotlib.pyplot as plt  # noqa: PLC0415
+    import pandas as pd  # noqa: PLC0415
 
     df = pd.read_csv(filename)
     u1 = np.array(df["tubelr"])
@@ -80,5 +81,4 @@ def plot_fits(filename):
 
 if __name__ == "__main__":
     X, Y = fit_setup("fusedrag.csv")
-    df = pd.read_csv("fusedrag.csv")
     F = plot_fits("fusedrag.csv")
@@ -22,16 +22,22 @@ def simpleprop_test():
     assert sol.cost == pytest.approx(3.7509, rel=1e-3)
 
 
-def ME_eta_test():
+class PropellerSizing(Model):
+    "Blade element propeller of N elements sized for efficiency at 100 lbf"
 
-    fs = FlightState()
-    p = Propeller()
-    pp = BladeElementProp(p, fs)
-    pp.substitutions[pp.T] = 100
-    pp.cost = (
-        1.0 / pp.eta + pp.Q / (1000.0 * units("N*m")) + p.T_m / (1000 * units("N"))
-    )
-    sol = pp.localsolve(verbosity=0, iteration_limit=400)
+    def setup(self, N=5):
+        self.state = fs = FlightState()
+        self.prop = p = Propeller(N=N)
+        self.perf = pp = BladeElementProp(p, fs, N=N)
+        pp.substitutions[pp.T] = 100
+        self.cost = (
+            1.0 / pp.eta + pp.Q / (1000.0 * units("N*m")) + p.T_m / (1000 * units("N"))
+        )
+        return pp  # the propeller's weight and the state's qne are left free
+
+
+def ME_eta_test():
+    sol = PropellerSizing().localsolve(verbosity=0, iteration_limit=400)
     assert sol.cost == pytest.approx(1.6613, rel=1e-3)
 
 
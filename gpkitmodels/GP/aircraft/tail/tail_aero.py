@@ -1,11 +1,9 @@
 "tail aerodynamics"
 
-import os
-
-import pandas as pd
 from gpkit import Model, Var
 
 from gpkitmodels.tools.fit_constraintset import FitCS
+from gpkitmodels.tools.fitdata import fitdata_path, load_fitdata
 
 
 class TailAero(Model):
@@ -24,10 +22,7 @@ class TailAero(Model):
         rho = self.rho = state.rho
         V = self.V = state.V
         mu = self.mu = state.mu
-        path = os.path.dirname(__file__)
-        fd = pd.read_csv(path + os.sep + "tail_dragfit.csv").to_dict(orient="records")[
-            0
-        ]
+        fd = load_fitdata(fitdata_path(__file__, "tail_dragfit.csv"))
 
         constraints = [
             self.Re == V * rho * S / b / mu,
@@ -74,9 +74,7 @@ class TailBoomBending(Model):
         self.htail = htail
         self.tailboom = tailboom
 
-        Beam.qbarFun = [1e-10] * N
-        Beam.SbarFun = [1.0] * N
-        beam = self.beam = Beam(N)
+        beam = self.beam = Beam(N, qbarFun=[1e-10] * N, SbarFun=[1.0] * N)
 
         Mr = VectorVariable(tailboom.N - 1, "Mr", "N*m", "section root moment")
 
@@ -1,7 +1,7 @@
 "test tail models"
 
 import pytest
-from gpkit import Model, Variable
+from gpkit import Model, Variable, settings
 
 from gpkitmodels.GP.aircraft.tail.empennage import Empennage
 from gpkitmodels.GP.aircraft.tail.horizontal_tail import HorizontalTail
@@ -9,6 +9,7 @@ from gpkitmodels.GP.aircraft.tail.tail_boom import TailBoom
 from gpkitmodels.GP.aircraft.tail.vertical_tail import VerticalTail
 from gpkitmodels.GP.aircraft.wing.boxspar import BoxSpar
 from gpkitmodels.GP.aircraft.wing.wing_test import FlightState
+from gpkitmodels.GP.beam.beam import Beam
 
 
 def test_htail():
@@ -56,35 +57,45 @@ def test_vtail():
     assert sol.cost == pytest.approx(0.003425, rel=1e-2)
 
 
-def test_emp():
-
-    Sw = Variable("S_w", 50, "ft**2", "wing area")
-    bw = Variable("b_w", 20, "ft", "wing span")
-    cmac = Variable("cmac", 15, "in", "wing MAC")
-    emp = Empennage()
-    fs = FlightState()
-    emp.substitutions.update(
-        {
-            emp.W: 10,
-            emp.tailboom.l: 5,
-            emp.htail.planform.AR: 4,
-            emp.vtail.planform.AR: 4,
-            emp.htail.planform.tau: 0.08,
-            emp.vtail.planform.tau: 0.08,
-            emp.vtail.Vv: 0.04,
-            emp.htail.Vh: 0.4,
-            emp.htail.mh: 0.01,
-        }
-    )
-    htperf = emp.htail.flight_model(emp.htail, fs)
-    vtperf = emp.vtail.flight_model(emp.vtail, fs)
-    tbperf = emp.tailboom.flight_model(emp.tailboom, fs)
-    hbend = emp.tailboom.tailLoad(emp.tailboom, emp.htail, fs)
-    vbend = emp.tailboom.tailLoad(emp.tailboom, emp.vtail, fs)
-
-    m = Model(
-        htperf.Cd + vtperf.Cd + tbperf.Cf,
-        [
+class EmpennageSizing(Model):
+    "Empennage with an N-station tail boom sized for minimum drag"
+
+    def setup(self, N=5):
+        Sw = Variable("S_w", 50, "ft**2", "wing area")
+        bw = Variable("b_w", 20, "ft", "wing span")
+        cmac = Variable("cmac", 15, "in", "wing MAC")
+        self.emp = emp = Empennage(N=N)
+        self.state = fs = FlightState()
+        emp.substitutions.update(
+            {
+                emp.W: 10,
+                emp.tailboom.l: 5,
+                emp.htail.planform.AR: 4,
+                emp.vtail.planform.AR: 4,
+                emp.htail.planform.tau: 0.08,
+                emp.vtail.planform.tau: 0.08,
+                emp.vtail.Vv: 0.04,
+                emp.htail.Vh: 0.4,
+                emp.htail.mh: 0.01,
+            }
+        )
+        htperf = emp.htail.flight_model(emp.htail, fs)
+        vtperf = emp.vtail.flight_model(emp.vtail, fs)
+        tbperf = emp.tailboom.flight_model(emp.tailboom, fs)
+        hbend = emp.tailboom.tailLoad(emp.tailboom, emp.htail, fs)
+        vbend = emp.tailboom.tailLoad(emp.tailboom, emp.vtail, fs)
+
+        if settings["default_solver"] == "cvxopt":
+            for l in [hbend, vbend]:
+                for v in [
+                    "\\bar{M}_{tip}",
+                    "\\bar{\\delta}_{root}",
+                    "\\theta_{root}",
+                ]:
+                    l.substitutions[l.beam.get_var(v)] = 1e-3
+
+        self.cost = htperf.Cd + vtperf.Cd + tbperf.Cf
+        return [
             emp.vtail.lv == emp.tailboom.l,
             emp.htail.lh == emp.tailboom.l,
             emp.htail.Vh <= emp.htail.planform.S * emp.htail.lh / Sw / cmac,
@@ -96,24 +107,30 @@ def test_emp():
             tbperf,
             hbend,
             vbend,
-        ],
-    )
-
-    from gpkit import settings  # noqa: PLC0415
+        ]
 
-    if settings["default_solver"] == "cvxopt":
-        for l in [hbend, vbend]:
-            for v in [
-                "\\bar{M}_{tip}",
-                "\\bar{\\delta}_{root}",
-                "\\theta_{root}",
-            ]:
-                m.substitutions[l.beam.get_var(v)] = 1e-3
 
+def test_emp():
+    m = EmpennageSizing()
     sol = m.solve(verbosity=0, use_leqs=False)  # cvxopt gets singular with leqs
     assert sol.cost == pytest.approx(0.011135, rel=1e-2)
 
 
+def test_tailboom_loading():
+    """a tail boom's Beam loading doesn't carry over to Beams built after it
+
+    This replaces the requested thread-pool test: loading is per instance,
+    but concurrent builds are not supported (gpkit's variable naming state
+    is process-global), so there is nothing thread-safe to test.
+    """
+    tailboom = TailBoom(N=3)
+    bend = tailboom.tailLoad(tailboom, HorizontalTail(), FlightState())
+    assert bend.beam.SbarFun == [1.0] * 3
+    beam = Beam(6)
+    assert beam.qbarFun is None and beam.SbarFun is None
+    assert beam.qbar.key not in beam.substitutions
+
+
 def test_tailboom_mod():
 
     Sw = Variable("S_w", 50, "ft**2", "wing area")
@@ -165,8 +182,6 @@ def test_tailboom_mod():
         ],
     )
 
-    from gpkit import settings  # noqa: PLC0415
-
     if settings["default_solver"] == "cvxopt":
         for l in [hbend, vbend]:
             for v in [
@@ -184,6 +199,7 @@ def test():
     test_htail()
     test_vtail()
     test_emp()
+    test_tailboom_loading()
     test_tailboom_mod()
 
 
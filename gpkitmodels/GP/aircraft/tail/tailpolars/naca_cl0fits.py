@@ -2,35 +2,9 @@
 
 from builtins import range, zip
 
-import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
 
-plt.rcParams.update({"font.size": 15})
-
-
-def text_to_df(filename):
-    "parse XFOIL polars and concatente data in DataFrame"
-    lines = list(open(filename))
-    for i, l in enumerate(lines):
-        lines[i] = l.split("\n")[0]
-        for j in 10 - np.arange(9):
-            if " " * j in lines[i]:
-                lines[i] = lines[i].replace(" " * j, " ")
-            if "---" in lines[i]:
-                start = i
-    data = {}
-    titles = lines[start - 1].split(" ")[1:]
-    for t in titles:
-        data[t] = []
-
-    for l in lines[start + 1 :]:
-        for i, v in enumerate(l.split(" ")[1:]):
-            data[titles[i]].append(v)
-
-    df = pd.DataFrame(data)
-    df = df.astype(float)
-    return df
+from gpkitmodels.tools.polarfit import text_to_df
 
 
 def fit_setup(naca_range, re_range):
@@ -46,9 +20,9 @@ def fit_setup(naca_range, re_range):
     u1 = np.hstack(re)
     u2 = np.hstack(tau)
     w = np.hstack(cd)
-    u1 = u1.astype(np.float)
-    u2 = u2.astype(np.float)
-    w = w.astype(np.float)
+    u1 = u1.astype(float)
+    u2 = u2.astype(float)
+    w = w.astype(float)
     u = [u1, u2]
     x = np.log(u)
     y = np.log(w)
@@ -68,6 +42,9 @@ def return_fit(u_1, u_2):
 
 def plot_fits(naca_range, re_range):
     "plot fit compared to data"
+    import matplotlib.pyplot as plt  # noqa: PLC0415
+
+    plt.rcParams.update({"font.size": 15})
 
     fig, ax = plt.subplots()
     colors = ["k", "m", "b", "g", "y", "r"]
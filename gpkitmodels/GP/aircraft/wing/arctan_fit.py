@@ -1,12 +1,13 @@
-import matplotlib.pyplot as plt
 import numpy as np
-from gpfit.fit import fit
 
-plt.rcParams.update({"font.size": 15})
 GENERATE = True
 
 
 def arctanfit():
+    import matplotlib.pyplot as plt  # noqa: PLC0415
+    from gpfit.fit import fit  # noqa: PLC0415
+
+    plt.rcParams.update({"font.size": 15})
     u = np.linspace(1e-15, 0.7, 100)
     w = np.arctan(u)
 
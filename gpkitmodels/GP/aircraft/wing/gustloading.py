@@ -1,13 +1,11 @@
 "spar loading for gust case"
 
-import os
-
-import pandas as pd
 from adce.admath import cos
 from gpkit import Var, VectorVariable
 from numpy import array, hstack, pi
 
 from gpkitmodels.tools.fit_constraintset import FitCS
+from gpkitmodels.tools.fitdata import fitdata_path, load_fitdata
 
 from .sparloading import SparLoading
 
@@ -41,8 +39,7 @@ class GustL(SparLoading):
             wing.N, "cosminus1", self.return_cosm1, "-", "1 minus cosine factor"
         )
 
-        path = os.path.dirname(os.path.abspath(__file__))
-        df = pd.read_csv(path + os.sep + "arctan_fit.csv").to_dict(orient="records")[0]
+        df = load_fitdata(fitdata_path(__file__, "arctan_fit.csv"))
 
         constraints = [
             # fit for arctan from 0 to 1, RMS = 0.044
@@ -2,34 +2,9 @@
 
 from builtins import range, zip
 
-import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
 
-plt.rcParams.update({"font.size": 15})
-
-
-def text_to_df(filename):
-    "parse XFOIL polars and concatente data in DataFrame"
-    lines = list(open(filename))
-    for i, l in enumerate(lines):
-        lines[i] = l.split("\n")[0]
-        for j in 10 - np.arange(9):
-            if " " * j in lines[i]:
-                lines[i] = lines[i].replace(" " * j, " ")
-            if "---" in lines[i]:
-                start = i
-    data = {}
-    titles = lines[start - 1].split(" ")[1:]
-    for t in titles:
-        data[t] = []
-
-    for l in lines[start + 1 :]:
-        for i, v in enumerate(l.split(" ")[1:]):
-            data[titles[i]].append(v)
-
-    df = pd.DataFrame(data)
-    return df
+from gpkitmodels.tools.polarfit import text_to_df
 
 
 def fit_setup(Re_range):
@@ -46,9 +21,9 @@ def fit_setup(Re_range):
     u1 = np.hstack(CL)
     u2 = np.hstack(RE)
     w = np.hstack(CD)
-    u1 = u1.astype(np.float)
-    u2 = u2.astype(np.float)
-    w = w.astype(np.float)
+    u1 = u1.astype(float)
+    u2 = u2.astype(float)
+    w = w.astype(float)
     u = [u1, u2]
     x = np.log(u)
     y = np.log(w)
@@ -71,6 +46,9 @@ def return_fit(cl, re):
 
 def plot_fits(re):
     "plot fit compared to data"
+    import matplotlib.pyplot as plt  # noqa: PLC0415
+
+    plt.rcParams.update({"font.size": 15})
     colors = ["k", "m", "b", "g", "y"]
     assert len(re) == len(colors)
     fig, ax = plt.subplots()
@@ -0,0 +1,126 @@
+"""Spanwise station distributions for wings
+
+A Planform's stations `eta` (2y/b, from root 0 to tip 1) can be any
+increasing array, or the name of one of SPACINGS:
+
+    uniform     equal panels
+    cosine      panels clustered at root and tip
+    halfcosine  panels clustered at the root, where shear and moment vary most
+    geometric   each panel `ratio` times as wide as the one inboard of it
+
+Every model built on the planform (loading, spars, core) takes its panel
+widths from `eta`, so `Wing(eta=spacing(10, "halfcosine"))` is all a
+non-uniform wing needs. `adapt` goes further, splitting the panels where
+a solved wing's moment and deflection change most, as far as the cost is
+sensitive to them, until its cost converges:
+
+    for eta, sol in adapt(lambda eta: WingSizing(eta=eta)):
+        print(len(eta), sol.cost)
+"""
+
+import numpy as np
+from gpkit import settings
+
+from .sparloading import SparLoading
+
+SPACINGS = ("uniform", "cosine", "halfcosine", "geometric")
+
+
+def spacing(N, kind="uniform", ratio=1.2):
+    "N stations from root to tip, spaced as `kind` (see SPACINGS)"
+    u = np.linspace(0, 1, N)
+    if kind == "uniform":
+        eta = u
+    elif kind == "cosine":
+        eta = (1 - np.cos(np.pi * u)) / 2
+    elif kind == "halfcosine":
+        eta = 1 - np.cos(np.pi / 2 * u)
+    elif kind == "geometric":
+        eta = np.hstack([0, np.cumsum(ratio ** np.arange(N - 1))])
+        eta /= eta[-1]
+    else:
+        raise ValueError("unknown spacing %r; choose from %s" % (kind, SPACINGS))
+    eta[0], eta[-1] = 0, 1  # exactly, despite rounding
+    return eta
+
+
+def stations(N, eta):
+    "eta as an array of stations, checked; N is used only for named spacings"
+    if isinstance(eta, str):
+        return spacing(N, eta)
+    eta = np.asarray(eta, dtype=float)
+    if eta.ndim != 1 or len(eta) < 2 or eta[0] != 0 or eta[-1] != 1:
+        raise ValueError("stations must run from 0 (root) to 1 (tip), not %s" % eta)
+    if np.any(np.diff(eta) <= 0):
+        raise ValueError("stations must increase from root to tip, not %s" % eta)
+    return eta
+
+
+def refine(eta, indicator, fraction=0.25, min_width=0.005):
+    """eta with the `fraction` of panels of largest indicator split in half
+
+    Panels are never split below `min_width`, so eta may come back as is.
+    """
+    indicator = np.asarray(indicator)
+    if not indicator.any():
+        indicator = np.diff(eta)  # no information: split the widest
+    nsplit = max(1, int(fraction * len(indicator)))
+    split = np.argsort(-indicator, kind="stable")[:nsplit]
+    split = split[np.diff(eta)[split] >= 2 * min_width]
+    mids = (eta[split] + eta[split + 1]) / 2
+    return np.sort(np.hstack([eta, mids]))
+
+
+def indicator(sol, model):
+    """Per panel, how much model's SparLoadings' M and w change across it
+
+    Each change is relative to the largest value and weighted by the cost's
+    sensitivity to the limit it feeds: the spar stress for moments and the
+    tip deflection for deflections, so only active limits refine the mesh.
+    """
+    out = 0
+    for loading in model.walk():
+        if isinstance(loading, SparLoading):
+            sigma = loading.wing.spar.material.sigma
+            for var, limit in ((loading.M, sigma), (loading.w, loading.kappa)):
+                x = sol[var].magnitude
+                weight = abs(float(sol.sens.variables.get(limit.key, 0)))
+                out = out + weight * np.abs(np.diff(x)) / np.abs(x).max()
+    return out
+
+
+def adapt(  # noqa: PLR0913
+    factory,
+    eta="uniform",
+    tol=1e-3,
+    max_stations=60,
+    fraction=0.25,
+    min_width=0.005,
+    **solve_kwargs,
+):
+    """Yields (eta, sol) as panels are split until the cost converges
+
+    factory(eta) returns a wing model with stations eta, whose SparLoading
+    submodels' moments and deflections decide where to split panels,
+    starting from `eta` (stations, or a spacing name for 5 of them). Stops
+    once the cost changes by less than `tol` (relative) in a refinement,
+    before exceeding `max_stations`, or when every panel worth splitting
+    is narrower than 2*min_width. solve_kwargs go to model.solve; with
+    cvxopt they default to a small kktreg, since refined meshes can be
+    near-singular.
+    """
+    eta = stations(5, eta)
+    if solve_kwargs.get("solver", settings["default_solver"]) == "cvxopt":
+        solve_kwargs["options"] = {"kktreg": 1e-9, **solve_kwargs.get("options", {})}
+    cost = None
+    while True:
+        model = factory(eta)
+        sol = model.solve(verbosity=0, **solve_kwargs)
+        yield eta, sol
+        if cost is not None and abs(sol.cost / cost - 1) < tol:
+            return
+        cost = sol.cost
+        finer = refine(eta, indicator(sol, model), fraction, min_width)
+        if len(finer) > max_stations or len(finer) == len(eta):
+            return
+        eta = finer
@@ -1,15 +1,13 @@
 "wing.py"
 
-from os import sep
-from os.path import abspath, dirname
-
 import numpy as np
-import pandas as pd
 from gpkit import Model, Var, VectorVariable
 
 from gpkitmodels.tools.fit_constraintset import XfoilFit
+from gpkitmodels.tools.fitdata import fitdata_path, load_fitdata
 
 from .capspar import CapSpar
+from .stations import stations
 from .wing_core import WingCore
 from .wing_skin import WingSkin
 
@@ -53,8 +51,11 @@ class Planform(Model):
     def return_deta(self, c):
         return np.diff(c[self.eta])
 
-    def setup(self, N):
-        self.eta = VectorVariable(N, "eta", np.linspace(0, 1, N), "-", "(2y/b)")
+    def setup(self, N, eta="uniform"):
+        "N stations at eta: an array, or a spacing name from stations.SPACINGS"
+        eta = stations(N, eta)
+        N = len(eta)
+        self.eta = VectorVariable(N, "eta", eta, "-", "(2y/b)")
         cbar = self.cbar = VectorVariable(
             N, "cbar", self.return_c, "-", "non-dim chord at nodes"
         )
@@ -89,13 +90,12 @@ class WingAero(Model):
         self,
         static,
         state,
-        fitdata=dirname(abspath(__file__)) + sep + "jho_fitdata.csv",
+        fitdata=fitdata_path(__file__, "jho_fitdata.csv"),
     ):
         self.state = state
         self.static = static
 
-        df = pd.read_csv(fitdata)
-        fd = df.to_dict(orient="records")[0]
+        fd = load_fitdata(fitdata)
 
         AR = static.planform.AR
         cmac = static.planform.cmac
@@ -131,9 +131,9 @@ class Wing(Model):
     skin_model = WingSkin
     sparJ = False
 
-    def setup(self, N=5):
-        self.N = N
-        self.planform = Planform(N)
+    def setup(self, N=5, eta="uniform"):
+        self.planform = Planform(N, eta)
+        self.N = N = len(self.planform.eta)
         # Convenience aliases for common planform variables
         self.S = self.planform.S
         self.b = self.planform.b
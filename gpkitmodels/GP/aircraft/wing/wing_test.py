@@ -1,10 +1,12 @@
 "wing test"
 
+import numpy as np
 import pytest
-from gpkit import Model, Var, Vectorize
+from gpkit import Model, Var, Vectorize, settings
 from gpkit.exceptions import UnknownInfeasible
 
 from gpkitmodels.GP.aircraft.wing.boxspar import BoxSpar
+from gpkitmodels.GP.aircraft.wing.stations import SPACINGS, adapt, refine, spacing
 from gpkitmodels.GP.aircraft.wing.wing import Wing
 
 
@@ -20,29 +22,24 @@ class FlightState(Model):
         return [self.qne == self.V**2 * self.rho * 1.2]
 
 
-def wing_test():
-    "test wing models"
-
-    W = Wing()
-    W.substitutions[W.W] = 50
-    W.substitutions[W.planform.tau] = 0.115
-    fs = FlightState()
-    perf = W.flight_model(W, fs)
-    loading = [W.spar.loading(W, fs)]
-    loading[0].substitutions["W"] = 100
-    loading.append(W.spar.gustloading(W, fs))
-    loading[1].substitutions["W"] = 100
+class WingSizing(Model):
+    "Wing of N stations sized for minimum drag under static and gust loading"
 
-    from gpkit import settings  # noqa: PLC0415
-
-    if settings["default_solver"] == "cvxopt":
+    def setup(self, N=5, eta="uniform"):
+        self.wing = W = Wing(N=N, eta=eta)
+        W.substitutions[W.W] = 50
+        W.substitutions[W.planform.tau] = 0.115
+        self.state = fs = FlightState()
+        self.perf = perf = W.flight_model(W, fs)
+        self.loading = loading = [W.spar.loading(W, fs), W.spar.gustloading(W, fs)]
         for l in loading:
-            for v in ["Mtip", "Stip", "wroot", "throot"]:
-                l.substitutions[v] = 1e-1
+            l.substitutions["W"] = 100
+            if settings["default_solver"] == "cvxopt":
+                for v in ["Mtip", "Stip", "wroot", "throot"]:
+                    l.substitutions[v] = 1e-1
 
-    m = Model(
-        perf.Cd,
-        [
+        self.cost = perf.Cd
+        return [
             loading[1].v == fs.V,
             loading[1].cl == perf.CL,
             loading[1].Ww == W.W,
@@ -51,9 +48,12 @@ def wing_test():
             fs,
             perf,
             loading,
-        ],
-    )
-    sol = m.solve(verbosity=0)
+        ]
+
+
+def wing_test():
+    "test wing models"
+    sol = WingSizing().solve(verbosity=0)
     assert sol.cost == pytest.approx(0.007608, rel=1e-2)
 
 
@@ -73,8 +73,6 @@ def box_spar():
     loading.append(W.spar.gustloading(W, fs))
     loading[1].substitutions["W"] = 100
 
-    from gpkit import settings  # noqa: PLC0415
-
     if settings["default_solver"] == "cvxopt":
         for l in loading:
             for v in ["Mtip", "Stip", "wroot", "throot"]:
@@ -112,11 +110,37 @@ def wing_aero_vectorized():
     assert perf.rhoValue is True
 
 
+def station_spacing():
+    "wings accept any increasing stations from root to tip"
+    for kind in SPACINGS:
+        eta = spacing(8, kind)
+        assert eta[0] == 0 and eta[-1] == 1 and np.all(np.diff(eta) > 0)
+    m = WingSizing(eta="halfcosine")
+    assert len(m.wing.planform.eta) == m.wing.N == 5
+    sol = m.solve(verbosity=0)
+    assert sol.cost == pytest.approx(0.007608, rel=1e-2)
+    for eta in ([0, 0.5, 0.4, 1], [0, 0.5, 0.9]):
+        with pytest.raises(ValueError, match="stations"):
+            Wing(eta=eta)
+
+
+def adaptive_stations():
+    "refining the stations only lowers the conservatively discretized cost"
+    meshes = list(adapt(lambda eta: WingSizing(eta=eta), tol=0, max_stations=8))
+    assert [len(eta) for eta, _ in meshes] == [5, 6, 7, 8]
+    costs = [sol.cost for _, sol in meshes]
+    assert costs == sorted(costs, reverse=True)
+    assert len(refine(spacing(3), [1, 0], min_width=0.3)) == 3
+    assert len(next(adapt(lambda eta: WingSizing(eta=eta), "cosine"))[0]) == 5
+
+
 def test():
     "tests"
     wing_test()
     box_spar()
     wing_aero_vectorized()
+    station_spacing()
+    adaptive_stations()
 
 
 if __name__ == "__main__":
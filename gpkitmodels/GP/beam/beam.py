@@ -14,13 +14,24 @@ class Beam(Model):
     ---------------
     dx, qbar (if not qbarFun)
 
+    The loading functions (qbarFun, SbarFun, MbarFun) are the setup
+    arguments, defaulting to the class attributes of the same names.
+    Passing them per instance keeps one Beam's loading out of the next;
+    it does not make building Beams from several threads safe, since
+    gpkit's variable naming state is shared by the whole process.
     """
 
     qbarFun = None
     SbarFun = None
     MbarFun = None
 
-    def setup(self, N=6):
+    def setup(self, N=6, qbarFun=None, SbarFun=None, MbarFun=None):
+        if qbarFun is not None:
+            self.qbarFun = qbarFun
+        if SbarFun is not None:
+            self.SbarFun = SbarFun
+        if MbarFun is not None:
+            self.MbarFun = MbarFun
 
         with Vectorize(N - 1):
             EIbar = self.EIbar = Variable(
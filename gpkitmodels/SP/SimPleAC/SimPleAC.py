@@ -5,34 +5,51 @@ from gpkit import Model, SignomialsEnabled, Variable, units
 
 
 class SimPleAC(Model):
+    @classmethod
+    def default(cls):
+        "SimPleAC sized for minimum fuel weight at its 3000 km range"
+        m = cls()
+        m.cost = m.get_var("W_f")
+        return m
+
     def setup(self):
         # Env. constants
         g = Variable("g", 9.81, "m/s^2", "gravitational acceleration")
-        mu = Variable("\\mu", 1.775e-5, "kg/m/s", "viscosity of air", pr=4.0)
-        rho = Variable("\\rho", 1.23, "kg/m^3", "density of air", pr=5.0)
+        mu = Variable("\\mu", 1.775e-5, "kg/m/s", "viscosity of air")
+        rho = Variable("\\rho", 1.23, "kg/m^3", "density of air")
         rho_f = Variable("\\rho_f", 817, "kg/m^3", "density of fuel")
 
         # Non-dimensional constants
-        C_Lmax = Variable("C_{L,max}", 1.6, "-", "max CL with flaps down", pr=5.0)
-        e = Variable("e", 0.92, "-", "Oswald efficiency factor", pr=3.0)
-        k = Variable("k", 1.17, "-", "form factor", pr=10.0)
-        N_ult = Variable("N_{ult}", 3.3, "-", "ultimate load factor", pr=15.0)
-        S_wetratio = Variable(
-            "(\\frac{S}{S_{wet}})", 2.075, "-", "wetted area ratio", pr=3.0
-        )
-        tau = Variable("\\tau", 0.12, "-", "airfoil thickness to chord ratio", pr=10.0)
+        C_Lmax = Variable("C_{L,max}", 1.6, "-", "max CL with flaps down")
+        e = Variable("e", 0.92, "-", "Oswald efficiency factor")
+        k = Variable("k", 1.17, "-", "form factor")
+        N_ult = Variable("N_{ult}", 3.3, "-", "ultimate load factor")
+        S_wetratio = Variable("(\\frac{S}{S_{wet}})", 2.075, "-", "wetted area ratio")
+        tau = Variable("\\tau", 0.12, "-", "airfoil thickness to chord ratio")
         W_W_coeff1 = Variable(
-            "W_{W_{coeff1}}", 2e-5, "1/m", "wing weight coefficent 1", pr=30.0
+            "W_{W_{coeff1}}", 2e-5, "1/m", "wing weight coefficent 1"
         )  # orig  12e-5
-        W_W_coeff2 = Variable(
-            "W_{W_{coeff2}}", 60.0, "Pa", "wing weight coefficent 2", pr=10.0
-        )
+        W_W_coeff2 = Variable("W_{W_{coeff2}}", 60.0, "Pa", "wing weight coefficent 2")
 
         # Dimensional constants
         Range = Variable("Range", 3000, "km", "aircraft range")
         TSFC = Variable("TSFC", 0.6, "1/hr", "thrust specific fuel consumption")
-        V_min = Variable("V_{min}", 25, "m/s", "takeoff speed", pr=20.0)
-        W_0 = Variable("W_0", 6250, "N", "aircraft weight excluding wing", pr=20.0)
+        V_min = Variable("V_{min}", 25, "m/s", "takeoff speed")
+        W_0 = Variable("W_0", 6250, "N", "aircraft weight excluding wing")
+        self.pr = {
+            mu: 4.0,
+            rho: 5.0,
+            C_Lmax: 5.0,
+            e: 3.0,
+            k: 10.0,
+            N_ult: 15.0,
+            S_wetratio: 3.0,
+            tau: 10.0,
+            W_W_coeff1: 30.0,
+            W_W_coeff2: 10.0,
+            V_min: 20.0,
+            W_0: 20.0,
+        }  # percent uncertainties
 
         # Free Variables
         LoD = Variable("L/D", "-", "lift-to-drag ratio")
@@ -50,13 +67,13 @@ class SimPleAC(Model):
         T_flight = Variable("T_{flight}", "hr", "flight time")
 
         # Free variables (fixed for performance eval.)
-        A = Variable("A", "-", "aspect ratio", fix=True)
-        S = Variable("S", "m^2", "total wing area", fix=True)
+        A = Variable("A", "-", "aspect ratio")
+        S = Variable("S", "m^2", "total wing area")
         W_w = Variable("W_w", "N", "wing weight")  # , fix = True)
-        W_w_strc = Variable("W_w_strc", "N", "wing structural weight", fix=True)
-        W_w_surf = Variable("W_w_surf", "N", "wing skin weight", fix=True)
-        V_f_wing = Variable("V_f_wing", "m^3", "fuel volume in the wing", fix=True)
-        V_f_fuse = Variable("V_f_fuse", "m^3", "fuel volume in the fuselage", fix=True)
+        W_w_strc = Variable("W_w_strc", "N", "wing structural weight")
+        W_w_surf = Variable("W_w_surf", "N", "wing skin weight")
+        V_f_wing = Variable("V_f_wing", "m^3", "fuel volume in the wing")
+        V_f_fuse = Variable("V_f_fuse", "m^3", "fuel volume in the fuselage")
         constraints = []
 
         # Weight and lift model
@@ -108,9 +125,7 @@ class SimPleAC(Model):
 
 
 def test():
-    m = SimPleAC()
-    m.cost = m["W_f"]
-    _ = m.localsolve(verbosity=2)
+    _ = SimPleAC.default().localsolve(verbosity=2)
 
 
 if __name__ == "__main__":
@@ -124,16 +139,16 @@ if __name__ == "__main__":
     m.substitutions["Range"] = [1000, 3000, 6000]
     m.extend(
         [
-            m["A"] == m["A"][0],
-            m["S"] == m["S"][0],
-            m["W_w"] == m["W_w"][0],
-            m["W_w_strc"] == m["W_w_strc"][0],
-            m["W_w_surf"] == m["W_w_surf"][0],
-            m["V_f_wing"] == m["V_f_wing"][0],
-            m["V_f_fuse"] == m["V_f_fuse"][0],
+            m.get_var("A") == m.get_var("A")[0],
+            m.get_var("S") == m.get_var("S")[0],
+            m.get_var("W_w") == m.get_var("W_w")[0],
+            m.get_var("W_w_strc") == m.get_var("W_w_strc")[0],
+            m.get_var("W_w_surf") == m.get_var("W_w_surf")[0],
+            m.get_var("V_f_wing") == m.get_var("V_f_wing")[0],
+            m.get_var("V_f_fuse") == m.get_var("V_f_fuse")[0],
         ]
     )
-    m.cost = 3 * m["W_f"][0] + m["W_f"][1] + 0.33 * m["W_f"][2]
+    m.cost = 3 * m.get_var("W_f")[0] + m.get_var("W_f")[1] + 0.33 * m.get_var("W_f")[2]
     sol = m.localsolve(verbosity=1)
     # print(sol1.diff(sol2))
     print(sol.table())
@@ -23,14 +23,16 @@ class SimPleAC(Model):
         self.components = [self.engine, self.wing, self.fuse]
 
         # Environmental constants
-        g = Variable("g", 9.81, "m/s^2", "gravitational acceleration")
-        rho_f = Variable("\\rho_f", 817, "kg/m^3", "density of fuel")
+        self.g = g = Variable("g", 9.81, "m/s^2", "gravitational acceleration")
+        self.rho_f = rho_f = Variable("\\rho_f", 817, "kg/m^3", "density of fuel")
 
         # Free Variables
-        W = Variable("W", "N", "maximum takeoff weight")
-        W_f = Variable("W_f", "N", "maximum fuel weight")
-        V_f = Variable("V_f", "m^3", "maximum fuel volume")
-        V_f_avail = Variable("V_{f_{avail}}", "m^3", "fuel volume available")
+        self.W = W = Variable("W", "N", "maximum takeoff weight")
+        self.W_f = W_f = Variable("W_f", "N", "maximum fuel weight")
+        self.V_f = V_f = Variable("V_f", "m^3", "maximum fuel volume")
+        self.V_f_avail = V_f_avail = Variable(
+            "V_{f_{avail}}", "m^3", "fuel volume available"
+        )
 
         constraints = []
 
@@ -38,8 +40,7 @@ class SimPleAC(Model):
         with SignomialsEnabled():
             constraints += [
                 V_f == W_f / g / rho_f,
-                V_f_avail
-                <= self.wing["V_{f_{wing}}"] + self.fuse["V_{f_{fuse}}"],  # [SP]
+                V_f_avail <= self.wing.V_f_wing + self.fuse.V_f_fuse,  # [SP]
                 V_f_avail >= V_f,
             ]
 
@@ -58,28 +59,24 @@ class SimPleACP(Model):
         self.Pmodels = [self.engineP, self.wingP, self.fuseP]
 
         # Free variables
-        C_D = Variable("C_D", "-", "drag coefficient")
-        D = Variable("D", "N", "total drag force")
-        LoD = Variable("L/D", "-", "lift-to-drag ratio")
-        V = Variable("V", "m/s", "cruising speed")
+        self.C_D = C_D = Variable("C_D", "-", "drag coefficient")
+        self.D = D = Variable("D", "N", "total drag force")
+        self.LoD = LoD = Variable("L/D", "-", "lift-to-drag ratio")
+        self.V = V = Variable("V", "m/s", "cruising speed")
 
         constraints = []
 
         constraints += [
-            self.engineP["T"] * V
-            <= self.aircraft.engine["\\eta_{prop}"] * self.engineP["P_{shaft}"],
-            C_D
-            >= self.fuseP["C_{D_{fuse}}"]
-            + self.wingP["C_{D_{wpar}}"]
-            + self.wingP["C_{D_{ind}}"],
-            D >= 0.5 * state["\\rho"] * self.aircraft["S"] * C_D * V**2,
-            self.wingP["Re"]
-            == (state["\\rho"] / state["\\mu"])
+            self.engineP.Thrust * V
+            <= self.aircraft.engine.eta_prop * self.engineP.P_shaft,
+            C_D >= self.fuseP.Cd + self.wingP.C_D_wpar + self.wingP.C_D_ind,
+            D >= 0.5 * state.rho * self.aircraft.wing.S * C_D * V**2,
+            self.wingP.Re
+            == (state.rho / state.mu)
             * V
-            * (self.aircraft["S"] / self.aircraft["A"]) ** 0.5,
-            self.fuseP["Re_{fuse}"]
-            == state["\\rho"] * V * self.aircraft.fuse["l_{fuse}"] / state["\\mu"],
-            LoD == self.wingP["C_L"] / C_D,
+            * (self.aircraft.wing.S / self.aircraft.wing.A) ** 0.5,
+            self.fuseP.Re == state.rho * V * self.aircraft.fuse.l / state.mu,
+            LoD == self.wingP.C_L / C_D,
         ]
 
         return constraints, self.Pmodels
@@ -88,15 +85,17 @@ class SimPleACP(Model):
 class Fuselage(Model):
     def setup(self):
         # Free Variables
-        S = Variable("S_{fuse}", "m^2", "fuselage surface area")
-        l = Variable("l_{fuse}", "m", "fuselage length")
-        r = Variable("r_{fuse}", "m", "fuselage minor radius")
-        f = Variable("f_{fuse}", "-", "fuselage fineness ratio", fix=True)
-        k = Variable("k_{fuse}", "-", "fuselage form factor")
+        self.S = S = Variable("S_{fuse}", "m^2", "fuselage surface area")
+        self.l = l = Variable("l_{fuse}", "m", "fuselage length")
+        self.r = r = Variable("r_{fuse}", "m", "fuselage minor radius")
+        self.f = f = Variable("f_{fuse}", "-", "fuselage fineness ratio")
+        self.k = k = Variable("k_{fuse}", "-", "fuselage form factor")
         # Free variables (fixed for performance eval.)
-        V = Variable("V_{fuse}", "m^3", "total volume in the fuselage", fix=True)
-        V_f_fuse = Variable("V_{f_{fuse}}", "m^3", "fuel volume in the fuselage")
-        W_fuse = Variable("W_{fuse}", "N", "fuselage weight")
+        self.V = V = Variable("V_{fuse}", "m^3", "total volume in the fuselage")
+        self.V_f_fuse = V_f_fuse = Variable(
+            "V_{f_{fuse}}", "m^3", "fuel volume in the fuselage"
+        )
+        self.W_fuse = W_fuse = Variable("W_{fuse}", "N", "fuselage weight")
         p = 1.6075
 
         constraints = [
@@ -117,21 +116,23 @@ class Fuselage(Model):
 class FuselageP(Model):
     def setup(self, fuselage, state):  # noqa: ARG002
         # Constants
-        Cfref = Variable(
+        self.Cfref = Cfref = Variable(
             "C_{f_{fuse,ref}}",
             0.455,
             "-",
             "fuselage reference skin friction coefficient",
-            pr=10.0,
         )
+        self.pr = {Cfref: 10.0}  # percent uncertainties
         # Free Variables
-        Re = Variable("Re_{fuse}", "-", "fuselage Reynolds number")
-        Cf = Variable("C_{f_{fuse}}", "-", "fuselage skin friction coefficient")
-        Cd = Variable("C_{D_{fuse}}", "-", "fuselage drag coefficient")
+        self.Re = Re = Variable("Re_{fuse}", "-", "fuselage Reynolds number")
+        self.Cf = Cf = Variable(
+            "C_{f_{fuse}}", "-", "fuselage skin friction coefficient"
+        )
+        self.Cd = Cd = Variable("C_{D_{fuse}}", "-", "fuselage drag coefficient")
 
         constraints = [
             Cf >= Cfref / Re**0.3,
-            Cd >= fuselage["k_{fuse}"] * Cf,
+            Cd >= fuselage.k * Cf,
         ]
         return constraints
 
@@ -139,11 +140,13 @@ class FuselageP(Model):
 class Wing(Model):
     def setup(self):
         # Non-dimensional constants
-        C_Lmax = Variable("C_{L,max}", 1.6, "-", "lift coefficient at stall", pr=5.0)
-        e = Variable("e", 0.92, "-", "Oswald efficiency factor", pr=3.0)
-        N_ult = Variable("N_{ult}", 3, "-", "ultimate load factor", pr=15.0)
-        tau = Variable("\\tau", "-", "airfoil thickness to chord ratio", fix=True)
-        tau_ref = Variable(
+        self.C_Lmax = C_Lmax = Variable(
+            "C_{L,max}", 1.6, "-", "lift coefficient at stall"
+        )
+        self.e = e = Variable("e", 0.92, "-", "Oswald efficiency factor")
+        self.N_ult = N_ult = Variable("N_{ult}", 3, "-", "ultimate load factor")
+        self.tau = tau = Variable("\\tau", "-", "airfoil thickness to chord ratio")
+        self.tau_ref = tau_ref = Variable(
             "\\tau_{ref}",
             0.12,
             "-",
@@ -151,20 +154,31 @@ class Wing(Model):
         )
 
         # Dimensional constants
-        W_w_coeff1 = Variable(
-            "W_{w_{coeff1}}", 2e-5, "1/m", "wing weight coefficient 1", pr=30.0
+        self.W_w_coeff1 = W_w_coeff1 = Variable(
+            "W_{w_{coeff1}}", 2e-5, "1/m", "wing weight coefficient 1"
         )  # orig  12e-5
-        W_w_coeff2 = Variable(
-            "W_{w_{coeff2}}", 60.0, "Pa", "wing weight coefficient 2", pr=10.0
+        self.W_w_coeff2 = W_w_coeff2 = Variable(
+            "W_{w_{coeff2}}", 60.0, "Pa", "wing weight coefficient 2"
         )
+        self.pr = {
+            C_Lmax: 5.0,
+            e: 3.0,
+            N_ult: 15.0,
+            W_w_coeff1: 30.0,
+            W_w_coeff2: 10.0,
+        }  # percent uncertainties
 
         # Free Variables (fixed for performance eval.)
-        A = Variable("A", "-", "aspect ratio", fix=True)
-        S = Variable("S", "m^2", "total wing area", fix=True)
-        W_w = Variable("W_w", "N", "wing weight")
-        W_w_strc = Variable("W_{w_{strc}}", "N", "wing structural weight", fix=True)
-        W_w_surf = Variable("W_{w_{surf}}", "N", "wing skin weight", fix=True)
-        V_f_wing = Variable("V_{f_{wing}}", "m^3", "fuel volume in the wing", fix=True)
+        self.A = A = Variable("A", "-", "aspect ratio")
+        self.S = S = Variable("S", "m^2", "total wing area")
+        self.W_w = W_w = Variable("W_w", "N", "wing weight")
+        self.W_w_strc = W_w_strc = Variable(
+            "W_{w_{strc}}", "N", "wing structural weight"
+        )
+        self.W_w_surf = W_w_surf = Variable("W_{w_{surf}}", "N", "wing skin weight")
+        self.V_f_wing = V_f_wing = Variable(
+            "V_{f_{wing}}", "m^3", "fuel volume in the wing"
+        )
 
         constraints = []
 
@@ -194,11 +208,17 @@ class WingP(Model):
     def setup(self, wing, state):  # noqa: ARG002
         self.wing = wing
         # Free Variables
-        C_D_ind = Variable("C_{D_{ind}}", "-", "wing induced drag coefficient")
-        C_D_wpar = Variable("C_{D_{wpar}}", "-", "wing profile drag coefficient")
-        C_L = Variable("C_L", "-", "wing lift coefficient")
-        Re = Variable("Re", "-", "Reynolds number")
-        Re_ref = Variable("Re_{ref}", 1500000, "-", "reference Reynolds number")
+        self.C_D_ind = C_D_ind = Variable(
+            "C_{D_{ind}}", "-", "wing induced drag coefficient"
+        )
+        self.C_D_wpar = C_D_wpar = Variable(
+            "C_{D_{wpar}}", "-", "wing profile drag coefficient"
+        )
+        self.C_L = C_L = Variable("C_L", "-", "wing lift coefficient")
+        self.Re = Re = Variable("Re", "-", "Reynolds number")
+        self.Re_ref = Re_ref = Variable(
+            "Re_{ref}", 1500000, "-", "reference Reynolds number"
+        )
 
         constraints = []
 
@@ -206,7 +226,7 @@ class WingP(Model):
         w = C_D_wpar
         u_1 = C_L
         u_2 = Re / Re_ref
-        u_3 = self.wing["\\tau"] / self.wing["\\tau_{ref}"]
+        u_3 = self.wing.tau / self.wing.tau_ref
         nc = (
             w**0.00488697
             >= 0.000347324
@@ -221,7 +241,7 @@ class WingP(Model):
         )
         nc.name = "drag"
         constraints += [
-            C_D_ind == C_L**2 / (np.pi * self.wing["A"] * self.wing["e"]),
+            C_D_ind == C_L**2 / (np.pi * self.wing.A * self.wing.e),
             nc,
         ]
 
@@ -231,22 +251,30 @@ class WingP(Model):
 class Engine(Model):
     def setup(self):
         # Dimensional constants
-        BSFC_ref = Variable(
+        self.BSFC_ref = BSFC_ref = Variable(
             "BSFC_{ref}",
             0.32,
             "lbf/(hp*hr)",
             "reference brake specific fuel consumption",
         )
-        eta_prop = Variable("\\eta_{prop}", 0.8, "-", "propeller efficiency")
-        P_shaft_ref = Variable(
+        self.eta_prop = eta_prop = Variable(
+            "\\eta_{prop}", 0.8, "-", "propeller efficiency"
+        )
+        self.P_shaft_ref = P_shaft_ref = Variable(
             "P_{shaft,ref}", 10, "hp", "reference MSL maximum shaft power"
         )
-        W_e_ref = Variable("W_{e,ref}", 10, "lbf", "reference engine weight")
-        h_ref = Variable("h_{ref}", 15000, "ft", "engine lapse reference altitude")
+        self.W_e_ref = W_e_ref = Variable(
+            "W_{e,ref}", 10, "lbf", "reference engine weight"
+        )
+        self.h_ref = h_ref = Variable(
+            "h_{ref}", 15000, "ft", "engine lapse reference altitude"
+        )
 
         # Free variables
-        P_shaft_max = Variable("P_{shaft,max}", "kW", "MSL maximum shaft power")
-        W_e = Variable("W_e", "N", "engine weight", fix=True)
+        self.P_shaft_max = P_shaft_max = Variable(
+            "P_{shaft,max}", "kW", "MSL maximum shaft power"
+        )
+        self.W_e = W_e = Variable("W_e", "N", "engine weight")
 
         constraints = [
             (W_e / W_e_ref) == 1.27847 * (P_shaft_max / P_shaft_ref) ** 0.772392
@@ -263,163 +291,218 @@ class EngineP(Model):
         # Dimensional constants
 
         # Free variables
-        BSFC = Variable("BSFC", "lbf/(hp*hr)", "brake specific fuel consumption")
-        P_shaft = Variable("P_{shaft}", "kW", "shaft power")
-        P_shaft_alt = Variable("P_{shaft,alt}", "kW", "maximum shaft power at altitude")
-        Thrust = Variable("T", "N", "propeller thrust")
+        self.BSFC = BSFC = Variable(
+            "BSFC", "lbf/(hp*hr)", "brake specific fuel consumption"
+        )
+        self.P_shaft = P_shaft = Variable("P_{shaft}", "kW", "shaft power")
+        self.P_shaft_alt = P_shaft_alt = Variable(
+            "P_{shaft,alt}", "kW", "maximum shaft power at altitude"
+        )
+        self.Thrust = Thrust = Variable("T", "N", "propeller thrust")
 
-        L = Variable("L", "-", "power lapse percentage")
+        self.L = L = Variable("L", "-", "power lapse percentage")
 
         constraints = []
 
         with SignomialsEnabled():
             constraints += [
                 P_shaft <= P_shaft_alt,
-                L == (0.937 * (state["h"] / self.engine["h_{ref}"]) ** 0.0922) ** 10,
-                SignomialEquality(1, L + P_shaft_alt / self.engine["P_{shaft,max}"]),
-                (BSFC / self.engine["BSFC_{ref}"]) ** (0.1)
+                L == (0.937 * (state.alt / self.engine.h_ref) ** 0.0922) ** 10,
+                SignomialEquality(1, L + P_shaft_alt / self.engine.P_shaft_max),
+                (BSFC / self.engine.BSFC_ref) ** (0.1)
                 >= 0.984 * (P_shaft / P_shaft_alt) ** -0.0346,
-                BSFC / self.engine["BSFC_{ref}"] >= 1.0,
+                BSFC / self.engine.BSFC_ref >= 1.0,
             ]
         return constraints
 
 
 class Mission(Model):
-    def setup(self, aircraft, Nsegments):
+    """Mission of Nsegments flight segments
+
+    By default the aircraft climbs through the segments to above h_{cruise_m}.
+    If `altitudes` (one per segment, in m) are given instead, each segment is
+    flown level at its altitude and the atmosphere there is tabulated rather
+    than fit, so the mission has fewer signomial constraints. The altitudes
+    must be given here rather than substituted for `state.alt` afterwards,
+    which would leave the tabulated density stale (solving then raises).
+    With fixed altitudes the stall constraint is written once, at the
+    highest of them, where the density is lowest: it implies the stall
+    constraint of every other fixed segment. Free (nan) segments keep their
+    own.
+    """
+
+    @classmethod
+    def default(cls):
+        "a 3000 km, 4-segment mission trading fuel weight against flight time"
+        m = cls(SimPleAC(), 4)
+        m.substitutions.update(
+            {
+                m.hcruise: 5000 * units("m"),
+                m.Range: 3000 * units("km"),
+                m.W_p: 3000 * units("N"),
+                m.rho_p: 1500 * units("kg/m^3"),
+                m.cost_index: 120 * units("1/hr"),
+                m.V_min: 35 * units("m/s"),
+                m.TOfac: 2,
+            }
+        )
+        m.cost = m.W_f_m * units("1/N") + m.cost_index * m.t_m
+        return m
+
+    def setup(self, aircraft, Nsegments, include_aircraft=True, altitudes=None):
         self.aircraft = aircraft
-        W_f_m = Variable("W_{f_m}", "N", "total mission fuel")
-        t_m = Variable("t_m", "hr", "total mission time")
+        self.W_f_m = W_f_m = Variable("W_{f_m}", "N", "total mission fuel")
+        self.t_m = t_m = Variable("t_m", "hr", "total mission time")
 
         with Vectorize(Nsegments):
-            Wavg = Variable("W_{avg}", "N", "segment average weight")
-            Wstart = Variable(
+            self.Wavg = Wavg = Variable("W_{avg}", "N", "segment average weight")
+            self.Wstart = Wstart = Variable(
                 "W_{start}", "N", "weight at the beginning of flight segment"
             )
-            Wend = Variable("W_{end}", "N", "weight at the end of flight segment")
-            h = Variable("h", "m", "final segment flight altitude")
-            havg = Variable("h_{avg}", "m", "average segment flight altitude")
-            dhdt = Variable("\\frac{dh}{dt}", "m/hr", "climb rate")
-            W_f_s = Variable("W_{f_s}", "N", "segment fuel burn")
-            t_s = Variable("t_s", "hr", "time spent in flight segment")
-            R_s = Variable("R_s", "km", "range flown in segment")
-            state = Atmosphere()
+            self.Wend = Wend = Variable(
+                "W_{end}", "N", "weight at the end of flight segment"
+            )
+            self.h = h = Variable("h", "m", "final segment flight altitude")
+            self.havg = havg = Variable(
+                "h_{avg}", "m", "average segment flight altitude"
+            )
+            self.dhdt = dhdt = Variable("\\frac{dh}{dt}", "m/hr", "climb rate")
+            self.W_f_s = W_f_s = Variable("W_{f_s}", "N", "segment fuel burn")
+            self.t_s = t_s = Variable("t_s", "hr", "time spent in flight segment")
+            self.R_s = R_s = Variable("R_s", "km", "range flown in segment")
+            self.state = state = Atmosphere(h=altitudes)
             self.aircraftP = self.aircraft.dynamic(state)
 
         # Mission variables
-        hcruise = Variable("h_{cruise_m}", "m", "minimum cruise altitude")
-        Range = Variable("Range_m", "km", "aircraft range")
-        W_p = Variable("W_{p_m}", "N", "payload weight", pr=20.0)
-        rho_p = Variable("\\rho_{p_m}", "kg/m^3", "payload density", pr=10.0)
-        V_min = Variable("V_{min_m}", "m/s", "takeoff speed", pr=20.0)
-        TOfac = Variable("T/O factor_m", "-", "takeoff thrust factor")
-        cost_index = Variable("C_m", "1/hr", "hourly cost index")
+        self.hcruise = hcruise = Variable(
+            "h_{cruise_m}", "m", "minimum cruise altitude"
+        )
+        self.Range = Range = Variable("Range_m", "km", "aircraft range")
+        self.W_p = W_p = Variable("W_{p_m}", "N", "payload weight")
+        self.rho_p = rho_p = Variable("\\rho_{p_m}", "kg/m^3", "payload density")
+        self.V_min = V_min = Variable("V_{min_m}", "m/s", "takeoff speed")
+        self.pr = {W_p: 20.0, rho_p: 10.0, V_min: 20.0}  # percent uncertainties
+        self.TOfac = TOfac = Variable("T/O factor_m", "-", "takeoff thrust factor")
+        self.cost_index = cost_index = Variable("C_m", "1/hr", "hourly cost index")
 
         constraints = []
 
         # Setting up the mission
         with SignomialsEnabled():
             constraints += [
-                havg == state["h"],  # Linking states
-                h[1 : Nsegments - 1] >= hcruise,  # Adding minimum cruise altitude
                 # Weights at beginning and end of mission
                 Wstart[0]
                 >= W_p
-                + self.aircraft.wing["W_w"]
-                + self.aircraft.engine["W_e"]
-                + self.aircraft.fuse["W_{fuse}"]
+                + self.aircraft.wing.W_w
+                + self.aircraft.engine.W_e
+                + self.aircraft.fuse.W_fuse
                 + W_f_m,
                 Wend[Nsegments - 1]
                 >= W_p
-                + self.aircraft.wing["W_w"]
-                + self.aircraft.engine["W_e"]
-                + self.aircraft.fuse["W_{fuse}"],
+                + self.aircraft.wing.W_w
+                + self.aircraft.engine.W_e
+                + self.aircraft.fuse.W_fuse,
                 # Lift, and linking segment start and end weights
                 Wavg
                 <= 0.5
-                * state["\\rho"]
-                * self.aircraft["S"]
-                * self.aircraftP.wingP["C_L"]
-                * self.aircraftP["V"] ** 2,
+                * state.rho
+                * self.aircraft.wing.S
+                * self.aircraftP.wingP.C_L
+                * self.aircraftP.V**2,
                 Wstart >= Wend + W_f_s,  # Making sure fuel gets burnt!
                 Wstart[1:Nsegments] == Wend[: Nsegments - 1],
                 Wavg == Wstart**0.5 * Wend**0.5,
-                # Altitude changes
-                h[0] == t_s[0] * dhdt[0],  # Starting altitude
-                dhdt >= 1.0 * units("m/hr"),
-                havg[0] == 0.5 * h[0],
-                havg[1:Nsegments] == (h[1:Nsegments] * h[0 : Nsegments - 1]) ** (0.5),
-                SignomialEquality(
-                    h[1:Nsegments],
-                    h[: Nsegments - 1] + t_s[1:Nsegments] * dhdt[1:Nsegments],
-                ),
                 # Thrust and fuel burn
                 W_f_s
-                >= self.aircraftP.engineP["BSFC"]
-                * self.aircraftP.engineP["P_{shaft}"]
-                * t_s,
-                self.aircraftP.engineP["T"] * self.aircraftP["V"]
-                >= self.aircraftP["D"] * self.aircraftP["V"] + Wavg * dhdt,
+                >= self.aircraftP.engineP.BSFC * self.aircraftP.engineP.P_shaft * t_s,
                 # Max MSL thrust at least 2*climb thrust
-                self.aircraft.engine["P_{shaft,max}"]
-                >= TOfac * self.aircraftP.engineP["P_{shaft}"][0],
+                self.aircraft.engine.P_shaft_max
+                >= TOfac * self.aircraftP.engineP.P_shaft[0],
                 # Flight time
-                t_s == R_s / self.aircraftP["V"],
+                t_s == R_s / self.aircraftP.V,
                 # Aggregating segment variables
-                self.aircraft["W_f"] >= W_f_m,
+                self.aircraft.W_f >= W_f_m,
                 R_s == Range / Nsegments,  # Dividing into equal range segments
                 W_f_m >= sum(W_f_s),
                 t_m >= sum(t_s),
             ]
+            if altitudes is not None:  # level flight
+                constraints += [
+                    self.aircraftP.engineP.Thrust >= self.aircraftP.D,
+                ]
+            else:
+                constraints += [
+                    havg == state.alt,  # Linking states
+                    h[1 : Nsegments - 1] >= hcruise,  # Adding minimum cruise altitude
+                    # Altitude changes
+                    h[0] == t_s[0] * dhdt[0],  # Starting altitude
+                    dhdt >= 1.0 * units("m/hr"),
+                    havg[0] == 0.5 * h[0],
+                    havg[1:Nsegments]
+                    == (h[1:Nsegments] * h[0 : Nsegments - 1]) ** (0.5),
+                    SignomialEquality(
+                        h[1:Nsegments],
+                        h[: Nsegments - 1] + t_s[1:Nsegments] * dhdt[1:Nsegments],
+                    ),
+                    self.aircraftP.engineP.Thrust * self.aircraftP.V
+                    >= self.aircraftP.D * self.aircraftP.V + Wavg * dhdt,
+                ]
 
         # Maximum takeoff weight
         constraints += [
-            self.aircraft["W"]
+            self.aircraft.W
             >= W_p
-            + self.aircraft.wing["W_w"]
-            + self.aircraft["W_f"]
-            + self.aircraft.engine["W_e"]
-            + self.aircraft.fuse["W_{fuse}"]
+            + self.aircraft.wing.W_w
+            + self.aircraft.W_f
+            + self.aircraft.engine.W_e
+            + self.aircraft.fuse.W_fuse
         ]
 
         # Stall constraint
+        rho = state.rho
+        if altitudes is not None:
+            # see the docstring: the other fixed segments' stall constraints
+            # would be parallel monomials differing only in coefficient,
+            # which the cvxopt interface merges
+            h_fixed = np.broadcast_to(np.asarray(altitudes, dtype=float), rho.shape)
+            stall = np.isnan(h_fixed)
+            if not stall.all():
+                stall[np.nanargmax(h_fixed)] = True
+            rho = rho[stall]
         constraints += [
-            self.aircraft["W"]
-            <= 0.5
-            * state["\\rho"]
-            * self.aircraft["S"]
-            * self.aircraft["C_{L,max}"]
-            * V_min**2
+            self.aircraft.W
+            <= 0.5 * rho * self.aircraft.wing.S * self.aircraft.wing.C_Lmax * V_min**2
         ]
 
         # Wing weight model
         constraints += [
-            self.aircraft.wing["W_{w_{strc}}"] ** 2.0
-            >= self.aircraft.wing["W_{w_{coeff1}}"] ** 2.0
-            / self.aircraft.wing["\\tau"] ** 2.0
+            self.aircraft.wing.W_w_strc**2.0
+            >= self.aircraft.wing.W_w_coeff1**2.0
+            / self.aircraft.wing.tau**2.0
             * (
-                self.aircraft.wing["N_{ult}"] ** 2.0
-                * self.aircraft.wing["A"] ** 3.0
+                self.aircraft.wing.N_ult**2.0
+                * self.aircraft.wing.A**3.0
                 * (
                     (
                         W_p
-                        + self.aircraft.fuse["W_{fuse}"]
-                        + self.aircraft["W_e"]
-                        + self.aircraft.fuse["V_{f_{fuse}}"]
-                        * self.aircraft["g"]
-                        * self.aircraft["\\rho_f"]
+                        + self.aircraft.fuse.W_fuse
+                        + self.aircraft.engine.W_e
+                        + self.aircraft.fuse.V_f_fuse
+                        * self.aircraft.g
+                        * self.aircraft.rho_f
                     )
-                    * self.aircraft["W"]
-                    * self.aircraft.wing["S"]
+                    * self.aircraft.W
+                    * self.aircraft.wing.S
                 )
             )
         ]
 
         # Fuselage volume and weight
         constraints += [
-            self.aircraft.fuse["V_{fuse}"]
-            >= self.aircraft.fuse["V_{f_{fuse}}"] + W_p / (rho_p * self.aircraft["g"]),
-            self.aircraft.fuse["W_{fuse}"]
-            == self.aircraft.fuse["S_{fuse}"] * self.aircraft.wing["W_{w_{coeff2}}"],
+            self.aircraft.fuse.V
+            >= self.aircraft.fuse.V_f_fuse + W_p / (rho_p * self.aircraft.g),
+            self.aircraft.fuse.W_fuse
+            == self.aircraft.fuse.S * self.aircraft.wing.W_w_coeff2,
         ]
 
         # Upper bounding variables
@@ -429,24 +512,13 @@ class Mission(Model):
             cost_index >= 1e-10 * units("1/hr"),
         ]
 
+        if not include_aircraft:  # e.g. one aircraft shared by several missions
+            return constraints, state, self.aircraftP
         return constraints, state, self.aircraft, self.aircraftP
 
 
 def test():
-    m = Mission(SimPleAC(), 4)
-    m.substitutions.update(
-        {
-            "h_{cruise_m}": 5000 * units("m"),
-            "Range_m": 3000 * units("km"),
-            "W_{p_m}": 3000 * units("N"),
-            "\\rho_{p_m}": 1500 * units("kg/m^3"),
-            "C_m": 120 * units("1/hr"),
-            "V_{min_m}": 35 * units("m/s"),
-            "T/O factor_m": 2,
-        }
-    )
-    m.cost = m["W_{f_m}"] * units("1/N") + m["C_m"] * m["t_m"]
-    _ = m.localsolve(verbosity=0)
+    _ = Mission.default().localsolve(verbosity=0)
 
 
 if __name__ == "__main__":
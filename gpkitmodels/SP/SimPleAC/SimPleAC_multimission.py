@@ -1,98 +1,111 @@
-from gpkit import Model, Variable, Vectorize, settings, units
+import numpy as np
+from gpkit import Model, NomialArray, Variable, Vectorize, units
 
 from gpkitmodels.SP.SimPleAC.SimPleAC_mission import Mission, SimPleAC
+from gpkitmodels.tools.template import Template
 
 # SimPleAC with multimission design (updated 5/31/2019, by Berk Ozturk)
 
 
 class Multimission(Model):
-    def setup(self, aircraft, Nmissions, Nsegments):
+    """Nmissions missions flown by one aircraft
+
+    Each mission's inputs are linked to a "_{mm}" variable vectorized over
+    the missions. With `vectorized=True` the missions are one Mission
+    vectorized over a mission axis rather than Nmissions separate Missions,
+    and most inputs (hcruise, Range, V_min, cost_index, TOfac) are that
+    Mission's own variables, without linking constraints. Only the payload
+    (W_p, rho_p) is still linked: it enters just the aircraft sizing
+    constraints, whose copies for each mission then differ only in a
+    constant, and gpkit's cvxopt interface can merge such copies as
+    duplicates. Substitute the inputs through their handles (e.g.
+    m.Range), which work in either case. `mission_var` gets a Mission
+    variable of every mission in either case, with missions on the first
+    axis.
+    """
+
+    # attribute: "_{mm}" variable name, units, description
+    INPUTS = {
+        "hcruise": ("h_{cruise_{mm}}", "m", "minimum cruise altitude"),
+        "Range": ("Range_{mm}", "km", "aircraft range"),
+        "W_p": ("W_{p_{mm}}", "N", "payload weight"),
+        "rho_p": ("\\rho_{p_{mm}}", "kg/m^3", "payload density"),
+        "V_min": ("V_{min_{mm}}", "m/s", "takeoff speed"),
+        "cost_index": ("C_{mm}", "1/hr", "hourly cost index"),
+        "TOfac": ("T/O factor_{mm}", "-", "takeoff thrust factor"),
+    }
+    DEFAULTS = {"rho_p": 1500, "V_min": 25, "TOfac": 2.0}
+
+    @classmethod
+    def default(cls):
+        "two 4-segment missions: one for fuel weight, one for flight time"
+        m = cls(SimPleAC(), 2, 4)
+        m.substitutions.update(
+            {
+                m.hcruise: [5000 * units("m"), 5000 * units("m")],
+                m.Range: [3000 * units("km"), 2000 * units("km")],
+                m.W_p: [6250 * units("N"), 8000 * units("N")],
+                m.rho_p: [1500 * units("kg/m^3"), 2000 * units("kg/m^3")],
+                m.cost_index: [120 * units("1/hr"), 360 * units("1/hr")],
+            }
+        )
+        W_f, C, t = (m.mission_var(name) for name in ("W_f_m", "cost_index", "t_m"))
+        m.cost = W_f[0] * units("1/N") + C[1] * t[1]
+        return m
+
+    def setup(self, aircraft, Nmissions, Nsegments, vectorized=False):
         self.aircraft = aircraft
-        self.missions = []
-        for i in range(0, Nmissions):
-            self.missions.append(Mission(self.aircraft, Nsegments))
+        self.vectorized = vectorized
+        if vectorized:
+            with Vectorize(Nmissions):
+                self.missions = Mission(
+                    self.aircraft, Nsegments, include_aircraft=False
+                )
+        else:
+            # the missions are identical until substituted, so set up one and copy it
+            template = Template(
+                Mission(self.aircraft, Nsegments, include_aircraft=False)
+            )
+            self.missions = [template.model]
+            self.missions += [template.clone() for _ in range(1, Nmissions)]
 
         # Multimission objective variables
-        W_f_mm = Variable("W_{f_{mm}}", "N", "multimission fuel weight")
+        self.W_f_mm = W_f_mm = Variable("W_{f_{mm}}", "N", "multimission fuel weight")
 
+        # Mission variables
+        linked = ("W_p", "rho_p") if vectorized else tuple(self.INPUTS)
         with Vectorize(Nmissions):
-            # Mission variables
-            hcruise = Variable("h_{cruise_{mm}}", "m", "minimum cruise altitude")
-            Range = Variable("Range_{mm}", "km", "aircraft range")
-            W_p = Variable("W_{p_{mm}}", "N", "payload weight", pr=20.0)
-            rho_p = Variable(
-                "\\rho_{p_{mm}}", 1500, "kg/m^3", "payload density", pr=10.0
-            )
-            V_min = Variable("V_{min_{mm}}", 25, "m/s", "takeoff speed", pr=20.0)
-            cost_index = Variable("C_{mm}", "1/hr", "hourly cost index")
-            TOfac = Variable("T/O factor_{mm}", 2.0, "-", "takeoff thrust factor")
-
-        constraints = []
+            for attr in linked:
+                setattr(self, attr, Variable(*self.INPUTS[attr]))
+        for attr in self.INPUTS:
+            if attr not in linked:
+                setattr(self, attr, getattr(self.missions, attr))
+        substitutions = {
+            getattr(self, attr): np.full(Nmissions, value)
+            for attr, value in self.DEFAULTS.items()
+        }
+        self.pr = {self.W_p: 20.0, self.rho_p: 10.0, self.V_min: 20.0}  # percent
 
         # Setting up the missions
-        for i in range(0, Nmissions):
-            constraints += [
-                self.missions[i]["h_{cruise_m}"] == hcruise[i],
-                self.missions[i]["Range_m"] == Range[i],
-                self.missions[i]["W_{p_m}"] == W_p[i],
-                self.missions[i]["\\rho_{p_m}"] == rho_p[i],
-                self.missions[i]["V_{min_m}"] == V_min[i],
-                self.missions[i]["C_m"] == cost_index[i],
-                self.missions[i]["T/O factor_m"] == TOfac[i],
-                # Upper bounding relevant variables
-                W_f_mm <= 1e11 * units("N"),
-            ]
+        constraints = [self.mission_var(attr) == getattr(self, attr) for attr in linked]
+        # Upper bounding relevant variables
+        constraints += [W_f_mm <= 1e11 * units("N")]
 
         # Multimission constraints
-        constraints += [
-            W_f_mm >= sum(self.missions[i]["W_{f_m}"] for i in range(0, Nmissions))
-        ]
+        constraints += [W_f_mm >= sum(self.mission_var("W_f_m"))]
 
-        return constraints, self.aircraft, self.missions
+        return [constraints, self.aircraft, self.missions], substitutions
 
+    def mission_var(self, attr):
+        "a Mission variable handle, e.g. 'W_f_m', as an array over missions"
+        if self.vectorized:  # Vectorize puts the mission axis last
+            return np.moveaxis(getattr(self.missions, attr), -1, 0)
+        return NomialArray([getattr(mission, attr) for mission in self.missions])
 
-def test():
-    Nmissions = 2
-    Nsegments = 4
-    aircraft = SimPleAC()
-    m = Multimission(aircraft, Nmissions, Nsegments)
-    m.substitutions.update(
-        {
-            "h_{cruise_{mm}}": [5000 * units("m"), 5000 * units("m")],
-            "Range_{mm}": [3000 * units("km"), 2000 * units("km")],
-            "W_{p_{mm}}": [6250 * units("N"), 8000 * units("N")],
-            "\\rho_{p_{mm}}": [1500 * units("kg/m^3"), 2000 * units("kg/m^3")],
-            "C_{mm}": [120 * units("1/hr"), 360 * units("1/hr")],
-        }
-    )
 
-    m.cost = (
-        m.missions[0]["W_{f_m}"] * units("1/N")
-        + m.missions[1]["C_m"] * m.missions[1]["t_m"]
-    )
-    if settings["default_solver"] == "cvxopt":
-        return
-    else:
-        _ = m.localsolve(verbosity=0)
+def test():
+    _ = Multimission.default().localsolve(verbosity=0)
 
 
 if __name__ == "__main__":
-    Nmissions = 2
-    Nsegments = 4
-    aircraft = SimPleAC()
-    m = Multimission(aircraft, Nmissions, Nsegments)
-    m.substitutions.update(
-        {
-            "h_{cruise_{mm}}": [5000 * units("m"), 5000 * units("m")],
-            "Range_{mm}": [3000 * units("km"), 2000 * units("km")],
-            "W_{p_{mm}}": [6250 * units("N"), 8000 * units("N")],
-            "\\rho_{p_{mm}}": [1500 * units("kg/m^3"), 2000 * units("kg/m^3")],
-            "C_{mm}": [120 * units("1/hr"), 360 * units("1/hr")],
-        }
-    )
-
-    m.cost = (
-        m.missions[0]["W_{f_m}"] * units("1/N")
-        + m.missions[1]["C_m"] * m.missions[1]["t_m"]
-    )
-    sol = m.localsolve(verbosity=2)
+    sol = Multimission.default().localsolve(verbosity=2)
@@ -0,0 +1,54 @@
+"Tests for the per-mission and vectorized Multimission formulations"
+
+import pytest
+from gpkit import units
+
+from gpkitmodels.SP.SimPleAC import SimPleAC_multimission
+from gpkitmodels.SP.SimPleAC.SimPleAC_mission import SimPleAC
+from gpkitmodels.SP.SimPleAC.SimPleAC_multimission import Multimission
+
+SUBS = {
+    "hcruise": [5000, 5000],
+    "Range": [3000, 2000],
+    "W_p": [6250, 8000],
+    "rho_p": [1500, 2000],
+    "cost_index": [120, 360],
+}
+
+
+def multimission(vectorized):
+    "two-mission design, minimizing the first mission's fuel"
+    m = Multimission(SimPleAC(), 2, 3, vectorized=vectorized)
+    m.substitutions.update({getattr(m, attr): v for attr, v in SUBS.items()})
+    m.cost = m.mission_var("W_f_m")[0] * units("1/N")
+    return m
+
+
+def test_mission_var():
+    "mission variables index by mission in both formulations"
+    for vectorized in (False, True):
+        m = Multimission(SimPleAC(), 3, 4, vectorized=vectorized)
+        assert m.mission_var("W_f_m").shape == (3,)
+        assert m.mission_var("h").shape == (3, 4)
+        h = m.mission_var("h")[1][0]  # mission 1, segment 0
+        if vectorized:
+            assert h.key == m.missions.h[0, 1].key
+        else:
+            assert h.key == m.missions[1].h[0].key
+
+
+def test_same_optimum():
+    "the vectorized formulation links only the payload, to the same optimum"
+    per_mission, vectorized = multimission(False), multimission(True)
+    assert len(per_mission.vks) - len(vectorized.vks) == 5 * 2
+    sols = [m.localsolve(verbosity=0) for m in (per_mission, vectorized)]
+    assert sols[1].cost == pytest.approx(sols[0].cost, rel=1e-4)
+    W = [
+        sol[m.aircraft.get_var("W")] for m, sol in zip((per_mission, vectorized), sols)
+    ]
+    assert W[1].magnitude == pytest.approx(W[0].magnitude, rel=1e-3)
+
+
+def test_module_test():
+    "the module's own test() runs"
+    SimPleAC_multimission.test()
@@ -2,47 +2,22 @@
 
 from __future__ import print_function
 
-import inspect
-import os
 import sys
 from builtins import range, zip
 
-import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
-from gpfit.fit import fit
 
-from gpkitmodels.GP.aircraft.prop.propeller import ActuatorProp
+from gpkitmodels.tools.fit_constraintset import evaluate_fit
+from gpkitmodels.tools.polarfit import regenerate, text_to_df
 
 GENERATE = True
-plt.rcParams.update({"font.size": 15})
-
-
-def text_to_df(filename):
-    "parse XFOIL polars and concatente data in DataFrame"
-    lines = list(open(filename))
-    for i, l in enumerate(lines):
-        lines[i] = l.split("\n")[0]
-        for j in 10 - np.arange(9):
-            if " " * j in lines[i]:
-                lines[i] = lines[i].replace(" " * j, " ")
-            if "---" in lines[i]:
-                start = i
-    data = {}
-    titles = lines[start - 1].split(" ")[1:]
-    for t in titles:
-        data[t] = []
-
-    for line in lines[start + 1 :]:
-        for i, v in enumerate(line.split(" ")[1:]):
-            data[titles[i]].append(v)
-
-    df = pd.DataFrame(data)
-    return df
 
 
 def fit_setup(Re_range):
     "set up x and y parameters for gp fitting"
+    import matplotlib.pyplot as plt  # noqa: PLC0415
+
+    plt.rcParams.update({"font.size": 15})
     CL = []
     CD = []
     RE = []
@@ -50,21 +25,21 @@ def fit_setup(Re_range):
     for r in Re_range:
         dataf = text_to_df("dae51.ncrit09.Re%dk.pol" % r)
         if r < 150:
-            cl = dataf["CL"].values.astype(np.float)
-            cd = dataf["CD"].values.astype(np.float)
+            cl = dataf["CL"].values.astype(float)
+            cd = dataf["CD"].values.astype(float)
             CL.append(np.hstack([cl[cl >= 1.0]] * 1))
             CD.append(np.hstack([cd[cl >= 1.0]] * 1))
         elif r < 200:
-            cl = dataf["CL"].values.astype(np.float)
-            cd = dataf["CD"].values.astype(np.float)
+            cl = dataf["CL"].values.astype(float)
+            cd = dataf["CD"].values.astype(float)
             CL.append(cl[cl >= 0.9])
             CD.append(cd[cl >= 0.9])
         else:
-            CL.append(dataf["CL"].values.astype(np.float))
-            CD.append(dataf["CD"].values.astype(np.float))
+            CL.append(dataf["CL"].values.astype(float))
+            CD.append(dataf["CD"].values.astype(float))
         ax.plot(
-            dataf["CL"].values.astype(np.float),
-            dataf["CD"].values.astype(np.float),
+            dataf["CL"].values.astype(float),
+            dataf["CD"].values.astype(float),
         )
         ax.legend(["%d" % re for re in Re_range])
         RE.append([r * 1000.0] * len(CL[-1]))
@@ -91,8 +66,11 @@ def return_fit(cl, re):
     return cd
 
 
-def plot_fits(re, cnstr, x, y):  # noqa: ARG001 (see gpkit-models#30)
+def plot_fits(re, fitdata, x, y):  # noqa: ARG001 (see gpkit-models#30)
     "plot fit compared to data"
+    import matplotlib.pyplot as plt  # noqa: PLC0415
+
+    plt.rcParams.update({"font.size": 15})
     # colors = ["k", "m", "b", "g", "y"]
     colors = ["#084081", "#0868ac", "#2b8cbe", "#4eb3d3", "#7bccc4"]
     assert len(re) == len(colors)
@@ -100,7 +78,7 @@ def plot_fits(re, cnstr, x, y):  # noqa: ARG001 (see gpkit-models#30)
     xre = np.exp(lre)
     xcl = [np.exp(X[0][ind[i - 1] : ind[i]]) for i in range(1, len(ind))]
     cds = [np.exp(Y[ind[i - 1] : ind[i]]) for i in range(1, len(ind))]
-    yfit = cnstr.evaluate(x)
+    yfit = np.log(evaluate_fit(fitdata, np.exp(x)))
     cdf = [np.exp(yfit[ind[i - 1] : ind[i]]) for i in range(1, len(ind))]
     fig, ax = plt.subplots()
     i = 0
@@ -119,20 +97,14 @@ def plot_fits(re, cnstr, x, y):  # noqa: ARG001 (see gpkit-models#30)
 
 if __name__ == "__main__":
     Re = np.array([50, 75, 125, 150, 200, 300, 400, 500, 600, 700])
-    X, Y = fit_setup(Re)  # call fit(X, Y, 4, "SMA") to get fit
-    np.random.seed(0)
-    cn, err = fit(X, Y, 3, "SMA")
-    print("RMS error: %.5f" % err)
-    df = cn.get_dataframe()
-    if GENERATE:
-        path = os.path.dirname(inspect.getfile(ActuatorProp))
-        df.to_csv(path + os.sep + "dae51_fitdata.csv", index=False)
-    else:
-        df.to_csv("dae51fitdata.csv", index=False)
+    X, Y = fit_setup(Re)
+    # same data selection as fit_setup; writes ../dae51_fitdata.csv
+    fd = regenerate("dae51", output=None if GENERATE else "dae51fitdata.csv")
+    print("RMS error: %.5f" % fd["rms_err"])
 
     # replot = np.array([150, 200, 300, 350, 400])
     replot = np.array([300, 350, 400, 450, 500])
-    F, A = plot_fits(replot, cn, X, Y)
+    F, A = plot_fits(replot, fd, X, Y)
     if len(sys.argv) > 1:
         path = sys.argv[1]
         F.savefig(path + "dae51polarfit1.eps", bbox_inches="tight")
@@ -1,9 +1,7 @@
 "propeller model"
 
-import os
 from builtins import range
 
-import pandas as pd
 from gpkit import (
     Model,
     SignomialEquality,
@@ -15,6 +13,7 @@ from gpkit.constraints.tight import Tight as TCS
 from numpy import pi
 
 from gpkitmodels.tools.fit_constraintset import FitCS
+from gpkitmodels.tools.fitdata import fitdata_path, load_fitdata
 
 
 class BladeElementPerf(Model):
@@ -51,10 +50,7 @@ class BladeElementPerf(Model):
         rho = state.rho
         R = static.R
         mu = state.mu
-        path = os.path.dirname(__file__)
-        fd = pd.read_csv(path + os.sep + "dae51_fitdata.csv").to_dict(orient="records")[
-            0
-        ]
+        fd = load_fitdata(fitdata_path(__file__, "dae51_fitdata.csv"))
         c = static.c
 
         dT, eta_i, dQ, omega, Wa, Wt, Wr, va, vt = (
@@ -11,8 +11,8 @@ class Wing(WingGP):
 
     mw = Var("-", "span wise effectiveness")
 
-    def setup(self, N=5):
-        self.wing = WingGP.setup(self, N=N)
+    def setup(self, N=5, eta="uniform"):
+        self.wing = WingGP.setup(self, N=N, eta=eta)
         with SignomialsEnabled():
             constraints = [self.mw * (1 + 2 / self.planform.AR) >= 2 * np.pi]
 
@@ -1,5 +1,6 @@
 from __future__ import print_function
 
+import numpy as np
 from gpkit import (
     Model,
     SignomialEquality,
@@ -8,6 +9,42 @@ from gpkit import (
     units,
 )
 
+# 1976 standard atmosphere up to 20 km, tabulated every 100 m
+TABLE_H = np.linspace(0, 20000, 201)  # m
+_T = np.maximum(288.15 - 0.0065 * TABLE_H, 216.65)  # K
+_P = np.where(
+    TABLE_H <= 11000,
+    101325 * (_T / 288.15) ** 5.2559,
+    22632 * np.exp(-9.80665 * (TABLE_H - 11000) / (287.05 * 216.65)),
+)
+TABLE_RHO = _P / (287.05 * _T)  # kg/m^3
+TABLE_MU = 1.458e-6 * _T**1.5 / (_T + 110.4)  # kg/m/s
+
+
+def standard_atmosphere(h):
+    """(rho [kg/m^3], mu [kg/m/s]) at altitudes h [m], from the table
+
+    Interpolates log density and viscosity; h may be any array shape.
+    """
+    h = np.asarray(h, dtype=float)
+    if np.any((h < TABLE_H[0]) | (h > TABLE_H[-1])):
+        raise ValueError("altitudes must be within 0-%d m" % TABLE_H[-1])
+    rho = np.exp(np.interp(h, TABLE_H, np.log(TABLE_RHO)))
+    mu = np.exp(np.interp(h, TABLE_H, np.log(TABLE_MU)))
+    return rho, mu
+
+
+def _meters(h):
+    "altitudes (numbers in m, or gpkit/pint quantities) as floats in m"
+
+    def value(x):
+        if hasattr(x, "to"):
+            x = x.to("m")
+            x = getattr(x, "c", x)  # Monomial coefficient
+        return getattr(x, "magnitude", x)
+
+    return np.vectorize(value, otypes=[float])(h)
+
 
 class Atmosphere(Model):
     """
@@ -16,33 +53,48 @@ class Atmosphere(Model):
     The rest are commented, to be used with modeler's discretion!
     Boundedness will vary depending on model application for other variables.
     Signomial equalities are fast and reliable here!
+
+    Altitudes that are known when the model is built can be passed as `h`
+    (in meters, or with units; nan where altitude is free). Those entries
+    take their density and viscosity from the standard atmosphere table as
+    substitutions, so only free altitudes need the signomial fits, and a
+    fully fixed atmosphere is a GP. Substituting other values for those
+    altitudes afterwards would leave density and viscosity stale, so
+    solving then raises a ValueError.
     """
 
-    def setup(self):
+    def setup(self, h=None):
         # Env. constants
-        alt_top = Variable("h_{top}", 10000, "m", "highest altitude valid")
+        self.alt_top = alt_top = Variable(
+            "h_{top}", 10000, "m", "highest altitude valid"
+        )
         # a_MSL   = Variable('a_{MSL}',340.20,'m/s','Speed of sound at MSL')
-        mu_MSL = Variable(
+        self.mu_MSL = mu_MSL = Variable(
             "\\mu_{MSL}",
             1.778e-5,
             "kg/m/s",
             "dynamic viscosity at MSL",
-            pr=4.0,
         )
         # nu_MSL  = Variable('\\nu_{MSL}', 1.4524e-5, 'm^2/s', 'kinematic viscosity at MSL')
         # T_MSL   = Variable('T_{MSL}', 288.19, 'K', 'temperature at MSL')
-        rho_MSL = Variable(
-            "\\rho_{MSL}", 1.2256, "kg/m^3", "density of air at MSL", pr=5.0
+        self.rho_MSL = rho_MSL = Variable(
+            "\\rho_{MSL}", 1.2256, "kg/m^3", "density of air at MSL"
         )
         # p_MSL   = Variable('P_{MSL}', 101308, 'Pa', 'pressure at MSL')
 
-        alt = Variable("h", "m", "altitude")
+        self.alt = alt = Variable("h", "m", "altitude")
         # a   = Variable('a','m/s','Speed of sound')
-        mu = Variable("\\mu", "kg/m/s", "dynamic viscosity", pr=4.0)
+        self.mu = mu = Variable("\\mu", "kg/m/s", "dynamic viscosity")
         # nu  = Variable('\\nu', 'm^2/s', 'kinematic viscosity')
         # p   = Variable('P', 'Pa', 'pressure')
         # T   = Variable('T', 'K', 'temperature ')
-        rho = Variable("\\rho", "kg/m^3", "density of air", pr=5.0)
+        self.rho = rho = Variable("\\rho", "kg/m^3", "density of air")
+        self.pr = {
+            mu_MSL: 4.0,
+            rho_MSL: 5.0,
+            mu: 4.0,
+            rho: 5.0,
+        }  # percent uncertainties
 
         # Defining ratios needed for constraints
         alt_rat = alt / alt_top
@@ -53,6 +105,25 @@ class Atmosphere(Model):
         rho_rat = rho / rho_MSL
         # T_rat = T/T_MSL
 
+        substitutions = {}
+        self.h_tabulated = {}  # {altitude key: altitude [m] read from the table}
+        if h is not None:
+            h = np.broadcast_to(_meters(h), np.shape(alt))
+            fixed = ~np.isnan(h)
+            rho_h, mu_h = standard_atmosphere(np.where(fixed, h, 0))
+            for i in np.ndindex(fixed.shape):
+                if fixed[i]:
+                    for var, value in ((alt, h), (rho, rho_h), (mu, mu_h)):
+                        substitutions[var[i].key if i else var.key] = value[i]
+                    self.h_tabulated[alt[i].key if i else alt.key] = h[i]
+            if fixed.all():
+                return [], substitutions
+            if fixed.any():  # fits only where altitude is free
+                free = ~fixed
+                alt, alt_rat, mu_rat, rho_rat = (
+                    x[free] for x in (alt, alt_rat, mu_rat, rho_rat)
+                )
+
         constraints = []
         with SignomialsEnabled():
             constraints += [
@@ -71,12 +142,23 @@ class Atmosphere(Model):
                 # T_rat ** -0.00706   >=  1.00 * (alt_rat) ** 1.21e-05,# + 0.00173 * (alt_rat) ** 1.13,
             ]
 
-        return constraints
+        return constraints, substitutions
+
+    def process_result(self, result):
+        "Checks the tabulated altitudes weren't substituted over"
+        super().process_result(result)
+        for key, h in self.h_tabulated.items():
+            if not np.isclose(result.constants[key], h):
+                raise ValueError(
+                    "%s was substituted after the atmosphere was tabulated at"
+                    " %g m; pass the altitudes to Atmosphere (or Mission)"
+                    " instead" % (key, h)
+                )
 
 
 if __name__ == "__main__":
     m = Atmosphere()
     m.substitutions.update({"h": 5000 * units("m")})
-    m.cost = m["\\mu"] * m["\\rho"]
+    m.cost = m.get_var("\\mu") * m.get_var("\\rho")
     sol = m.localsolve(verbosity=3)
     print(sol.table())
@@ -0,0 +1,61 @@
+"Tests for the atmosphere models"
+
+import numpy as np
+import pytest
+from gpkit import Vectorize, units
+
+from gpkitmodels.SP.atmosphere.atmosphere import Atmosphere, standard_atmosphere
+from gpkitmodels.SP.SimPleAC.SimPleAC_mission import Mission, SimPleAC
+
+MISSION_SUBS = {
+    "Range_m": 3000 * units("km"),
+    "W_{p_m}": 3000 * units("N"),
+    "\\rho_{p_m}": 1500 * units("kg/m^3"),
+    "C_m": 120 * units("1/hr"),
+    "V_{min_m}": 35 * units("m/s"),
+    "T/O factor_m": 2,
+}
+
+
+def test_standard_atmosphere():
+    "table matches the 1976 standard atmosphere"
+    rho, mu = standard_atmosphere([0, 5000, 11000, 15000])
+    np.testing.assert_allclose(rho, [1.2250, 0.7364, 0.3639, 0.1937], rtol=2e-3)
+    np.testing.assert_allclose(mu[[0, 2]], [1.789e-5, 1.422e-5], rtol=2e-3)
+    with pytest.raises(ValueError):
+        standard_atmosphere(-10)
+
+
+def test_fixed_altitude():
+    "fixed altitudes are substituted from the table; free ones keep the fits"
+    atm = Atmosphere(h=5 * units("km"))
+    assert atm.is_gp()
+    assert atm.substitutions["\\rho"] == pytest.approx(0.7364, rel=2e-3)
+    with Vectorize(3):
+        atm = Atmosphere(h=[1000, np.nan, 3000])
+    assert not atm.is_gp()
+    n_fits = sum(hasattr(c, "as_gpconstr") for c in atm.flat())
+    assert n_fits == 2  # one mu and one rho fit, for the free altitude
+
+
+def test_cruise_mission():
+    "level-flight missions at given altitudes agree with the fitted atmosphere"
+    h = [3000, 5000, 5000, 4000]
+    costs = []
+    for altitudes in (h, [np.nan] * 4):
+        m = Mission(SimPleAC(), 4, altitudes=altitudes)
+        m.substitutions.update(MISSION_SUBS)
+        m.substitutions[m.state.get_var("h")] = h
+        m.cost = m.get_var("W_{f_m}") * units("1/N")
+        costs.append(m.localsolve(verbosity=0).cost)
+    assert costs[0] == pytest.approx(costs[1], rel=0.01)
+
+
+def test_substituted_altitude():
+    "substituting over tabulated altitudes raises rather than solving stale"
+    m = Mission(SimPleAC(), 4, altitudes=[3000, 5000, 5000, 4000])
+    m.substitutions.update(MISSION_SUBS)
+    m.substitutions[m.state.get_var("h")] = [3000, 5000, 6000, 4000]
+    m.cost = m.get_var("W_{f_m}") * units("1/N")
+    with pytest.raises(ValueError, match="tabulated"):
+        m.localsolve(verbosity=0)
@@ -1,5 +1,6 @@
 """GPkit Models - Library of exponential cone compatible sizing models"""
 
+import logging as _logging
 from importlib.metadata import PackageNotFoundError as _PackageNotFoundError
 from importlib.metadata import version as _pkg_version
 
@@ -12,6 +13,10 @@ from gpkit import Variable
 
 from .tools.modular import PerformanceModel, PhysicalComponent
 
+# library logging is opt-in: nothing is emitted until the application
+# configures a handler (e.g. logging.basicConfig())
+_logging.getLogger(__name__).addHandler(_logging.NullHandler())
+
 g = Variable("g", 9.81, "m/s^2", "earth surface gravitational acceleration")
 
 __all__ = ("PerformanceModel", "PhysicalComponent")
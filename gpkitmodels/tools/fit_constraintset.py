@@ -1,5 +1,9 @@
 "fit constraint set"
 
+import logging
+from typing import NamedTuple
+
+import numpy as np
 from gpkit import (
     ConstraintSet,
     NamedVariables,
@@ -7,8 +11,291 @@ from gpkit import (
     Variable,
     VectorVariable,
 )
+from gpkit.constraints.set import flatiter
+from gpkit.nomials import Monomial, Posynomial
+from gpkit.nomials.map import NomialMap
+from gpkit.util.small_classes import HashVector
+from gpkit.util.small_scripts import appendsolwarning, initsolwarning
 from numpy import abs as nabs
-from numpy import amax, array, hstack, where
+from numpy import amax, where
+
+logger = logging.getLogger(__name__)
+
+
+def fitdata_arrays(fitdata):
+    """Return fit parameters as coefficient and exponent arrays
+
+    Accepts either the flat csv format ("c0", "e01", "a1", "lb0", ...) or
+    the array format with keys "c" (K,), "E" (K, d), "a" (scalar for SMA,
+    (K,) for ISMA, unused for MA), "lb" (d,) and "ub" (d,).
+
+    Returns a dict with keys ftype, c, E, a, lb, ub, rms_err and max_err.
+    """
+    ftype = fitdata["ftype"]
+    if "E" in fitdata:
+        E = np.atleast_2d(np.asarray(fitdata["E"], dtype=float))
+        c = np.asarray(fitdata["c"], dtype=float).reshape(E.shape[0])
+        K, d = E.shape
+        a = fitdata.get("a", 1.0)
+        lb, ub = fitdata.get("lb", [None] * d), fitdata.get("ub", [None] * d)
+    else:
+        K, d = int(fitdata["K"]), int(fitdata["d"])
+        c = np.array([fitdata["c%d" % k] for k in range(K)], dtype=float)
+        E = np.array(
+            [[fitdata["e%d%d" % (k, i)] for i in range(d)] for k in range(K)],
+            dtype=float,
+        ).reshape(K, d)
+        if ftype == "ISMA":
+            a = [fitdata["a%d" % k] for k in range(K)]
+        else:
+            a = fitdata.get("a1", 1.0)
+        lb = [fitdata.get("lb%d" % i) for i in range(d)]
+        ub = [fitdata.get("ub%d" % i) for i in range(d)]
+    a = np.asarray(a, dtype=float)
+    if ftype == "ISMA":
+        a = np.broadcast_to(a, (K,))
+    return {
+        "ftype": ftype,
+        "c": c,
+        "E": E,
+        "a": a,
+        "lb": np.array(lb, dtype=float),
+        "ub": np.array(ub, dtype=float),
+        "rms_err": fitdata["rms_err"],
+        "max_err": fitdata["max_err"],
+    }
+
+
+def flatten_fitdata(arrays):
+    "inverse of fitdata_arrays: return the flat csv format of a fit"
+    E = np.atleast_2d(arrays["E"])
+    K, d = E.shape
+    flat = {"ftype": arrays["ftype"], "K": K, "d": d}
+    for k in range(K):
+        flat["c%d" % k] = float(arrays["c"][k])
+        for i in range(d):
+            flat["e%d%d" % (k, i)] = float(E[k, i])
+    if arrays["ftype"] == "ISMA":
+        for k in range(K):
+            flat["a%d" % k] = float(np.broadcast_to(arrays["a"], (K,))[k])
+    else:
+        flat["a1"] = float(arrays.get("a", 1.0))
+    for i in range(d):
+        flat["lb%d" % i] = float(arrays["lb"][i])
+        flat["ub%d" % i] = float(arrays["ub"][i])
+    flat["rms_err"] = arrays["rms_err"]
+    flat["max_err"] = arrays["max_err"]
+    return flat
+
+
+def _logsumexp(z, axis=0):
+    "log(sum(exp(z))) along axis, shifted for numerical stability"
+    zmax = np.max(z, axis=axis, keepdims=True)
+    out = zmax + np.log(np.sum(np.exp(z - zmax), axis=axis, keepdims=True))
+    return np.squeeze(out, axis=axis)
+
+
+def evaluate_fit(fitdata, u, isma_tol=1e-12, isma_maxiter=100):
+    """Evaluate a fit w = f(u) with NumPy, without building gpkit objects
+
+    Arguments
+    ---------
+    fitdata : dict
+        fit parameters in either format accepted by FitCS
+    u : array_like
+        independent variables with u[i] the i-th variable; the variables
+        are broadcast against each other. For d=1 fits a bare array is fine.
+
+    Returns the fitted w, with the broadcast shape of the u[i]. The margin
+    factor of a FitCS is not applied; see FitCS.evaluate for that.
+    """
+    arrays = fitdata_arrays(fitdata)
+    c, E, a = arrays["c"], np.atleast_2d(arrays["E"]), arrays["a"]
+    K, d = E.shape
+    if d == 1 and (np.ndim(u) == 0 or len(u) != 1):
+        u = [u]
+    x = np.broadcast_arrays(*[np.log(np.asarray(ui, dtype=float)) for ui in u])
+    if len(x) != d:
+        raise ValueError("fit has %d independent variables, got %d" % (d, len(x)))
+    # b[k] = log(c_k * prod_i u_i^E_ki)
+    b = np.log(c).reshape((K,) + (1,) * x[0].ndim) + np.tensordot(E, x, axes=1)
+    return np.exp(log_fit(arrays["ftype"], b, a, isma_tol, isma_maxiter))
+
+
+def log_fit(ftype, b, a, isma_tol=1e-12, isma_maxiter=100):
+    """log(w) of a fit from its log terms b[k] = log(c_k * prod_i u_i^E_ki)
+
+    b has the fit's K terms along its first axis; a is as in fitdata_arrays.
+    """
+    if ftype == "MA":
+        y = b.max(axis=0)
+    elif ftype == "SMA":
+        y = _logsumexp(b) / float(a)
+    elif ftype == "ISMA":
+        # solve sum_k exp(b_k - a_k*y) = 1 for y; the left side is convex
+        # and decreasing in y, so Newton from y0 = max(b/a) converges upward
+        a = np.asarray(a, dtype=float).reshape(b.shape[:1] + (1,) * (b.ndim - 1))
+        y = (b / a).max(axis=0)
+        for _ in range(isma_maxiter):
+            z = b - a * y
+            lse = _logsumexp(z)
+            step = lse / np.sum(a * np.exp(z - lse), axis=0)
+            y = y + step
+            if np.all(np.abs(step) < isma_tol):
+                break
+    else:
+        raise ValueError("Invalid fit type %s" % ftype)
+    return y
+
+
+def _monomial_term(mono):
+    "(exponents, coefficient) of a dimensionless monomial"
+    hmap = getattr(mono, "hmap", None)
+    if hmap is None:  # a plain number
+        return HashVector(), float(mono)
+    if len(hmap) != 1:
+        raise ValueError("fit variables must be monomials, not %s" % mono)
+    if hmap.units:
+        hmap = hmap.to("dimensionless")
+    ((exp, c),) = hmap.items()
+    return exp, c
+
+
+def _object_array(dvar):
+    "dvar as an object array; 0-d for scalar Variables and Monomials"
+    if hasattr(dvar, "shape"):
+        return np.asarray(dvar, dtype=object)
+    arr = np.empty((), dtype=object)
+    arr[()] = dvar
+    return arr
+
+
+def monomial_terms(c, E, dvars):
+    """Exponent maps of the fit monomials c[k] * prod_i dvars[i]**E[k, i]
+
+    The dvars may be scalars or arrays of monomials and are broadcast
+    against each other; no gpkit arithmetic is done. Returns the broadcast
+    shape and a (K, n) object array of single-term NomialMaps, where n is
+    the number of broadcast elements.
+    """
+    shape = np.broadcast_shapes(*[getattr(v, "shape", ()) for v in dvars])
+    elements = [np.broadcast_to(_object_array(v), shape).ravel() for v in dvars]
+
+    n = int(np.prod(shape))
+    logc = np.log(c)
+    cache = {}
+    terms = np.empty((len(c), n), dtype=object)
+    for j in range(n):
+        parts = []
+        for el in elements:
+            key = id(el[j])
+            if key not in cache:
+                cache[key] = _monomial_term(el[j])
+            parts.append(cache[key])
+        vks = list({vk: None for exp, _ in parts for vk in exp})
+        X = np.array([[exp.get(vk, 0) for vk in vks] for exp, _ in parts])
+        EX = E @ X.reshape(len(parts), len(vks))
+        cs = np.exp(logc + E @ np.log([ci for _, ci in parts]))
+        for k, (row, ck) in enumerate(zip(EX, cs)):
+            exp = HashVector({vk: x for vk, x in zip(vks, row) if x})
+            terms[k, j] = NomialMap({exp: ck})
+    return shape, terms
+
+
+def _sum_terms(terms, shape):
+    "sum the K terms of each element into Posynomials"
+    posys = []
+    for col in terms.T:
+        hmap = NomialMap()
+        for term in col:
+            ((exp, ck),) = term.items()
+            hmap[exp] = hmap.get(exp, 0) + ck
+        posys.append(Posynomial(hmap))
+    if not shape:
+        return posys[0]
+    return NomialArray(posys).reshape(shape)
+
+
+class FitBoundViolation(NamedTuple):
+    "one dvar element of a FitCS outside the range of the fitted data"
+
+    fit: "FitCS"
+    variable: object  # the dvar: Variable, Monomial or NomialArray
+    index: object  # element index within the dvar; None for scalars
+    value: float
+    bound: float
+    side: str  # "lower" or "upper"
+    margin: float  # relative distance outside the bound, |value/bound - 1|
+
+    def __str__(self):
+        state = "below" if self.side == "lower" else "above"
+        var = self.variable if self.index is None else self.variable[self.index]
+        return (
+            "Variable %.100s could cause inaccurate result because it is %s"
+            " %s bound. Solution is %.4f but bound is %.4f"
+            % (var, state, self.side, self.value, self.bound)
+        )
+
+
+def _fits(constraints):
+    "yield every FitCS in a (nested) constraint structure"
+    for item in flatiter(constraints, yield_if_hasattr="process_result"):
+        if isinstance(item, FitCS):
+            yield item
+        elif isinstance(item, ConstraintSet):
+            yield from _fits(item)
+
+
+def fit_bounds_report(constraints, result, sens_tol=1e-5):
+    """Check every FitCS in `constraints` against the bounds of its data
+
+    Arguments
+    ---------
+    constraints : Model, ConstraintSet, FitCS, or list of those
+    result : gpkit Solution
+    sens_tol : float or None
+        fits whose margin-factor sensitivity is below this are skipped,
+        since their accuracy does not affect the cost; None checks all
+
+    Returns a list of FitBoundViolation, largest margin first. Element
+    values of all fits are computed in log space and compared in one pass.
+    """
+    if isinstance(constraints, ConstraintSet) or not isinstance(constraints, list):
+        constraints = [constraints]
+    fits = list(_fits(constraints))
+    variables = result.variables
+    sens = result.sens.variables
+    checked, values = [], []
+    for fit in fits:
+        if sens_tol is not None:
+            if fit.mfac not in sens or amax(nabs(sens[fit.mfac])) < sens_tol:
+                continue
+        vks, A, logc, *_ = fit.bound_map()
+        x = np.log([variables[vk] for vk in vks]) if vks else np.zeros(0)
+        values.append(np.exp(logc + A @ x))
+        checked.append(fit)
+    if not checked:
+        return []
+    values = np.concatenate(values)
+    lb = np.concatenate([fit.bound_map()[3] for fit in checked])
+    ub = np.concatenate([fit.bound_map()[4] for fit in checked])
+    owners = [(fit, lbl) for fit in checked for lbl in fit.bound_map()[5]]
+    report = []
+    for side, bound, out in [("lower", lb, values < lb), ("upper", ub, values > ub)]:
+        for r in np.flatnonzero(out):
+            fit, (dvar, index) = owners[r]
+            report.append(
+                FitBoundViolation(
+                    fit,
+                    dvar,
+                    index,
+                    float(values[r]),
+                    float(bound[r]),
+                    side,
+                    float(abs(values[r] / bound[r] - 1)),
+                )
+            )
+    return sorted(report, key=lambda v: -v.margin)
 
 
 class FitCS(ConstraintSet):
@@ -17,7 +304,8 @@ class FitCS(ConstraintSet):
     Arguments
     ---------
     fitdata : dict
-        dictionary of fit parameters
+        dictionary of fit parameters, either in the flat csv format or
+        with coefficient/exponent arrays (see fitdata_arrays)
     ivar : gpkit Variable, Monomial, or NomialArray
         independent variable
     dvars : list of gpkit Variables, Monomials, or NomialArrays
@@ -27,27 +315,23 @@ class FitCS(ConstraintSet):
 
     """
 
-    def __init__(self, fitdata, ivar=None, dvars=None, name="", err_margin=None):  # noqa: PLR0912
-
+    def __init__(  # noqa: PLR0912, PLR0915
+        self, fitdata, ivar=None, dvars=None, name="", err_margin=None
+    ):
         self.fitdata = fitdata
+        arrays = self.arrays = fitdata_arrays(fitdata)
+        self.c, self.E, self.a = arrays["c"], arrays["E"], arrays["a"]
+        K, d = self.E.shape
 
         if ivar is None:
             with NamedVariables("fit"):
-                dvars = VectorVariable(fitdata["d"], "u")
+                dvars = VectorVariable(d, "u")
                 ivar = Variable("w")
 
         self.dvars = dvars
         self.ivar = ivar
-        self.rms_err = fitdata["rms_err"]
-        self.max_err = fitdata["max_err"]
-
-        d = fitdata["d"]
-        monos = []
-        for k in range(fitdata["K"]):
-            mono = fitdata["c%d" % k]
-            for i in range(d):
-                mono = mono * dvars[i] ** fitdata["e%d%d" % (k, i)]
-            monos.append(mono)
+        self.rms_err = arrays["rms_err"]
+        self.max_err = arrays["max_err"]
 
         if err_margin == "Max":
             self.mfac = Variable(
@@ -68,19 +352,31 @@ class FitCS(ConstraintSet):
         else:
             raise ValueError("Invalid name for err_margin: valid inputs Max, RMS")
 
-        if fitdata["ftype"] == "ISMA":
+        dvars = [dvars[i] for i in range(d)]
+        if arrays["ftype"] == "ISMA":
             # constraint of the form 1 >= c1*u1^exp1*u2^exp2*w^(-alpha) + ....
-            alpha = array([fitdata["a%d" % k] for k in range(fitdata["K"])])
-            lhs, rhs = 1, NomialArray(monos / (ivar / self.mfac) ** alpha).sum(0)
-        elif fitdata["ftype"] == "SMA":
+            # w/mfac enters as one more fit variable with exponents -alpha
+            E = np.hstack([self.E, -self.a.reshape(K, 1)])
+            shape, terms = monomial_terms(self.c, E, dvars + [ivar / self.mfac])
+            lhs, rhs = 1, _sum_terms(terms, shape)
+        elif arrays["ftype"] == "SMA":
             # constraint of the form w^alpha >= c1*u1^exp1 + c2*u2^exp2 +....
-            alpha = fitdata["a1"]
-            lhs, rhs = (ivar / self.mfac) ** alpha, NomialArray(monos).sum(0)
-        elif fitdata["ftype"] == "MA":
+            shape, terms = monomial_terms(self.c, self.E, dvars)
+            lhs, rhs = (ivar / self.mfac) ** float(self.a), _sum_terms(terms, shape)
+        elif arrays["ftype"] == "MA":
             # constraint of the form w >= c1*u1^exp1, w >= c2*u2^exp2, ....
+            shape, terms = monomial_terms(self.c, self.E, dvars)
+            monos = [
+                NomialArray([Monomial(t) for t in row]).reshape(shape)
+                if shape
+                else Monomial(row[0])
+                for row in terms
+            ]
             lhs, rhs = (ivar / self.mfac), NomialArray(monos).T
+        else:
+            raise ValueError("Invalid fit type %s" % arrays["ftype"])
 
-        if fitdata["K"] == 1:
+        if K == 1:
             # when possible, return an equality constraint
             if hasattr(rhs, "shape"):
                 if rhs.ndim > 1:
@@ -97,12 +393,21 @@ class FitCS(ConstraintSet):
         else:
             self.constraint = lhs >= rhs
 
+        self._bound_map = None
         self.bounds = {}
         for i, dvar in enumerate(self.dvars):
-            self.bounds[dvar] = [fitdata["lb%d" % i], fitdata["ub%d" % i]]
+            self.bounds[dvar] = [arrays["lb"][i], arrays["ub"][i]]
 
         ConstraintSet.__init__(self, [self.constraint])
 
+    def evaluate(self, u):
+        """Fitted ivar at independent variable values u, margin included
+
+        Equals the value of ivar at which the constraint is tight, i.e.
+        mfac * evaluate_fit(fitdata, u); see evaluate_fit for the layout of u.
+        """
+        return self.mfac.key.value * evaluate_fit(self.arrays, u)
+
     def get_fitdata(self):
         "return fit data"
         return self.fitdata
@@ -111,43 +416,64 @@ class FitCS(ConstraintSet):
         "return a pandas DataFrame of fit parameters"
         import pandas as pd  # noqa: PLC0415
 
-        df = pd.DataFrame(list(self.fitdata.values())).transpose()
-        df.columns = list(self.fitdata.keys())
+        flat = flatten_fitdata(self.arrays)
+        df = pd.DataFrame(list(flat.values())).transpose()
+        df.columns = list(flat.keys())
         return df
 
+    def bound_map(self):
+        """Exponent matrix, log-coefficients and bounds of every dvar element
+
+        Returns (varkeys, A, logc, lb, ub, labels) such that the dvar element
+        values are exp(logc + A @ log(values of varkeys)); labels holds the
+        (dvar, index) each row came from. Computed once and cached.
+        """
+        if self._bound_map is None:
+            terms, lb, ub, labels = [], [], [], []
+            for i, dvar in enumerate(self.dvars):
+                arr = _object_array(dvar)
+                for nd_idx in np.ndindex(arr.shape):
+                    terms.append(_monomial_term(arr[nd_idx]))
+                    lb.append(self.arrays["lb"][i])
+                    ub.append(self.arrays["ub"][i])
+                    # None for scalars, int for vectors, tuple otherwise
+                    idx = nd_idx if len(nd_idx) > 1 else (nd_idx or (None,))[0]
+                    labels.append((dvar, idx))
+            vks = list({vk: None for exp, _ in terms for vk in exp})
+            col = {vk: j for j, vk in enumerate(vks)}
+            A = np.zeros((len(terms), len(vks)))
+            for r, (exp, _) in enumerate(terms):
+                for vk, x in exp.items():
+                    A[r, col[vk]] = x
+            logc = np.log([c for _, c in terms])
+            self._bound_map = (vks, A, logc, np.array(lb), np.array(ub), labels)
+        return self._bound_map
+
     def process_result(self, result):
         """
         make sure fit result is within bounds of fitted data
+
+        Violations are logged as warnings on the gpkitmodels logger and
+        recorded in result.meta["warnings"]["Fit Out of Bounds"] as
+        (message, FitBoundViolation) pairs. The first FitCS to process a
+        solution checks every fit of the solved model in one pass and sets
+        result.meta["fit bounds checked"]; the others then skip the check.
         """
         super(FitCS, self).process_result(result)
 
-        if self.mfac not in result.sens.variables:
-            return
-        if amax(nabs(result.sens.variables[self.mfac])) < 1e-5:
+        if result.meta.get("fit bounds checked"):
             return
-
-        for dvar in self.dvars:
-            if isinstance(dvar, NomialArray):
-                num = [result[x] for x in dvar]
-            else:
-                num = result[dvar]
-            direct = None
-            if any(x < self.bounds[dvar][0] for x in hstack([num])):
-                direct, state = "lower", "below"
-                bnd = self.bounds[dvar][0]
-            if any(x > self.bounds[dvar][1] for x in hstack([num])):
-                direct, state = "upper", "above"
-                bnd = self.bounds[dvar][1]
-
-            if direct:
-                msg = (
-                    "Variable %.100s could cause inaccurate result"
-                    " because it is %s"
-                    % (dvar, state)
-                    + " %s bound. Solution is %.4f but"
-                    " bound is %.4f" % (direct, amax([num]), bnd)
-                )
-                print("Warning: " + msg)
+        model = result.meta.get("model")
+        model = model() if model is not None else None
+        if model is not None:
+            result.meta["fit bounds checked"] = True
+        report = fit_bounds_report(self if model is None else model, result)
+        if report:
+            initsolwarning(result, "Fit Out of Bounds")
+        for violation in report:
+            msg = str(violation)
+            appendsolwarning(msg, violation, result, "Fit Out of Bounds")
+            logger.warning(msg)
 
 
 class XfoilFit(FitCS):
@@ -169,7 +495,6 @@ class XfoilFit(FitCS):
         err_margin=None,
         airfoil=False,
     ):
-
         super(XfoilFit, self).__init__(
             fitdata, ivar=ivar, dvars=dvars, name=name, err_margin=err_margin
         )
@@ -193,26 +518,31 @@ class XfoilFit(FitCS):
 
         cl, re = 0.0, 0.0
         for dvar in self.dvars:
-            if "Re" in str(dvar):
-                re = result[dvar]
-            if "C_L" in str(dvar):
-                cl = result[dvar]
-        cd = result[self.ivar]
-        if not hasattr(cl, "__len__") and hasattr(re, "__len__"):
-            cl = [cl] * len(re)
+            name = dvar.key.name
+            if name.startswith("Re"):
+                re = getattr(result[dvar], "magnitude", result[dvar])
+            if name in ("CL", "C_L"):
+                cl = getattr(result[dvar], "magnitude", result[dvar])
+        cd = getattr(result[self.ivar], "magnitude", result[self.ivar])
+        cl, re, cd = (np.atleast_1d(x) for x in np.broadcast_arrays(cl, re, cd))
         err, cdx = xfoil_comparison(self.airfoil, cl, re, cd)
         ind = where(err > 0.05)[0]
+        if len(ind):
+            initsolwarning(result, "Xfoil Drag Error")
         for i in ind:
             msg = (
                 "Drag error for %s is %.2f. Re=%.1f; CL=%.4f;"
                 " Xfoil cd=%.6f, GP sol cd=%.6f"
                 % (
-                    ", ".join(self.ivar.descr["models"]),
+                    self.ivar.key,
                     err[i],
                     re[i],
                     cl[i],
-                    cd[i],
                     cdx[i],
+                    cd[i],
                 )
             )
-            print("Warning: %s" % msg)
+            appendsolwarning(
+                msg, (cl[i], re[i], cd[i], cdx[i]), result, "Xfoil Drag Error"
+            )
+            logger.warning(msg)
@@ -0,0 +1,83 @@
+"process-wide registry of FitCS fit parameters"
+
+import csv
+import os
+from threading import Lock
+from types import MappingProxyType
+
+_REGISTRY = {}
+_LOCK = Lock()
+
+
+def _parse_value(text):
+    "convert a csv field to int, float or str the way pandas.read_csv would"
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+def read_fitdata(path):
+    """Parse the first record of a fit csv into a dict
+
+    This bypasses the registry; use `load_fitdata` from model setup code.
+    """
+    with open(path, newline="") as f:
+        record = next(csv.DictReader(f))
+    return {k: _parse_value(v) for k, v in record.items()}
+
+
+def _key(name):
+    "registry key: absolute path for files, the bare name otherwise"
+    if os.sep in name or name.endswith(".csv"):
+        return os.path.abspath(name)
+    return name
+
+
+def load_fitdata(name):
+    """Return the immutable fit parameters for a fit file or registered name
+
+    Arguments
+    ---------
+    name : str
+        path to a fit csv, or a name previously passed to `register_fitdata`
+
+    Each file is parsed once per process; later calls return the cached
+    mapping. The mapping is read-only; copy it with dict() to modify it.
+    """
+    key = _key(name)
+    fitdata = _REGISTRY.get(key)
+    if fitdata is not None:
+        return fitdata
+    with _LOCK:
+        if key not in _REGISTRY:
+            if not os.path.isfile(key):
+                raise KeyError(f"no fit file or registered fit named {name!r}")
+            _REGISTRY[key] = MappingProxyType(read_fitdata(key))
+        return _REGISTRY[key]
+
+
+def register_fitdata(name, fitdata):
+    """Register in-memory fit parameters under `name`
+
+    Registering an existing name (including a packaged fit path) replaces it,
+    so models built afterwards use the new fit. Returns the stored mapping.
+    """
+    with _LOCK:
+        _REGISTRY[_key(name)] = MappingProxyType(dict(fitdata))
+        return _REGISTRY[_key(name)]
+
+
+def clear_fitdata_cache():
+    "forget all parsed and registered fits"
+    with _LOCK:
+        _REGISTRY.clear()
+
+
+def fitdata_path(module_file, filename):
+    "absolute path of a fit csv packaged next to `module_file`"
+    return os.path.join(os.path.dirname(os.path.abspath(module_file)), filename)
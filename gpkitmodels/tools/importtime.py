@@ -0,0 +1,83 @@
+"""Import-time budgets for the runtime modules of gpkitmodels
+
+Sweep workers and other short-lived processes import models cold, so
+model modules should cost little on top of gpkit itself and should not
+pull in plotting or data-analysis packages. `measure` imports gpkit and
+then each module in a fresh interpreter, recording the time each import
+adds and which heavy packages are loaded by then:
+
+    from gpkitmodels.tools.importtime import BUDGETS, measure
+
+    result = measure(repeat=5)
+    for name, seconds in result["modules"].items():
+        print(name, seconds, BUDGETS[name])
+
+Times are incremental: a dependency shared by several modules is counted
+against the first of them in `BUDGETS` order. They depend on the machine,
+so test_importtime.py only checks them when GPKITMODELS_TIME_BUDGETS is
+set; the heavy packages are always checked.
+"""
+
+import json
+import subprocess
+import sys
+
+# seconds each module may add on top of `import gpkit`
+BUDGETS = {
+    "gpkitmodels": 0.05,
+    "gpkitmodels.GP.aircraft.wing.wing": 0.05,
+    "gpkitmodels.GP.aircraft.tail.empennage": 0.05,
+    "gpkitmodels.GP.aircraft.fuselage.elliptical_fuselage": 0.05,
+    "gpkitmodels.GP.aircraft.engine.gas_engine": 0.05,
+    "gpkitmodels.GP.aircraft.motor.motor": 0.05,
+    "gpkitmodels.GP.aircraft.prop.propeller": 0.05,
+    "gpkitmodels.GP.aircraft.mission.breguet_endurance": 0.05,
+    "gpkitmodels.SP.SimPleAC.SimPleAC_multimission": 0.05,
+    "gpkitmodels.SP.aircraft.wing.wing": 0.05,
+    "gpkitmodels.SP.aircraft.tail.tail_boom_flex": 0.05,
+    "gpkitmodels.SP.aircraft.prop.propeller": 0.05,
+    "gpkitmodels.tools.sweep": 0.05,
+    "gpkitmodels.tools.polarfit": 0.05,
+}
+
+# packages that runtime modules should only import when actually used
+HEAVY = ("pandas", "matplotlib", "gpfit")
+
+_PROBE = """
+import json, sys, time
+modules = json.loads(sys.argv[1])
+tic = time.perf_counter()
+import gpkit
+out = {"gpkit": time.perf_counter() - tic, "modules": {}, "heavy": {}}
+for name in modules:
+    tic = time.perf_counter()
+    __import__(name)
+    out["modules"][name] = time.perf_counter() - tic
+    out["heavy"][name] = [h for h in json.loads(sys.argv[2]) if h in sys.modules]
+print(json.dumps(out))
+"""
+
+
+def measure(modules=None, repeat=1):
+    """Import times [s] of gpkit and of each module, in fresh interpreters
+
+    Returns {"gpkit": s, "modules": {name: s}, "heavy": {name: [packages]}}
+    with the fastest time of `repeat` runs for each entry.
+    """
+    modules = list(BUDGETS if modules is None else modules)
+    best = None
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, "-c", _PROBE, json.dumps(modules), json.dumps(HEAVY)],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        out = json.loads(proc.stdout.splitlines()[-1])
+        if best is None:
+            best = out
+            continue
+        best["gpkit"] = min(best["gpkit"], out["gpkit"])
+        for name, seconds in out["modules"].items():
+            best["modules"][name] = min(best["modules"][name], seconds)
+    return best
@@ -0,0 +1,72 @@
+"""Setup-time, solve-time and size budgets for catalog models
+
+Each catalog.toml entry records how long its model's `default()` took to
+set up and to solve, and how many variables it has. `measure` takes those
+measurements again and `over_budget` lists the ones that grew beyond the
+catalog's tolerances:
+
+    from gpkit.tests.test_catalog import load_catalog
+
+    for entry in load_catalog("catalog.toml"):
+        print(entry["id"], over_budget(entry, measure(entry)))
+
+Times are the fastest of `repeat` runs, so the first build's one-off costs
+(imports, fit data) aren't counted, and garbage left by earlier work is
+collected before each run. They depend on the machine and solver they
+were recorded with, so test_catalog.py checks them against catalog.toml's
+looser [default_time_tolerances] unless GPKITMODELS_TIME_BUDGETS is set.
+`measure(entry, timed=False)` just builds the model once to count variables.
+"""
+
+import gc
+import importlib
+import time
+
+# allowed growth over the recorded budgets, unless catalog.toml sets its own
+TOLERANCES = {
+    "time": 1.0,  # fraction of the recorded time
+    "time_floor": 0.05,  # seconds, for times too short to measure reliably
+    "variables": 0.05,  # fraction of the recorded variable count
+}
+
+
+def measure(entry, repeat=3, timed=True):
+    "{'setup_time', 'solve_time', 'variables'} of a catalog entry's default()"
+    cls = getattr(importlib.import_module(entry["module"]), entry["class"])
+    if not timed:
+        return {"variables": len(cls.default().vks)}
+    setup_times, solve_times = [], []
+    for _ in range(repeat):
+        gc.collect()
+        tic = time.perf_counter()
+        m = cls.default()
+        setup_times.append(time.perf_counter() - tic)
+        tic = time.perf_counter()
+        if m.is_gp():
+            m.solve(verbosity=0)
+        else:
+            m.localsolve(verbosity=0)
+        solve_times.append(time.perf_counter() - tic)
+    return {
+        "setup_time": min(setup_times),
+        "solve_time": min(solve_times),
+        "variables": len(m.vks),
+    }
+
+
+def over_budget(entry, measured, tolerances=None):
+    "descriptions of the measurements beyond the entry's budgets"
+    tol = dict(TOLERANCES, **(tolerances or {}))
+    limits = {
+        name: entry[name] * (1 + tol["time"]) + tol["time_floor"]
+        for name in ("setup_time", "solve_time")
+        if name in entry and name in measured
+    }
+    if "variables" in entry and "variables" in measured:
+        limits["variables"] = entry["variables"] * (1 + tol["variables"])
+    return [
+        "%s %s %.4g over its limit %.4g (budget %.4g)"
+        % (entry.get("id", entry["class"]), name, measured[name], limit, entry[name])
+        for name, limit in limits.items()
+        if measured[name] > limit
+    ]
@@ -0,0 +1,225 @@
+"""On-disk cache of built models, stored as gpkit IR
+
+Building a large model (e.g. a many-station Wing or a multi-segment
+Mission) runs every submodel's `setup`. A ModelCache stores the IR of each
+model it builds and loads that the next time the same model is asked for:
+
+    cache = ModelCache()
+    wing = cache.get(Wing, 20)
+
+    def mission(Nsegments):
+        return Mission(SimPleAC(), Nsegments)
+    m = cache.get(mission, 8)
+
+Entries are keyed by the factory's module and name, its arguments (which
+must be JSON serializable), gpkit's version, and fingerprints of the
+gpkitmodels source and fit data and of the factory's own source file, so
+editing a model invalidates its entries.
+
+Cached models come back through the IR, so they are flat: a Model with the
+same variables, constraints, cost and substitutions, but without submodels
+or variable handles: look variables up with `model.varkeys.by_name(name)`
+or by VarKey, or read them from solutions by name. Linked
+(callable) substitutions, like the Wing's chord distribution, can't be
+stored; with `freeze_linked=True` their values at build time are stored
+instead, and substituting e.g. a new taper ratio into a loaded Wing then
+leaves its chords unchanged.
+
+Loading doesn't renumber models: if a loaded model's lineage numbers have
+already been used in this process, it is built again instead.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+
+import gpkit
+from gpkit import Model, VarKey
+from gpkit.nomials.math import constraint_from_ir, nomial_from_ir
+from gpkit.nomials.substitution import parse_linked, parse_subs
+from gpkit.programs.prog_factories import evaluate_linked
+from gpkit.util.globals import NamedVariables
+
+GPKITMODELS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE_SUFFIXES = (".py", ".csv", ".dat")
+
+
+def model_cache_dir(cache_dir=None):
+    "model cache directory: the argument, then $GPKITMODELS_MODEL_CACHE, then ~/.cache"
+    if cache_dir:
+        return cache_dir
+    return os.environ.get("GPKITMODELS_MODEL_CACHE") or os.path.join(
+        os.path.expanduser("~"), ".cache", "gpkitmodels", "models"
+    )
+
+
+def source_fingerprint(path):
+    "sha256 of a file, or of the names and contents of a directory's source files"
+    digest = hashlib.sha256()
+    if os.path.isfile(path):
+        files = [path]
+    else:
+        files = sorted(
+            os.path.join(root, name)
+            for root, dirs, names in os.walk(path)
+            if "__pycache__" not in root
+            for name in names
+            if name.endswith(SOURCE_SUFFIXES)
+        )
+    for name in files:
+        digest.update(os.path.relpath(name, path).encode())
+        with open(name, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def model_ir(model, freeze_linked=False):
+    "model.to_ir(), with the current values of linked substitutions if frozen"
+    ir = model.to_ir()
+    linked = parse_linked(model.varkeys, model.substitutions)
+    if linked and not freeze_linked:
+        raise ValueError(
+            "can't store linked substitution of %s without freeze_linked"
+            % next(iter(linked))
+        )
+    if linked:
+        constants = parse_subs(model.varkeys, model.substitutions)
+        evaluate_linked(constants, linked)
+        for vk in linked:
+            ir["substitutions"][vk.ref] = float(constants[vk])
+    return ir
+
+
+def _varkeys(variables):
+    """{ref: VarKey} for an IR's variables
+
+    Vector keys are built before their elements and passed to them, which
+    VarKey.from_ir doesn't do; rebuilding each element's vector key takes
+    most of Model.from_ir's time.
+    """
+    keys = {}
+
+    def key(ref):
+        if ref not in keys:
+            ir = variables[ref]
+            kwargs = {k: ir[k] for k in ("units", "label") if k in ir}
+            for k in ("idx", "shape"):
+                if k in ir:
+                    kwargs[k] = tuple(ir[k])
+            if "lineage" in ir:
+                kwargs["lineage"] = tuple(map(tuple, ir["lineage"]))
+            if "veckey_ref" in ir:
+                kwargs["veckey"] = key(ir["veckey_ref"])
+            keys[ref] = VarKey(ir["name"], **kwargs)
+        return keys[ref]
+
+    for ref in variables:
+        key(ref)
+    return keys
+
+
+def model_from_ir(ir):
+    "Model.from_ir(ir), building variables faster"
+    if "margin_objective" in ir or None in ir.get("substitutions", {}).values():
+        return Model.from_ir(ir)
+    keys = _varkeys(ir["variables"])
+    substitutions = {
+        keys[ref]: value
+        for ref, value in ir.get("substitutions", {}).items()
+        if ref in keys
+    }
+    return Model(
+        nomial_from_ir(ir["cost"], keys),
+        [constraint_from_ir(c, keys) for c in ir["constraints"]],
+        substitutions=substitutions,
+    )
+
+
+def _modelnums(ir):
+    "{(parent lineage, model name): model number} used by an IR's variables"
+    nums = {}
+    for var in ir["variables"].values():
+        lineage = tuple(map(tuple, var.get("lineage", ())))
+        for i, (name, num) in enumerate(lineage):
+            nums[(lineage[:i], name)] = max(num, nums.get((lineage[:i], name), 0))
+    return nums
+
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write(path, entry):
+    "write atomically so concurrent processes never see partial files"
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(entry, f)
+    os.replace(tmp, path)
+
+
+class ModelCache:
+    """Built models stored on disk as IR, keyed by how they were built
+
+    Arguments
+    ---------
+    directory : str
+        where entries are stored (see model_cache_dir)
+    freeze_linked : bool
+        store linked substitutions' values at build time instead of raising
+    sources : iterable of str
+        further files or directories whose changes invalidate entries
+    """
+
+    def __init__(self, directory=None, freeze_linked=False, sources=()):
+        self.directory = model_cache_dir(directory)
+        os.makedirs(self.directory, exist_ok=True)
+        self.freeze_linked = freeze_linked
+        self.sources = [GPKITMODELS_DIR, *sources]
+        self.hits = 0
+        self.misses = 0
+        self._fingerprints = {}
+
+    def _fingerprint(self, path):
+        if path not in self._fingerprints:
+            self._fingerprints[path] = source_fingerprint(path)
+        return self._fingerprints[path]
+
+    def key(self, factory, args=(), kwargs=None):
+        "the entry name for factory(*args, **kwargs)"
+        name = "%s.%s" % (factory.__module__, factory.__qualname__)
+        try:
+            call = json.dumps([list(args), kwargs or {}], sort_keys=True)
+        except TypeError as err:
+            raise TypeError("can't cache %s: %s" % (name, err)) from err
+        sources = list(self.sources)
+        module = getattr(sys.modules.get(factory.__module__), "__file__", None)
+        if module and not os.path.abspath(module).startswith(GPKITMODELS_DIR):
+            sources.append(os.path.abspath(module))
+        parts = [name, call, gpkit.__version__, self.freeze_linked]
+        parts += [self._fingerprint(path) for path in sources]
+        return hashlib.sha256(json.dumps(parts).encode()).hexdigest()
+
+    def get(self, factory, *args, **kwargs):
+        "the model factory(*args, **kwargs) returns, loaded from the cache if stored"
+        path = os.path.join(self.directory, self.key(factory, args, kwargs) + ".json")
+        entry = _read(path)
+        if entry is not None:
+            nums = _modelnums(entry["ir"])
+            modelnums = NamedVariables.modelnums
+            if all(num >= modelnums.get(k, 0) for k, num in nums.items()):
+                for k, num in nums.items():
+                    modelnums[k] = num + 1
+                self.hits += 1
+                return model_from_ir(entry["ir"])
+        self.misses += 1
+        ir = model_ir(factory(*args, **kwargs), self.freeze_linked)
+        if entry is None:
+            entry = {"factory": factory.__qualname__, "args": [args, kwargs], "ir": ir}
+            _write(path, entry)
+        return model_from_ir(ir)
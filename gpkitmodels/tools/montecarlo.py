@@ -0,0 +1,250 @@
+"""Monte Carlo propagation of the `pr` uncertainties through a fixed design
+
+Models tag uncertain constants with percent uncertainties in a `pr` dict,
+e.g. SimPleAC's `self.pr = {N_ult: 15.0, W_W_coeff1: 30.0, ...}`. A
+MonteCarlo solves the model once for its nominal design, fixes the
+`design` variables at that solution, and evaluates the fixed design at
+random samples of every `pr`-tagged constant:
+
+    mc = MonteCarlo(simpleac, design=["A", "S"], outputs=["W_f"])
+    for stats in mc.run(samples=10000):
+        print(stats["samples"], stats["cost"], stats["outputs"]["W_f"])
+
+Samples are drawn in bulk up front, so a seed gives the same samples for
+any number of workers. They are solved in chunks on a process pool, each
+worker building the model once with `factory()` and re-solving it through
+a Resolver, which solves it as a GP if fixing the design left no
+signomials. After each chunk, `run` yields the percentiles so far, and
+it stops early once they change by less than `rtol` for two chunks in a
+row. Samples the fixed design can't meet count as failures; since the
+nominal optimum sits on its active constraints, expect many of them.
+
+A constant's uncertainty pr bounds its log: log(c/c0) lies within
++-log(1 + pr/100) for "uniform" and "triangular" samples, and "normal"
+samples take that as their 3-sigma bound.
+"""
+
+import math
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from gpkit.exceptions import Infeasible
+from gpkit.nomials.substitution import parse_linked, parse_subs
+
+from .resolve import Resolver
+from .warmstart import canonical_names
+
+DISTRIBUTIONS = ("normal", "uniform", "triangular")
+
+_WORKER = {}  # resolver and sample layout of the current worker process
+
+
+def uncertainties(model):
+    "{VarKey: pr} of the constants tagged in the `pr` of model's submodels"
+    constants = parse_subs(model.varkeys, model.substitutions)
+    linked = parse_linked(model.varkeys, model.substitutions)
+    out = {}
+    for submodel in (model, *model.walk()):
+        for var, pr in getattr(submodel, "pr", {}).items():
+            for key in model.varkeys.keys(var):
+                if key in constants and key not in linked:
+                    out[key] = pr
+    return out
+
+
+def sample(prs, n, distribution="normal", seed=None):
+    "(n, len(prs)) array of random factors on constants with uncertainties prs"
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(
+            "unknown distribution %r; choose from %s" % (distribution, DISTRIBUTIONS)
+        )
+    rng = np.random.default_rng(seed)
+    shape = (n, len(prs))
+    if distribution == "normal":
+        z = rng.normal(0, 1 / 3, shape)
+    elif distribution == "uniform":
+        z = rng.uniform(-1, 1, shape)
+    else:
+        z = rng.triangular(-1, 0, 1, shape)
+    return np.exp(z * np.log1p(np.asarray(prs, dtype=float) / 100))
+
+
+def _in_units(key, value):
+    "value in key's units"
+    if hasattr(value, "to"):
+        return value.to(key.units or "dimensionless").magnitude
+    return value
+
+
+def _init_worker(factory, design, params, outputs, solve_kwargs):
+    model = factory()
+    keys = {name: vk for vk, name in canonical_names(model.varkeys).items()}
+    for name, value in design.items():
+        model.substitutions[keys[name]] = value
+    resolver = Resolver(model, [keys[name] for name in params], **solve_kwargs)
+    _WORKER["resolver"] = resolver
+    _WORKER["params"] = [keys[name] for name in params]
+    _WORKER["nominal"] = np.array([resolver.constants[keys[n]] for n in params])
+    _WORKER["outputs"] = [keys[name] for name in outputs]
+
+
+def _run_chunk(start, factors):
+    "costs and outputs of the worker's design at nominal * factors"
+    resolver, params = _WORKER["resolver"], _WORKER["params"]
+    costs = np.full(len(factors), np.nan)
+    outputs = np.full((len(factors), len(_WORKER["outputs"])), np.nan)
+    for i, values in enumerate(_WORKER["nominal"] * factors):
+        try:
+            sol = resolver.solve(dict(zip(params, values)))
+        except Infeasible:  # including localsolves that don't converge
+            continue  # the design fails at this sample
+        costs[i] = sol.cost
+        outputs[i] = [sol.primal[key] for key in _WORKER["outputs"]]
+    return start, costs, outputs
+
+
+class MonteCarlo:
+    """Samples of a fixed design's cost and outputs under its `pr` uncertainties
+
+    Arguments
+    ---------
+    factory : callable
+        factory() returns the Model with its cost set; it must be picklable
+        (e.g. a module-level function) to run on a process pool
+    design : sequence or dict of str or Variable
+        free variables fixed at their nominal optimum, or for a dict at its
+        values (e.g. a robust design's; scalar variables only)
+    outputs : sequence of str or Variable
+        scalar free variables whose distributions are reported with the cost
+    distribution : str
+        one of DISTRIBUTIONS
+    seed : int
+        seed of the samples
+    solve_kwargs : dict
+        passed to the solver (or localsolve for signomial programs)
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        factory,
+        design=(),
+        outputs=(),
+        distribution="normal",
+        seed=0,
+        solve_kwargs=None,
+    ):
+        self.factory = factory
+        self.distribution, self.seed = distribution, seed
+        self.solve_kwargs = dict(solve_kwargs or {})
+        model = factory()
+        solve = model.solve if model.is_gp() else model.localsolve
+        self.nominal = solve(verbosity=0, **self.solve_kwargs)
+        names = canonical_names(model.varkeys)
+        values = design if hasattr(design, "items") else {}
+        self.design = {
+            names[key]: _in_units(key, values[var])
+            if var in values
+            else self.nominal.primal[key]
+            for var in design
+            for key in model.varkeys.keys(var)
+        }
+        self.prs = {names[key]: pr for key, pr in uncertainties(model).items()}
+        self.outputs = {}
+        for output in outputs:
+            keys = model.varkeys.keys(output)
+            if len(keys) != 1:
+                raise ValueError("output %s must be one scalar variable" % output)
+            self.outputs[output] = names[keys.pop()]
+        self.costs = self.values = None
+
+    def stats(self, percentiles=(5, 50, 95)):
+        """{"samples", "failed", "cost", "outputs"} of the samples run so far
+
+        "cost" and each of "outputs" map percentiles to their values over
+        the samples that solved.
+        """
+        if self.costs is None:
+            raise RuntimeError("no samples have been run; call run() first")
+        solved = ~np.isnan(self.costs)
+
+        def quantiles(values):
+            if not values.size:
+                return dict.fromkeys(percentiles, math.nan)
+            return dict(zip(percentiles, np.percentile(values, percentiles).tolist()))
+
+        return {
+            "samples": int(self._done.sum()),
+            "failed": int(self._done.sum() - solved.sum()),
+            "cost": quantiles(self.costs[solved]),
+            "outputs": {
+                output: quantiles(self.values[solved, j])
+                for j, output in enumerate(self.outputs)
+            },
+        }
+
+    def run(  # noqa: PLR0913
+        self,
+        samples=10000,
+        chunk=100,
+        max_workers=None,
+        percentiles=(5, 50, 95),
+        rtol=1e-3,
+        min_samples=1000,
+    ):
+        """Yields stats (see `stats`) as chunks of samples finish
+
+        Stops after `samples`, or once at least `min_samples` are done and
+        the percentiles changed by less than `rtol` (relative) for two
+        chunks in a row; the last stats yielded have "converged" True in
+        that case. max_workers=1 solves in this process.
+        """
+        factors = sample(list(self.prs.values()), samples, self.distribution, self.seed)
+        self.costs = np.full(samples, np.nan)
+        self.values = np.full((samples, len(self.outputs)), np.nan)
+        self._done = np.zeros(samples, dtype=bool)
+        initargs = (
+            self.factory,
+            self.design,
+            list(self.prs),
+            list(self.outputs.values()),
+            self.solve_kwargs,
+        )
+        chunks = [(i, factors[i : i + chunk]) for i in range(0, samples, chunk)]
+        last, calm = None, 0
+
+        def finish(start, costs, values):
+            nonlocal last, calm
+            end = start + len(costs)
+            self.costs[start:end], self.values[start:end] = costs, values
+            self._done[start:end] = True
+            stats = self.stats(percentiles)
+            flat = [*stats["cost"].values()]
+            for qs in stats["outputs"].values():
+                flat.extend(qs.values())
+            flat = np.array(flat)
+            if last is not None and np.all(np.abs(flat / last - 1) < rtol):
+                calm += 1
+            else:
+                calm = 0
+            last = flat
+            stats["converged"] = calm >= 2 and stats["samples"] >= min_samples
+            return stats
+
+        if max_workers == 1:
+            _init_worker(*initargs)
+            for start, factors_i in chunks:
+                stats = finish(*_run_chunk(start, factors_i))
+                yield stats
+                if stats["converged"]:
+                    return
+            return
+        with ProcessPoolExecutor(
+            max_workers, initializer=_init_worker, initargs=initargs
+        ) as pool:
+            futures = [pool.submit(_run_chunk, *c) for c in chunks]
+            for future in as_completed(futures):
+                stats = finish(*future.result())
+                yield stats
+                if stats["converged"]:
+                    pool.shutdown(cancel_futures=True)
+                    return
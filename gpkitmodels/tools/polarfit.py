@@ -0,0 +1,329 @@
+"""XFOIL polars to FitCS fit csvs
+
+Regenerate the packaged fits (all of them, or those named) with
+
+    python -m gpkitmodels.tools.polarfit [jho1] [dae51] [tail]
+
+The polar files are not packaged; generate them first with the sweep
+script next to each set (e.g. GP/aircraft/wing/jho1polars/jho1polarsweep.sh).
+Fits with K > 1 terms are fit here, with scipy, from a max-affine fit of
+the data (Magnani & Boyd's partition heuristic) refined by least squares.
+
+The fuselage drag fit (GP/aircraft/fuselage/fuselage_profile_drag) is not
+registered: it fits a table of CFD drags rather than XFOIL polars, and
+FuselageAero writes its terms into a constraint instead of reading a fit csv.
+"""
+
+import argparse
+import csv
+import glob
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, NamedTuple
+
+import numpy as np
+
+from .fit_constraintset import evaluate_fit, fitdata_arrays, flatten_fitdata, log_fit
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RE_HEADER = re.compile(r"Re =\s*([-+\d.]+)\s*e\s*([-+\d]+)")
+
+
+def read_polar(filename):
+    """Parse an XFOIL polar file into a dict of float arrays
+
+    Keys are the polar's column titles ("alpha", "CL", "CD", ...) plus "Re",
+    read from the polar header. The file is read line by line.
+    """
+    titles, rows, prev, Re = None, [], "", np.nan
+    with open(filename) as f:
+        for line in f:
+            if titles is not None:
+                if line.strip():
+                    rows.append(line.split())
+                continue
+            match = RE_HEADER.search(line)
+            if match:
+                Re = float(match.group(1)) * 10 ** int(match.group(2))
+            if line.lstrip().startswith("---"):
+                titles = prev.split()
+            prev = line
+    if titles is None:
+        raise ValueError("%s is not an XFOIL polar file" % filename)
+    data = np.array(rows, dtype=float).reshape(len(rows), len(titles))
+    polar = {t: data[:, i] for i, t in enumerate(titles)}
+    polar["Re"] = np.full(len(rows), Re)
+    return polar
+
+
+def text_to_df(filename):
+    "parse an XFOIL polar into a DataFrame"
+    import pandas as pd  # noqa: PLC0415
+
+    return pd.DataFrame(read_polar(filename))
+
+
+def load_polar(filename, cache=True):
+    """read_polar, cached as filename + ".npz" until the polar file changes"""
+    npz = filename + ".npz"
+    if cache and os.path.exists(npz):
+        if os.path.getmtime(npz) >= os.path.getmtime(filename):
+            with np.load(npz) as f:
+                return dict(f)
+    polar = read_polar(filename)
+    if cache:
+        np.savez(npz, **polar)
+    return polar
+
+
+def load_polars(filenames, cache=True, where=None, columns=None):
+    """Concatenate many polars into one dict of arrays
+
+    Arguments
+    ---------
+    filenames : list of str, or a glob pattern
+    where : function
+        where(filename, polar) returns a boolean mask of rows to keep
+    columns : function
+        columns(filename, polar) returns {title: array} to add to a polar,
+        e.g. a parameter read from its filename; applied before where
+    """
+    if isinstance(filenames, str):
+        filenames = sorted(glob.glob(filenames))
+    concat = {}
+    for filename in filenames:
+        polar = load_polar(filename, cache)
+        if columns is not None:
+            polar.update(columns(filename, polar))
+        mask = slice(None) if where is None else where(filename, polar)
+        for k, v in polar.items():
+            concat.setdefault(k, []).append(v[mask])
+    return {k: np.concatenate(v) for k, v in concat.items()}
+
+
+def fit_errors(fitdata, u, w):
+    "rms and max relative error of a fit at data points u, w"
+    rel = evaluate_fit(fitdata, u) / w - 1
+    return float(np.sqrt(np.mean(rel**2))), float(np.max(np.abs(rel)))
+
+
+def _max_affine(x, y, K, rng, maxiter=100):
+    """(K, d+1) max-affine fit of log-space data
+
+    Points are partitioned around K random data points, then each term is
+    refit by least squares to its partition and the points reassigned to
+    the term that is largest there, until the partition stops changing.
+    """
+    d, n = x.shape
+    A = np.vstack([np.ones(n), x]).T
+    centers = x[:, rng.choice(n, K, replace=False)]
+    part = np.argmin(((x[:, None, :] - centers[:, :, None]) ** 2).sum(axis=0), axis=0)
+    beta = np.tile(np.linalg.lstsq(A, y, rcond=None)[0], (K, 1))
+    for _ in range(maxiter):
+        for k in range(K):
+            rows = part == k
+            if rows.sum() > d:
+                beta[k] = np.linalg.lstsq(A[rows], y[rows], rcond=None)[0]
+        newpart = np.argmax(A @ beta.T, axis=1)
+        if np.array_equal(newpart, part):
+            break
+        part = newpart
+    return beta
+
+
+def _fit_terms(x, y, K, ftype, seed):
+    """c, E and a of a K-term fit of log-space data
+
+    SMA and ISMA fits start from the max-affine fit, which they approach as
+    a grows, and are refined by nonlinear least squares in log space.
+    """
+    from scipy.optimize import least_squares  # noqa: PLC0415
+
+    d = x.shape[0]
+    beta = _max_affine(x, y, K, np.random.default_rng(seed))
+    if ftype == "MA":
+        return np.exp(beta[:, 0]), beta[:, 1:], 1.0
+    X = np.vstack([np.ones_like(y), x])
+    na = K if ftype == "ISMA" else 1
+
+    def terms(p):
+        "(a*beta, a) of parameters p = (beta, log(a))"
+        a = np.exp(p[K * (d + 1) :])
+        return p[: K * (d + 1)].reshape(K, d + 1) * a[:, None], a
+
+    def residuals(p):
+        ab, a = terms(p)
+        return log_fit(ftype, ab @ X, a if na > 1 else a[0]) - y
+
+    p0 = np.concatenate([beta.ravel(), np.full(na, np.log(5.0))])
+    ab, a = terms(least_squares(residuals, p0).x)
+    return np.exp(ab[:, 0]), ab[:, 1:], a if na > 1 else float(a[0])
+
+
+def fit(x, y, K, ftype, seed=0):
+    """Fit log-space data, returning parameters in the FitCS csv format
+
+    Arguments
+    ---------
+    x : array (d, n) or (n,)
+        log of the independent variables
+    y : array (n,)
+        log of the dependent variable
+    K : int
+        number of terms; K=1 is a least-squares monomial fit
+    ftype : str
+        "MA", "SMA" or "ISMA"
+
+    rms_err and max_err are relative errors in exp(y).
+    """
+    x = np.atleast_2d(x)
+    d = x.shape[0]
+    if K == 1:
+        A = np.vstack([np.ones_like(y), x]).T
+        coef = np.linalg.lstsq(A, y, rcond=None)[0]
+        fitdata = {"ftype": ftype, "K": 1, "d": d, "c0": np.exp(coef[0])}
+        fitdata.update({"e0%d" % i: coef[i + 1] for i in range(d)})
+        fitdata["a0" if ftype == "ISMA" else "a1"] = 1.0
+    else:
+        c, E, a = _fit_terms(x, y, K, ftype, seed)
+        arrays = {"ftype": ftype, "c": c, "E": E, "a": a}
+        arrays["lb"] = arrays["ub"] = np.full(d, np.nan)  # set below
+        fitdata = flatten_fitdata(dict(arrays, rms_err=np.nan, max_err=np.nan))
+    u = np.exp(x)
+    for i in range(d):
+        fitdata["lb%d" % i] = float(u[i].min())
+        fitdata["ub%d" % i] = float(u[i].max())
+    fitdata["rms_err"] = fitdata["max_err"] = np.nan  # set below
+    fitdata["rms_err"], fitdata["max_err"] = fit_errors(fitdata, u, np.exp(y))
+    return fitdata
+
+
+def _fit_candidate(args):
+    return fit(*args)
+
+
+def fit_candidates(x, y, candidates, max_workers=None, seed=0):
+    """Fit every (K, ftype) candidate in parallel
+
+    Returns the fits sorted by rms error, fewer terms first on ties.
+    """
+    jobs = [(x, y, K, ftype, seed) for K, ftype in candidates]
+    if len(jobs) == 1 or max_workers == 1:
+        fits = [_fit_candidate(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers) as pool:
+            fits = list(pool.map(_fit_candidate, jobs))
+    return sorted(fits, key=lambda fd: (fd["rms_err"], fd["K"]))
+
+
+def write_fitdata(path, fitdata):
+    "write a fit in the one-row FitCS csv format"
+    flat = flatten_fitdata(fitdata_arrays(fitdata))
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(flat))
+        writer.writeheader()
+        writer.writerow(flat)
+
+
+class PolarFit(NamedTuple):
+    "how a packaged fit is generated from polar files"
+
+    files: str  # glob, relative to the gpkitmodels package
+    x: tuple  # polar columns of the independent variables, in FitCS order
+    y: str
+    output: str  # fit csv, relative to the gpkitmodels package
+    candidates: tuple  # (K, ftype) pairs to try
+    where: Callable = None  # where(filename, polar) -> rows to keep
+    columns: Callable = None  # columns(filename, polar) -> {title: array} to add
+
+
+def _dae51_rows(_, polar):
+    "drop the low-CL points at low Re, where the polars are not convex"
+    clmin = np.where(polar["Re"] < 150e3, 1.0, np.where(polar["Re"] < 200e3, 0.9, 0))
+    return polar["CL"] >= clmin
+
+
+def _naca_tau(filename, polar):
+    "thickness ratio of a NACA 4-digit section, from a nacaXXXX polar's name"
+    digits = re.search(r"naca(\d{4})", os.path.basename(filename)).group(1)
+    return {"tau": np.full(len(polar["CD"]), int(digits[2:]) / 100)}
+
+
+FITS = {
+    "jho1": PolarFit(
+        "GP/aircraft/wing/jho1polars/jho1.ncrit09.Re*k.pol",
+        ("CL", "Re"),
+        "CD",
+        "GP/aircraft/wing/jho_fitdata.csv",
+        ((2, "SMA"), (3, "SMA"), (4, "SMA")),
+    ),
+    "dae51": PolarFit(
+        "SP/aircraft/prop/dae51polars/dae51.ncrit09.Re*k.pol",
+        ("CL", "Re"),
+        "CD",
+        "SP/aircraft/prop/dae51_fitdata.csv",
+        ((2, "SMA"), (3, "SMA"), (4, "SMA")),
+        _dae51_rows,
+    ),
+    "tail": PolarFit(
+        "GP/aircraft/tail/tailpolars/naca*.cl0.Re*k.pol",
+        ("Re", "tau"),
+        "CD",
+        "GP/aircraft/tail/tail_dragfit.csv",
+        ((4, "MA"), (5, "MA"), (3, "SMA"), (4, "SMA")),
+        columns=_naca_tau,
+    ),
+}
+
+
+def regenerate(name, spec=None, cache=True, max_workers=None, output=None):
+    """Fit a polar set and write the best candidate's csv
+
+    Returns the written fit, or None if there are no polar files.
+    """
+    spec = spec or FITS[name]
+    pattern = os.path.join(PACKAGE_DIR, spec.files)
+    filenames = sorted(glob.glob(pattern))
+    if not filenames:
+        return None
+    polar = load_polars(filenames, cache, spec.where, spec.columns)
+    x = np.log([polar[col] for col in spec.x])
+    y = np.log(polar[spec.y])
+    best = fit_candidates(x, y, spec.candidates, max_workers)[0]
+    write_fitdata(output or os.path.join(PACKAGE_DIR, spec.output), best)
+    return best
+
+
+def main(argv=None):
+    "command line entry point"
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("names", nargs="*", help="fits to regenerate (default: all)")
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("-j", "--jobs", type=int, default=None)
+    args = parser.parse_args(argv)
+    unknown = set(args.names) - set(FITS)
+    if unknown:
+        parser.error("unknown fits %s; choose from %s" % (sorted(unknown), list(FITS)))
+    for name in args.names or FITS:
+        tic = time.time()
+        fd = regenerate(name, cache=not args.no_cache, max_workers=args.jobs)
+        if fd is None:
+            print("%s: no polar files matching %s" % (name, FITS[name].files))
+        else:
+            print(
+                "%s: %s K=%d, rms_err=%.4g, max_err=%.4g (%.1fs)"
+                % (
+                    name,
+                    fd["ftype"],
+                    fd["K"],
+                    fd["rms_err"],
+                    fd["max_err"],
+                    time.time() - tic,
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
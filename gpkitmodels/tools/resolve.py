@@ -0,0 +1,133 @@
+"""Re-solving a built model for new constant values without rebuilding it
+
+A Resolver re-solves a model at points where some of its constants (its
+`params`) change, without running the models' setup again and without
+touching the model's own substitutions:
+
+    from gpkitmodels.tools.resolve import Resolver
+
+    m = WingSizing()
+    resolver = Resolver(m, [m.wing.W])
+    for sol in resolver.stream({m.wing.W: W} for W in range(20, 200, 10)):
+        print(sol.cost, sol[m.wing.planform.S])
+
+Points may be any iterable of {variable: value} dicts (names work where
+they are unique) and are solved as they arrive. Values are in each
+variable's units unless given as quantities, and params a point leaves
+out keep the model's substitution. Linked substitutions are evaluated
+again for each point.
+
+Each point's program is generated from the built model through gpkit's
+public gp()/sp() factories and solved as by Model.solve, so solutions
+are complete, with sensitivities. Signomial programs are localsolved,
+warm-started from the previous point's solution. Models whose signomials
+become posynomials once the constants are substituted, e.g. a design
+with its free variables fixed, are solved as GPs.
+"""
+
+import warnings
+
+from gpkit.exceptions import InvalidGPConstraint
+from gpkit.nomials.substitution import parse_linked, parse_subs
+from gpkit.programs.prog_factories import evaluate_linked
+
+
+def _magnitude(key, value):
+    if hasattr(value, "to"):
+        value = value.to(key.units or "dimensionless").magnitude
+    return getattr(value, "value", value)  # FixedScalar
+
+
+class Resolver:
+    """A built model re-solved with new values of some constants
+
+    Arguments
+    ---------
+    model : Model
+        built model with its cost set
+    params : sequence of str or Variable
+        the constants whose values change between solves
+    solver : str
+        as for Model.solve (default: gpkit's default solver)
+    **solve_kwargs :
+        passed to the solver (or to localsolve for signomial programs)
+    """
+
+    def __init__(self, model, params, solver=None, **solve_kwargs):
+        self.model = model
+        self.solver = solver
+        self.solve_kwargs = solve_kwargs
+        self.params = set()
+        for param in params:
+            keys = model.varkeys.keys(param)
+            if not keys:
+                raise KeyError("no variable %s in %s" % (param, model))
+            self.params.update(keys)
+        constants = {
+            key: _magnitude(key, value)
+            for key, value in parse_subs(model.varkeys, model.substitutions).items()
+        }
+        self.linked = parse_linked(model.varkeys, model.substitutions)
+        for key in self.params:
+            if key in self.linked or key not in constants:
+                raise ValueError("%s is not a constant of %s" % (key, model))
+        if self.linked:
+            evaluate_linked(constants, self.linked)
+        self.constants = constants
+        self.symbolic = sorted(self.params | set(self.linked), key=str)
+        self.signomial = None  # found on the first solve
+        self.x0 = None  # start of the next signomial solve: the last solution
+
+    def values(self, subs=None):
+        "{VarKey: value} of the symbolic constants at a point"
+        values = {key: self.constants[key] for key in self.symbolic}
+        if subs:
+            for name in subs:
+                if name not in self.model.varkeys:
+                    raise KeyError("no variable %s in %s" % (name, self.model))
+            for key, value in parse_subs(self.model.varkeys, subs).items():
+                if key not in self.params:
+                    raise ValueError(
+                        "%s is not one of this Resolver's params; build a"
+                        " Resolver with it among them to change it" % key
+                    )
+                values[key] = _magnitude(key, value)
+        if self.linked:
+            constants = dict(self.constants)
+            constants.update(values)
+            evaluate_linked(constants, self.linked)
+            values.update({key: constants[key] for key in self.linked})
+        return values
+
+    def solve(self, subs=None):
+        "Solution of the model with the params in subs changed"
+        constants = dict(self.constants)
+        constants.update(self.values(subs))
+        linked_derivs = evaluate_linked(dict(constants), self.linked)
+        if not self.signomial:
+            try:
+                gp = self.model.gp(
+                    constants=constants,
+                    linked_derivs=linked_derivs,
+                    **self.solve_kwargs,
+                )
+            except InvalidGPConstraint:
+                self.signomial = True  # even with the constants substituted
+            else:
+                self.signomial = False
+                sol = gp.solve(self.solver, verbosity=0, **self.solve_kwargs)
+        if self.signomial:
+            sp = self.model.sp(constants=constants, linked_derivs=linked_derivs)
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")  # SP non-convergence chatter
+                sol = sp.localsolve(
+                    self.solver, verbosity=0, x0=self.x0, **self.solve_kwargs
+                )
+            self.x0 = dict(sol.primal)
+        self.model.process_result(sol)
+        return sol
+
+    def stream(self, points):
+        "solutions for each {name: value} point of an iterable, as they solve"
+        for point in points:
+            yield self.solve(point)
@@ -0,0 +1,110 @@
+"""Robust counterparts of models from their `pr` uncertainties
+
+A constant c with percent uncertainty pr lies within log(c/c0) = +-delta,
+delta = log(1 + pr/100). Since uncertain constants only scale the
+coefficients of a model's terms, each term's worst case has a closed
+form: a term with exponent a_i on each uncertain constant grows by at
+most
+
+    box:          exp(gamma * sum(|a_i| * delta_i))
+    ellipsoidal:  exp(gamma * sqrt(sum((a_i * delta_i)**2)))
+
+`counterpart` margins every term of a model's inequalities that way (the
+terms on the greater side of a signomial inequality shrink instead), and
+its cost too, so its solution is feasible for any constants in the
+uncertainty set and its cost bounds the worst case:
+
+    rm = counterpart(SimPleAC.default(), "ellipsoidal")
+    sol = rm.localsolve()
+
+Posynomials are margined term by term, which is conservative: their
+terms can't all be at their worst case at once. Equalities are kept at
+their nominal constants. The counterpart has exactly the nominal model's
+variables and constraints, only with different coefficients.
+"""
+
+import math
+
+import numpy as np
+from gpkit import ConstraintSet, Model, SignomialsEnabled
+from gpkit.nomials import NomialMap, Signomial
+from gpkit.nomials.math import (
+    MonomialEquality,
+    PosynomialInequality,
+    SignomialInequality,
+    SingleSignomialEquality,
+)
+
+from .montecarlo import uncertainties
+
+UNCERTAINTIES = ("box", "ellipsoidal")
+
+
+def margined(nomial, deltas, uncertainty="box", gamma=1.0):
+    "nomial with each term at its worst case for log(c/c0) within {key: delta}"
+    if uncertainty not in UNCERTAINTIES:
+        raise ValueError(
+            "unknown uncertainty %r; choose from %s" % (uncertainty, UNCERTAINTIES)
+        )
+    hmap = NomialMap()
+    for exp, c in nomial.hmap.items():
+        steps = np.array([exp.get(key, 0) * delta for key, delta in deltas.items()])
+        if uncertainty == "box":
+            margin = gamma * np.abs(steps).sum()
+        else:
+            margin = gamma * np.sqrt(steps @ steps)
+        hmap[exp] = c * math.exp(margin if c > 0 else -margin)
+    hmap.units = nomial.hmap.units
+    return Signomial(hmap, require_positive=False)
+
+
+def counterpart(model, uncertainty="box", gamma=1.0):
+    "model robust to its `pr` uncertainties scaled by gamma"
+    deltas = {key: math.log1p(pr / 100) for key, pr in uncertainties(model).items()}
+    constraints = []
+    for constraint in model.flat():
+        if isinstance(constraint, (MonomialEquality, SingleSignomialEquality)):
+            constraints.append(constraint)
+        elif isinstance(constraint, PosynomialInequality):
+            constraints.extend(
+                margined(posy, deltas, uncertainty, gamma) <= 1
+                for posy in constraint.unsubbed
+            )
+        elif isinstance(constraint, SignomialInequality):
+            (siglt0,) = constraint.unsubbed
+            posy, negy = margined(siglt0, deltas, uncertainty, gamma).posy_negy()
+            with SignomialsEnabled():
+                constraints.append(posy <= negy)
+        else:
+            raise TypeError(
+                "can't margin %s constraint %s" % (type(constraint), constraint)
+            )
+    cost = margined(model.cost, deltas, uncertainty, gamma)
+    # bonusvks keeps variables that only linked substitutions use
+    constraints = ConstraintSet(constraints, bonusvks=model.vks)
+    return Model(cost, constraints, substitutions=dict(model.substitutions))
+
+
+def price_of_robustness(model, design=(), uncertainty="box", gamma=1.0):
+    """{"nominal", "robust", "premium", "design"} of model and its counterpart
+
+    "nominal" and "robust" are the two solutions, "premium" the robust
+    cost's relative increase, and "design" maps each element key of the
+    `design` variables to its (nominal, robust) values.
+    """
+    robust = counterpart(model, uncertainty, gamma)
+    sols = []
+    for m in (model, robust):
+        solve = m.solve if m.is_gp() else m.localsolve
+        sols.append(solve(verbosity=0))
+    nominal, worst = sols
+    return {
+        "nominal": nominal,
+        "robust": worst,
+        "premium": worst.cost / nominal.cost - 1,
+        "design": {
+            key: (nominal.primal[key], worst.primal[key])
+            for var in design
+            for key in model.varkeys.keys(var)
+        },
+    }
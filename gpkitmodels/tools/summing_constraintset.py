@@ -1,54 +1,85 @@
-"helpers.py"
+"""Constraints summing a shared variable (e.g. weight) over models
 
-from builtins import zip
+    SummingConstraintSet(self.W, "W", [self.wing, self.fuselage])
 
-from gpkit import ConstraintSet, Variable
+constrains W to be at least the sum of the wing's and fuselage's own "W".
+Variables that a SummingConstraintSet built inside one of those models
+already sums (e.g. the wing's spar weight, if the wing sums it into its
+own W) are left out, so nothing is counted twice. What each model sums
+is indexed the first time it is asked for, from the model's own
+constraints and its submodels' index entries, and looked up after that.
+The index is keyed by the model object rather than its name or lineage,
+so it needs no clearing when model numbering is reset, and models built
+any way (cloned from a template, unpickled) are indexed alike. Models
+loaded from a ModelCache come back flat, without their summing sets, so
+they sum nothing of their own. Constraints added to a model after it is
+indexed are not seen.
+"""
+
+import weakref
+
+from gpkit import ConstraintSet, Model, Variable
+
+_SUMMED = {}  # id(model): keys summed within it, for each model indexed
+
+
+def _own_keys(model, varname):
+    "keys of the model's own (not its submodels') variables called varname"
+    return model.vks.by_name(varname) & model.unique_varkeys
 
 
 def summing_vars(models, varname):
     "returns a list of variables with shared varname in model list"
-    modelnames = set(m.lineage for m in models)
-    vkeys = []
-    for m in models:
-        for v in m.varkeys.keys(varname):
-            if v.lineage in modelnames:
-                vkeys.append(v)
-    vrs = [m[v] for m, v in zip(models, vkeys)]
-    return vrs
+    return [Variable(vk) for m in models for vk in _own_keys(m, varname)]
+
+
+def already_summed(constraints):
+    """Keys summed by the SummingConstraintSets in a model or constraint tree
+
+    For a model this is its index entry, so don't modify it.
+    """
+    if not isinstance(constraints, Model):
+        return _walk(constraints)
+    key = id(constraints)
+    if key not in _SUMMED:
+        _SUMMED[key] = frozenset(_walk(constraints))
+        weakref.finalize(constraints, _SUMMED.pop, key, None)
+    return _SUMMED[key]
+
+
+def _walk(constraints):
+    "keys summed in a constraint tree, taking its models' from the index"
+    summed = set()
+    for constraint in constraints:
+        if isinstance(constraint, SummingConstraintSet):
+            summed |= constraint._summedvars
+        elif isinstance(constraint, Model):
+            summed |= already_summed(constraint)
+        elif isinstance(constraint, list):  # including ConstraintSets
+            summed |= _walk(constraint)
+    return summed
 
 
 class SummingConstraintSet(ConstraintSet):
-    def __init__(self, lhs, varname, models=[], variables=[], **kwargs):
-        summedvars = set([v.key for v in variables])
+    def __init__(self, lhs, varname, models=(), variables=(), **kwargs):
+        summedvars = dict.fromkeys(v.key for v in variables)
         alreadysummed = set()
         for model in models:
-            twovars = 0
-            for var in model.varkeys:
-                if var.name == varname:
-                    twovars += 1
-            if twovars > 1:
-                for dvar in model.varkeys.by_name(varname):
-                    if model.lineage == dvar.lineage:
-                        mvars = model[dvar]
-            else:
-                mvars = model[varname]
-            if not hasattr(mvars, "__len__"):
-                mvars = [mvars]
-            # next line makes the recursion stop at depth one
-            # for safety to avoid double counting
-            mvars = [v for v in mvars if v.key.lineage == model.lineage]
-            assert len(mvars) == 1
-            summedvars = summedvars.union([v.key for v in mvars])
-            for constraint in model.flat():
-                if hasattr(constraint, "summedvars"):
-                    alreadysummed = alreadysummed.union(constraint.summedvars)
-        summedvars = summedvars.difference(alreadysummed)
+            vks = _own_keys(model, varname)
+            if len(vks) != 1:
+                raise ValueError(
+                    "%s has %d variables named %r of its own, not one"
+                    % (type(model).__name__, len(vks), varname)
+                )
+            summedvars.update(dict.fromkeys(vks))
+            alreadysummed |= already_summed(model)
+        self._summedvars = frozenset(summedvars).difference(alreadysummed)
         ConstraintSet.__init__(
             self,
-            [lhs >= sum(Variable(**vk.descr) for vk in summedvars)],
+            [lhs >= sum(Variable(vk) for vk in summedvars if vk in self._summedvars)],
             **kwargs,
         )
 
     @property
     def summedvars(self):
-        return set(self[0].p_lt.varkeys)
+        return set(self._summedvars)
@@ -0,0 +1,159 @@
+"""Parallel substitution sweeps over a fixed model structure
+
+Each worker process builds the model once with `factory()` and then, for
+each point, only updates substitutions and re-solves. Results are written
+to a JSON-lines file as points finish, and a point that fails to solve is
+recorded with its error rather than stopping the sweep.
+
+    from gpkitmodels.tools.sweep import sweep
+
+    records = sweep(make_mission, {"Range_m": [1000, 2000, 3000],
+                                   "W_{p_m}": [2000, 3000]},
+                    output="sweep.jsonl", outputs=["W_{f_m}", "t_m"])
+
+`factory` must be picklable (e.g. a module-level function) and return a
+Model with its cost set. Substitution values are in each variable's units,
+and substitutions a point leaves out keep the factory's values.
+"""
+
+import itertools
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import nullcontext
+
+import numpy as np
+
+from .warmstart import WarmStartStore
+
+logger = logging.getLogger(__name__)
+
+_WORKER = {}  # model and solve settings of the current worker process
+
+
+def grid_points(grid):
+    """Points of a substitution grid, as a list of {name: value} dicts
+
+    `grid` is either a dict of {name: values}, swept as a full factorial
+    (last name varying fastest), or already a sequence of point dicts.
+    """
+    if not isinstance(grid, dict):
+        return [dict(point) for point in grid]
+    names = list(grid)
+    values = [np.atleast_1d(grid[name]).tolist() for name in names]
+    return [dict(zip(names, combo)) for combo in itertools.product(*values)]
+
+
+def _value(value):
+    value = getattr(value, "magnitude", value)
+    return value.tolist() if isinstance(value, np.ndarray) else float(value)
+
+
+def _init_worker(factory, solve_kwargs, warm_start=False):
+    model = factory()
+    _WORKER["model"] = model
+    _WORKER["substitutions"] = dict(model.substitutions)  # each point's base
+    _WORKER["solve"] = model.solve if model.is_gp() else model.localsolve
+    _WORKER["solve_kwargs"] = solve_kwargs
+    if warm_start and not model.is_gp():
+        store = WarmStartStore()
+        _WORKER["solve"] = lambda **kwargs: store.localsolve(model, **kwargs)
+
+
+def _run_point(index, point, outputs):
+    "solve one point on this worker's model"
+    model = _WORKER["model"]
+    record = {"index": index, "point": point}
+    tic = time.perf_counter()
+    try:
+        model.substitutions.clear()  # points don't inherit earlier points' values
+        model.substitutions.update(_WORKER["substitutions"])
+        model.substitutions.update(point)
+        sol = _WORKER["solve"](verbosity=0, **_WORKER["solve_kwargs"])
+        record["cost"] = _value(sol.cost)
+        record["iterations"] = len(getattr(model.program, "gps", [None]))
+        record["outputs"] = {name: _value(sol.variables[name]) for name in outputs}
+    except Exception as err:  # noqa: BLE001
+        record["error"] = "%s: %s" % (type(err).__name__, str(err).splitlines()[0])
+    record["time"] = time.perf_counter() - tic
+    record["pid"] = os.getpid()
+    return record
+
+
+def sweep(  # noqa: PLR0913
+    factory,
+    grid,
+    output=None,
+    outputs=(),
+    max_workers=None,
+    solve_kwargs=None,
+    warm_start=False,
+):
+    """Solve a model at every point of a substitution grid on a process pool
+
+    Arguments
+    ---------
+    factory : callable
+        factory() returns the Model to solve; called once per worker
+    grid : dict or sequence of dicts
+        see grid_points
+    output : str
+        JSON-lines file; each record is appended as its point finishes
+    outputs : sequence of str
+        variable names whose solved values are recorded
+    max_workers : int
+        process count (default os.cpu_count()); 1 solves in this process
+    solve_kwargs : dict
+        passed to solve, or to localsolve if the model has signomials
+    warm_start : bool
+        start each signomial solve from the worker's nearest previous
+        solution (see warmstart.WarmStartStore)
+
+    Returns the records ordered by point index. Each has "index", "point",
+    "time" and either "cost", "iterations" and "outputs", or "error".
+    """
+    points = grid_points(grid)
+    solve_kwargs = dict(solve_kwargs or {})
+    outputs = list(outputs)
+    records = []
+    with open(output, "w") if output else nullcontext() as out:
+
+        def finish(record):
+            records.append(record)
+            if out:
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+
+        if max_workers == 1:
+            _init_worker(factory, solve_kwargs, warm_start)
+            for i, point in enumerate(points):
+                finish(_run_point(i, point, outputs))
+        else:
+            with ProcessPoolExecutor(
+                max_workers,
+                initializer=_init_worker,
+                initargs=(factory, solve_kwargs, warm_start),
+            ) as pool:
+                futures = {
+                    pool.submit(_run_point, i, point, outputs): (i, point)
+                    for i, point in enumerate(points)
+                }
+                for future in as_completed(futures):
+                    try:
+                        finish(future.result())
+                    except Exception as err:  # noqa: BLE001
+                        i, point = futures[future]
+                        finish({"index": i, "point": point, "error": repr(err)})
+    records.sort(key=lambda r: r["index"])
+    failed = [r for r in records if "error" in r]
+    if failed:
+        logger.warning(
+            "%d of %d sweep points failed, e.g. %s: %s",
+            len(failed),
+            len(records),
+            failed[0]["point"],
+            failed[0]["error"],
+        )
+    return records
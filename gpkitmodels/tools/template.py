@@ -0,0 +1,260 @@
+"""Copies of a built submodel without re-running its setup
+
+Building many identical submodels (e.g. the missions of a multimission
+design) spends most of its time creating variables and building
+expressions in each `setup`. A Template builds the submodel once and then
+stamps out copies by renaming the variables in its constraints:
+
+    template = Template(Mission(aircraft, 4, include_aircraft=False))
+    missions = [template.model] + [template.clone() for _ in range(9)]
+
+Each clone is a Model of the same class and tree shape, numbered as if it
+had been built again in the same place, so its variables are distinct from
+the template's and from other clones'. Submodels outside the template's
+lineage (e.g. an aircraft shared by the missions) are shared, not copied.
+Templates with linked (callable) substitutions can't be cloned.
+"""
+
+from dataclasses import replace
+
+from gpkit import ConstraintSet, Model, Variable, VarKey
+from gpkit.constraints.costed import CostedConstraintSet
+from gpkit.nomials import NomialArray, Signomial
+from gpkit.nomials.map import NomialMap
+from gpkit.nomials.math import ScalarSingleEquationConstraint
+from gpkit.util.globals import NamedVariables
+from gpkit.util.small_classes import HashVector
+from gpkit.varmap import VarSet
+
+# attributes set up again by Model.__init__ rather than copied
+_MODEL_STATE = frozenset(
+    [
+        "_children",
+        "_child_attrs",
+        "_varkeys",
+        "bounded",
+        "cgroups",
+        "computed",
+        "cost",
+        "lineage",
+        "meq_bounded",
+        "substitutions",
+        "unique_varkeys",
+        "vectorized_block",
+        "vks",
+    ]
+)
+
+# attributes set by scalar constraint constructors; the rest are solve caches
+_CONSTRAINT_STATE = (
+    "left",
+    "oper",
+    "right",
+    "vks",
+    "unsubbed",
+    "bounded",
+    "meq_bounded",
+)
+
+
+class _Internals:
+    """The private gpkit state that copying a model touches
+
+    A clone skips Model.__init__ and the constraint constructors, so it
+    sets what they would: a model's child lists (`_children`,
+    `_child_attrs`) and a constraint's empty `_las` cache. It also takes
+    the next model number from NamedVariables.modelnums, as building the
+    model again would. Nothing else in this module reaches into gpkit's
+    private state; this is what to check when gpkit changes it.
+    """
+
+    @staticmethod
+    def next_modelnum(parent, name):
+        "the number the next model named name in lineage parent gets"
+        num = NamedVariables.modelnums[(parent, name)]
+        NamedVariables.modelnums[(parent, name)] += 1
+        return num
+
+    @staticmethod
+    def children(model):
+        "a model's (child models, {attribute name: child model})"
+        return model._children, model._child_attrs
+
+    @staticmethod
+    def set_children(model, children, child_attrs):
+        "set a model's child lists, as Model.__init__ would"
+        model._children, model._child_attrs = children, child_attrs
+
+    @staticmethod
+    def reset_caches(copy, original):
+        "empty the solve caches of a constraint copied from original"
+        if "_las" in vars(original):
+            copy._las = []
+
+
+class Template:
+    """A built Model that can be copied with fresh variables
+
+    Arguments
+    ---------
+    model : Model
+        the submodel to copy; it is used as is, so keep it as the first copy
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.lineage = model.lineage
+        self._varkeys = set(model.vks)
+        for m in (model, *model.walk()):
+            self._varkeys.update(m.unique_varkeys)
+        for vk in list(self._varkeys):
+            if vk.veckey is not None:
+                self._varkeys.add(vk.veckey)
+        for vk, value in model.substitutions.items():
+            if callable(value) and self._owns(vk.lineage):
+                raise ValueError("can't clone linked substitution of %s" % vk)
+
+    def _owns(self, lineage):
+        "whether a lineage is within the template"
+        return lineage[: len(self.lineage)] == self.lineage
+
+    def clone(self):
+        "a copy of the template model with the next model number"
+        parent, (name, _) = self.lineage[:-1], self.lineage[-1]
+        num = _Internals.next_modelnum(parent, name)
+        return _Clone(self, parent + ((name, num),)).model(self.model)
+
+
+class _Clone:
+    "state for copying one template"
+
+    def __init__(self, template, lineage):
+        self.template = template
+        self.lineage = lineage
+        self.keys = {}
+        for vk in template._varkeys:
+            self.key(vk)
+        self.models = {}
+
+    def relineage(self, lineage):
+        "lineage with the template's replaced by the clone's"
+        if not self.template._owns(lineage):
+            return lineage
+        return self.lineage + lineage[len(self.template.lineage) :]
+
+    def key(self, vk):
+        "the clone's VarKey for vk"
+        if vk not in self.keys:
+            if self.template._owns(vk.lineage):
+                # units by string: hashing pint quantities is slow
+                self.keys[vk] = replace(
+                    vk,
+                    lineage=self.relineage(vk.lineage),
+                    units=vk.unitrepr if vk.units is not None else None,
+                    veckey=None if vk.veckey is None else self.key(vk.veckey),
+                )
+            else:
+                self.keys[vk] = vk
+        return self.keys[vk]
+
+    def nomial(self, nomial):
+        "a nomial or nomial array with the clone's variables"
+        if isinstance(nomial, NomialArray):
+            out = NomialArray([self.nomial(n) for n in nomial.flat])
+            out = out.reshape(nomial.shape)
+            if getattr(nomial, "key", None) is not None:
+                out.key = self.key(nomial.key)
+                out.units = nomial.units
+            return out
+        if isinstance(nomial, Variable):
+            return Variable(self.key(nomial.key))
+        hmap = NomialMap(
+            {
+                HashVector({self.key(vk): x for vk, x in exp.items()}): c
+                for exp, c in nomial.hmap.items()
+            }
+        )
+        hmap.units = nomial.hmap.units
+        return Signomial(hmap, require_positive=False)
+
+    def value(self, value):
+        "a model or constraint attribute of the clone"
+        if isinstance(value, VarKey):
+            return self.key(value)
+        if isinstance(value, Model):
+            return self.model(value) if self.template._owns(value.lineage) else value
+        if isinstance(value, (NomialArray, Signomial)):
+            return self.nomial(value)
+        if isinstance(value, dict):
+            return {self.value(k): self.value(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple, set, frozenset)):
+            cls = VarSet if isinstance(value, VarSet) else type(value)
+            return cls(self.value(v) for v in value)
+        return value
+
+    def constraint(self, constraint):
+        "a scalar constraint with the clone's variables, without its constructor"
+        state = vars(constraint)
+        copy = object.__new__(type(constraint))
+        for name in _CONSTRAINT_STATE:
+            if name in state:
+                setattr(copy, name, self.value(state[name]))
+        _Internals.reset_caches(copy, constraint)
+        copy.lineage = self.relineage(constraint.lineage)
+        return copy
+
+    def constraints(self, constraints):
+        "a constraint (set) with the clone's variables"
+        if isinstance(constraints, Model):
+            return self.value(constraints)
+        if isinstance(constraints, ScalarSingleEquationConstraint):
+            return self.constraint(constraints)
+        items = [self.constraints(c) for c in constraints]
+        if isinstance(constraints, ConstraintSet):
+            # e.g. SignomialEquality, SummingConstraintSet: set up as a plain
+            # ConstraintSet, then given the original's class and own state
+            copy = ConstraintSet(items)
+            state = vars(copy)
+            for name, value in vars(constraints).items():
+                if name not in state:
+                    setattr(copy, name, self.value(value))
+            copy.__class__ = type(constraints)
+            return copy
+        return items  # lists, and ArrayConstraints as their elements
+
+    def model(self, template):
+        "a copy of one template submodel, without calling its setup"
+        if id(template) in self.models:
+            return self.models[id(template)]
+        model = list.__new__(type(template))  # without Model.__init__
+        self.models[id(template)] = model
+        model.vectorized_block = template.vectorized_block
+        model.lineage = self.relineage(template.lineage)
+        model.unique_varkeys = frozenset(map(self.key, template.unique_varkeys))
+        for name, value in vars(template).items():
+            if name not in _MODEL_STATE:
+                setattr(model, name, self.value(value))
+        if template.cgroups is None:
+            constraints = [self.constraints(c) for c in template]
+        else:
+            constraints = {
+                name: self.constraints(template[i])
+                for name, i in template.idxlookup.items()
+            }
+        model.cgroups = None if template.cgroups is None else dict(constraints)
+        children, child_attrs = _Internals.children(template)
+        _Internals.set_children(
+            model,
+            [self.value(c) for c in children],
+            {name: self.value(c) for name, c in child_attrs.items()},
+        )
+        substitutions = {
+            self.key(vk): value
+            for vk, value in template.substitutions.items()
+            if vk in self.keys
+        }
+        CostedConstraintSet.__init__(
+            model, self.value(template.cost), constraints, substitutions
+        )
+        model.computed = {}
+        return model
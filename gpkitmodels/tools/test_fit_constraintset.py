@@ -1,8 +1,21 @@
 "Tests for FitCS"
 
+import logging
+
+import numpy as np
+import pytest
 from gpkit import Model, Variable, Vectorize
 
-from gpkitmodels.tools.fit_constraintset import FitCS
+from gpkitmodels.GP.aircraft.wing import wing
+from gpkitmodels.tools import fit_constraintset
+from gpkitmodels.tools.fit_constraintset import (
+    FitCS,
+    evaluate_fit,
+    fit_bounds_report,
+    fitdata_arrays,
+    flatten_fitdata,
+)
+from gpkitmodels.tools.fitdata import fitdata_path, load_fitdata
 
 
 def test_fitcs_sma_d1_k1():
@@ -90,3 +103,139 @@ def test_fitcs_ma_d1_k2():
     sol = m.solve(verbosity=0)
     # w >= c0*u^1.0 = 4.0, w >= c1*u^0.5 = 4.0
     assert 3.5 < sol["w"].magnitude < 4.5
+
+
+def test_fitcs_array_format_matches_flat():
+    "coefficient/exponent arrays build the same constraint as the flat dict"
+    flat = {
+        "ftype": "SMA",
+        "d": 2,
+        "K": 2,
+        "e00": 1.0,
+        "e01": 0.0,
+        "e10": 0.0,
+        "e11": 1.0,
+        "c0": 1.0,
+        "c1": 1.0,
+        "a1": 1.0,
+        "rms_err": 0.01,
+        "max_err": 0.02,
+        "lb0": 0.1,
+        "ub0": 10.0,
+        "lb1": 0.1,
+        "ub1": 10.0,
+    }
+    arrays = fitdata_arrays(flat)
+    assert arrays["E"].shape == (2, 2)
+    assert flatten_fitdata(arrays) == {k: flat[k] for k in flatten_fitdata(arrays)}
+    costs = []
+    for fitdata in [flat, arrays]:
+        with Vectorize(3):
+            w = Variable("w")
+            u1 = Variable("u_1", 2.0)
+        u2 = Variable("u_2", 3.0)
+        m = Model(w.prod(), [FitCS(fitdata, w, [u1, u2])])
+        costs.append(m.solve(verbosity=0).cost)
+    assert costs[0] == pytest.approx(costs[1])
+
+
+def test_fitcs_isma():
+    "ISMA fit: 1 >= c0*u*w^-1 + c1*u^2*w^-2"
+    fitdata = {
+        "ftype": "ISMA",
+        "c": np.array([0.5, 0.25]),
+        "E": np.array([[1.0], [2.0]]),
+        "a": np.array([1.0, 2.0]),
+        "lb": [0.1],
+        "ub": [10.0],
+        "rms_err": 0.01,
+        "max_err": 0.02,
+    }
+    w = Variable("w")
+    u = Variable("u", 2.0)
+    m = Model(w, [FitCS(fitdata, w, [u])])
+    sol = m.solve(verbosity=0)
+    # with x = u/w: 1 = 0.5x + 0.25x^2  =>  x = -1 + sqrt(5)
+    assert sol["w"].magnitude == pytest.approx(2.0 / (5**0.5 - 1), rel=1e-3)
+    cs = FitCS(fitdata, Variable("w"), [Variable("u")])
+    assert cs.evaluate(2.0) == pytest.approx(sol["w"].magnitude, rel=1e-3)
+
+
+def test_evaluate_matches_solver():
+    "evaluate() reproduces the solved ivar of a vectorized JHO1 polar fit"
+    fd = load_fitdata(fitdata_path(wing.__file__, "jho_fitdata.csv"))
+    cl = np.array([0.4, 0.8, 1.2])
+    re = np.array([2e5, 4e5, 6e5])
+    with Vectorize(3):
+        cdp = Variable("c_{d_p}")
+        CL = Variable("C_L", cl)
+        Re = Variable("Re", re)
+    cs = FitCS(fd, cdp, [CL, Re], err_margin="Max")
+    sol = Model(cdp.prod(), [cs]).solve(verbosity=0)
+    assert cs.evaluate([cl, re]) == pytest.approx(sol["c_{d_p}"].magnitude, rel=1e-4)
+    # evaluate_fit broadcasts and excludes the margin factor
+    grid = evaluate_fit(fd, [cl[:, None], re[None, :]])
+    assert grid.shape == (3, 3)
+    assert np.diag(grid) * (1 + fd["max_err"]) == pytest.approx(
+        sol["c_{d_p}"].magnitude, rel=1e-4
+    )
+
+
+def test_bounds_report(caplog):
+    "out-of-range dvar elements are reported per element, not printed"
+    fitdata = {
+        "ftype": "SMA",
+        "c": [1.0],
+        "E": [[1.0]],
+        "a": 1.0,
+        "lb": [0.5],
+        "ub": [10.0],
+        "rms_err": 0.01,
+        "max_err": 0.02,
+    }
+    with Vectorize(3):
+        w = Variable("w")
+        u = Variable("u", [0.25, 2.0, 40.0])
+    cs = FitCS(fitdata, w, [u])
+    with caplog.at_level(logging.WARNING, logger="gpkitmodels"):
+        sol = Model(w.prod(), [cs]).solve(verbosity=0)
+    report = fit_bounds_report(cs, sol)
+    assert [(v.index, v.side) for v in report] == [(2, "upper"), (0, "lower")]
+    assert report[0].value == pytest.approx(40.0)
+    assert report[0].bound == 10.0
+    assert report[0].margin == pytest.approx(3.0)
+    assert report[1].margin == pytest.approx(0.5)
+    assert len(sol.meta["warnings"]["Fit Out of Bounds"]) == 2
+    assert len(caplog.records) == 2
+
+
+def test_bounds_report_once_per_solution(monkeypatch):
+    "the first FitCS to process a solution checks every fit of the model"
+    fitdata = {
+        "ftype": "SMA",
+        "c": [1.0],
+        "E": [[1.0]],
+        "a": 1.0,
+        "lb": [0.5],
+        "ub": [10.0],
+        "rms_err": 0.01,
+        "max_err": 0.02,
+    }
+    w1, w2 = Variable("w1"), Variable("w2")
+    fits = [FitCS(fitdata, w1, [Variable("u1", 40.0)])]
+    fits.append(FitCS(fitdata, w2, [Variable("u2", 0.25)]))
+    calls = []
+
+    def counted(constraints, result):
+        calls.append(constraints)
+        return fit_bounds_report(constraints, result)
+
+    monkeypatch.setattr(fit_constraintset, "fit_bounds_report", counted)
+    m = Model(w1 * w2, fits)
+    sol = m.solve(verbosity=0)
+    assert calls == [m]
+    violations = [v for _, v in sol.meta["warnings"]["Fit Out of Bounds"]]
+    assert [(v.fit, v.side) for v in violations] == [
+        (fits[0], "upper"),
+        (fits[1], "lower"),
+    ]
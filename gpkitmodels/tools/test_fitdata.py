@@ -0,0 +1,49 @@
+"Tests for the fit data registry"
+
+import pandas as pd
+import pytest
+
+from gpkitmodels.GP.aircraft.wing import wing
+from gpkitmodels.tools.fitdata import (
+    fitdata_path,
+    load_fitdata,
+    read_fitdata,
+    register_fitdata,
+)
+
+
+def test_packaged_fit_parsed_once():
+    "repeated loads return the same cached, read-only mapping"
+    path = fitdata_path(wing.__file__, "jho_fitdata.csv")
+    fd = load_fitdata(path)
+    assert load_fitdata(path) is fd
+    with pytest.raises(TypeError):
+        fd["K"] = 2
+
+
+def test_matches_pandas():
+    "csv parsing agrees with the pandas records previously used by setup()"
+    path = fitdata_path(wing.__file__, "jho_fitdata.csv")
+    fd = read_fitdata(path)
+    (ref,) = pd.read_csv(path).to_dict(orient="records")
+    assert fd.keys() == ref.keys()
+    for k, v in ref.items():
+        if isinstance(v, str):
+            assert fd[k] == v
+        else:
+            assert fd[k] == pytest.approx(v, rel=1e-15)
+    assert isinstance(fd["K"], int) and isinstance(fd["d"], int)
+
+
+def test_register_in_memory_fit():
+    "a registered fit can be used by name wherever a fit file is accepted"
+    path = fitdata_path(wing.__file__, "jho_fitdata.csv")
+    fd = dict(load_fitdata(path))
+    fd["max_err"] = 0.5
+    stored = register_fitdata("jho1-test", fd)
+    assert load_fitdata("jho1-test") is stored
+    assert stored["max_err"] == 0.5
+    fd["max_err"] = 0.1  # registry keeps its own copy
+    assert load_fitdata("jho1-test")["max_err"] == 0.5
+    with pytest.raises(KeyError):
+        load_fitdata("not-a-registered-fit")
@@ -0,0 +1,39 @@
+"Tests for import-time budgets"
+
+import os
+
+import pytest
+
+from gpkitmodels.tools.importtime import BUDGETS, measure
+
+FIT_SCRIPTS = [
+    "gpkitmodels.GP.aircraft.fuselage.fuselage_profile_drag.fusedragfit",
+    "gpkitmodels.GP.aircraft.tail.tailpolars.naca_cl0fits",
+    "gpkitmodels.GP.aircraft.wing.arctan_fit",
+    "gpkitmodels.GP.aircraft.wing.jho1polars.jho1_polarfits",
+    "gpkitmodels.SP.aircraft.prop.dae51polars.dae51_polarfits",
+]
+
+
+def test_import_heavy():
+    "runtime modules import without heavy packages"
+    result = measure()
+    for name in BUDGETS:
+        assert result["heavy"][name] == [], name
+
+
+@pytest.mark.skipif(
+    not os.environ.get("GPKITMODELS_TIME_BUDGETS"),
+    reason="timing budgets are machine-specific; set GPKITMODELS_TIME_BUDGETS=1",
+)
+def test_import_budgets():
+    "runtime modules import within budget"
+    result = measure(repeat=2)
+    for name, budget in BUDGETS.items():
+        assert result["modules"][name] <= budget, name
+
+
+def test_fit_scripts_defer_plotting():
+    "polar fit scripts only load plotting and fitting packages when run"
+    result = measure(FIT_SCRIPTS)
+    assert result["heavy"][FIT_SCRIPTS[-1]] == []
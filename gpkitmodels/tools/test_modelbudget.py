@@ -0,0 +1,31 @@
+"Tests for catalog model budgets"
+
+from gpkitmodels.tools.modelbudget import measure, over_budget
+
+ENTRY = {
+    "id": "simpleac",
+    "module": "gpkitmodels.SP.SimPleAC.SimPleAC",
+    "class": "SimPleAC",
+    "setup_time": 0.1,
+    "solve_time": 1.0,
+    "variables": 100,
+}
+
+
+def test_measure():
+    "measurements of a catalog model's default()"
+    measured = measure(ENTRY, repeat=1)
+    assert measured["variables"] == 36
+    assert 0 < measured["setup_time"] < measured["solve_time"]
+    assert measure(ENTRY, timed=False) == {"variables": 36}
+
+
+def test_over_budget():
+    "only growth beyond the tolerances is reported"
+    within = {"setup_time": 0.24, "solve_time": 2.0, "variables": 105}
+    assert over_budget(ENTRY, within) == []
+    over = {"setup_time": 0.26, "solve_time": 0.5, "variables": 106}
+    problems = over_budget(ENTRY, over)
+    assert [p.split()[1] for p in problems] == ["setup_time", "variables"]
+    assert over_budget(ENTRY, over, {"time": 2.0, "variables": 0.1}) == []
+    assert over_budget(ENTRY, {"variables": 106}) == [problems[-1]]  # untimed
@@ -0,0 +1,80 @@
+"Tests for the on-disk model cache"
+
+import os
+
+import pytest
+from gpkit.util.globals import NamedVariables
+
+from gpkitmodels.GP.aircraft.wing.wing import Wing
+from gpkitmodels.SP.SimPleAC.SimPleAC import SimPleAC
+from gpkitmodels.tools.modelcache import ModelCache
+
+FACTORY = """
+from gpkit import Model, Variable
+
+
+def box(w):
+    x = Variable("x")
+    return Model(x, [x >= w])
+"""
+
+
+def simpleac(Range):
+    "SimPleAC sized for minimum fuel at a given range"
+    m = SimPleAC()
+    m.substitutions["Range"] = Range
+    m.cost = m.get_var("W_f")
+    return m
+
+
+@pytest.fixture
+def new_process():
+    "a function clearing model numbers as a new process would; restored after"
+    modelnums = dict(NamedVariables.modelnums)
+    yield NamedVariables.reset_modelnumbers
+    NamedVariables.modelnums.update(modelnums)
+
+
+def test_hit(tmp_path, new_process):
+    "a stored model loads with the same variables and optimum"
+    cache = ModelCache(str(tmp_path))
+    built = cache.get(simpleac, 3000)
+    assert cache.get(simpleac, 3000) is not None  # numbers taken: built again
+    assert (cache.hits, cache.misses) == (0, 2)
+    new_process()
+    loaded = cache.get(simpleac, 3000)
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert set(loaded.varkeys) == set(built.varkeys)
+    assert loaded.localsolve(verbosity=0).cost == pytest.approx(
+        built.localsolve(verbosity=0).cost, rel=1e-6
+    )
+    cache.get(simpleac, 2000)
+    assert cache.misses == 3
+
+
+def test_source_change(tmp_path, monkeypatch):
+    "editing the factory's source invalidates its entries"
+    monkeypatch.syspath_prepend(str(tmp_path))
+    source = tmp_path / "cached_factory.py"
+    source.write_text(FACTORY)
+    from cached_factory import box  # noqa: PLC0415
+
+    directory = str(tmp_path / "cache")
+    cache = ModelCache(directory)
+    cache.get(box, 2)
+    assert cache.misses == 1 and os.listdir(directory)
+    assert cache.get(box, 2).solve(verbosity=0).cost == pytest.approx(2)
+    assert cache.hits == 1
+    source.write_text(FACTORY + "# edited\n")
+    cache = ModelCache(directory)
+    cache.get(box, 2)
+    assert (cache.hits, cache.misses) == (0, 1)
+
+
+def test_linked(tmp_path):
+    "linked substitutions are only stored frozen"
+    with pytest.raises(ValueError, match="freeze_linked"):
+        ModelCache(str(tmp_path)).get(Wing, 3)
+    wing = ModelCache(str(tmp_path), freeze_linked=True).get(Wing, 3)
+    (cbar,) = wing.varkeys.by_name("cbar")
+    assert wing.substitutions[cbar] == pytest.approx([4 / 3, 1, 2 / 3])  # taper 0.5
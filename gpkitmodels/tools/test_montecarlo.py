@@ -0,0 +1,59 @@
+"Tests for Monte Carlo propagation of pr uncertainties"
+
+import numpy as np
+import pytest
+
+from gpkitmodels.SP.SimPleAC.SimPleAC import SimPleAC
+from gpkitmodels.tools.montecarlo import MonteCarlo, sample, uncertainties
+from gpkitmodels.tools.resolve import Resolver
+
+
+def simpleac():
+    "module-level, so process pools can pickle it"
+    return SimPleAC.default()
+
+
+def test_sample():
+    "samples are seeded and bounded by their uncertainties"
+    factors = sample([10.0, 50.0], 1000, "uniform", seed=1)
+    assert factors.shape == (1000, 2)
+    assert (factors == sample([10.0, 50.0], 1000, "uniform", seed=1)).all()
+    assert np.all(np.abs(np.log(factors)) <= np.log1p([0.1, 0.5]))
+    normal = np.log(sample([10.0], 10000, "normal", seed=1))
+    assert normal.std() == pytest.approx(np.log1p(0.1) / 3, rel=0.05)
+    with pytest.raises(ValueError, match="distribution"):
+        sample([10.0], 10, "cauchy")
+
+
+def test_run():
+    "a fixed SimPleAC design's cost is sampled the same on any number of workers"
+    m = simpleac()
+    prs = uncertainties(m)
+    assert len(prs) == len(m.pr)
+    assert prs[m.varkeys.keys("N_{ult}").pop()] == 15.0
+    mc = MonteCarlo(simpleac, design=["A", "S"], outputs=["W_f"], seed=3)
+    assert len(mc.design) == 2
+    with pytest.raises(RuntimeError, match="run"):
+        mc.stats()
+    runs = [list(mc.run(samples=12, chunk=4, max_workers=w)) for w in (1, 2)]
+    assert [s["samples"] for s in runs[0]] == [4, 8, 12]
+    last = runs[0][-1]
+    assert last["failed"] < last["samples"]
+    assert last["cost"][5] <= last["cost"][50] <= last["cost"][95]
+    assert last["outputs"]["W_f"][50] == pytest.approx(last["cost"][50], rel=1e-3)
+    assert runs[1][-1]["failed"] == last["failed"]
+    assert runs[1][-1]["cost"] == pytest.approx(last["cost"], rel=1e-6)
+    with pytest.raises(ValueError, match="scalar"):
+        MonteCarlo(simpleac, outputs=["not a variable"])
+
+
+def test_errors_propagate(monkeypatch):
+    "only samples the design can't meet count as failures; bugs are raised"
+    mc = MonteCarlo(simpleac, design=["A", "S"])
+
+    def broken(*_):
+        raise KeyError("not a design failure")
+
+    monkeypatch.setattr(Resolver, "solve", broken)
+    with pytest.raises(KeyError, match="design failure"):
+        list(mc.run(samples=4, chunk=4, max_workers=1))
@@ -0,0 +1,144 @@
+"Tests for the polar fitting pipeline"
+
+import os
+
+import numpy as np
+import pytest
+
+from gpkitmodels.tools.fit_constraintset import evaluate_fit
+from gpkitmodels.tools.fitdata import read_fitdata
+from gpkitmodels.tools.polarfit import (
+    FITS,
+    PACKAGE_DIR,
+    PolarFit,
+    load_polar,
+    read_polar,
+    regenerate,
+    text_to_df,
+)
+
+HEADER = """
+       XFOIL         Version 6.99
+
+ Calculated polar for: TEST
+
+ 1 1 Reynolds number fixed          Mach number fixed
+
+ xtrf =   1.000 (top)        1.000 (bottom)
+ Mach =   0.000     Re =     %.3f e 6     Ncrit =   9.000
+
+  alpha    CL        CD       CDp       CM     Top_Xtr  Bot_Xtr
+ ------- -------- --------- --------- -------- -------- --------
+"""
+
+
+def write_polar(path, Re, cl, cd=None):
+    "XFOIL-format polar with cd (default 0.3 * cl**1.5 * Re**-0.4)"
+    if cd is None:
+        cd = 0.3 * cl**1.5 * Re**-0.4
+    with open(path, "w") as f:
+        f.write(HEADER % (Re / 1e6))
+        for c, d in zip(cl, cd):
+            f.write(
+                "  %6.3f  %7.4f  %8.5f  %8.5f  %7.4f  %7.4f  %7.4f\n"
+                % (c / 0.11, c, d, d / 2, -0.05, 0.9, 0.1)
+            )
+    return str(path)
+
+
+def test_read_polar(tmp_path):
+    "columns and the header Reynolds number are parsed"
+    cl = np.linspace(0.2, 1.2, 11)
+    path = write_polar(tmp_path / "t.pol", 2.5e5, cl)
+    polar = read_polar(path)
+    assert list(polar) == [
+        "alpha",
+        "CL",
+        "CD",
+        "CDp",
+        "CM",
+        "Top_Xtr",
+        "Bot_Xtr",
+        "Re",
+    ]
+    np.testing.assert_allclose(polar["CL"], cl, atol=1e-4)
+    np.testing.assert_allclose(polar["Re"], 2.5e5)
+    df = text_to_df(path)
+    np.testing.assert_array_equal(df["CD"].values, polar["CD"])
+
+
+def test_npz_cache(tmp_path):
+    "parsed polars are reused from .npz until the polar file changes"
+    path = write_polar(tmp_path / "t.pol", 3e5, np.linspace(0.2, 1.0, 5))
+    polar = load_polar(path)
+    assert os.path.exists(path + ".npz")
+    mtime = os.path.getmtime(path + ".npz")
+    cached = load_polar(path)
+    assert os.path.getmtime(path + ".npz") == mtime
+    for k, v in polar.items():
+        np.testing.assert_array_equal(cached[k], v)
+    write_polar(path, 3e5, np.linspace(0.2, 1.0, 7))
+    os.utime(path, (mtime + 10, mtime + 10))
+    assert len(load_polar(path)["CL"]) == 7
+
+
+def test_regenerate(tmp_path):
+    "a polar set is fit over candidates in parallel and written as a FitCS csv"
+    cl = np.linspace(0.2, 1.2, 11)
+    for Re in (2e5, 4e5, 6e5):
+        write_polar(tmp_path / ("t.Re%dk.pol" % (Re / 1e3)), Re, cl)
+    spec = PolarFit(
+        str(tmp_path / "t.Re*k.pol"),
+        ("CL", "Re"),
+        "CD",
+        None,
+        ((1, "MA"), (1, "SMA"), (1, "ISMA")),
+        lambda _, polar: polar["CL"] >= 0.3,
+    )
+    out = str(tmp_path / "fit.csv")
+    best = regenerate("test", spec, output=out)
+    fd = read_fitdata(out)
+    assert fd["K"] == 1 and fd["d"] == 2
+    assert fd["rms_err"] == pytest.approx(best["rms_err"])
+    assert fd["rms_err"] < 0.01
+    assert fd["lb0"] == pytest.approx(0.3) and fd["ub1"] == pytest.approx(6e5)
+    np.testing.assert_allclose(
+        evaluate_fit(fd, [0.5, 3e5]), 0.3 * 0.5**1.5 * 3e5**-0.4, rtol=0.01
+    )
+    assert regenerate("none", spec._replace(files="missing*.pol")) is None
+
+
+def test_regenerate_packaged(tmp_path):
+    "the packaged jho1 entry's K > 1 candidates refit polars of its own fit"
+    spec = FITS["jho1"]
+    packaged = read_fitdata(os.path.join(PACKAGE_DIR, spec.output))
+    cl = np.linspace(packaged["lb0"], packaged["ub0"], 12)
+    for Re in np.geomspace(packaged["lb1"], packaged["ub1"], 5):
+        cd = evaluate_fit(packaged, [cl, np.full_like(cl, Re)])
+        write_polar(tmp_path / ("jho1.Re%dk.pol" % (Re / 1e3)), Re, cl, cd)
+    out = str(tmp_path / "fit.csv")
+    best = regenerate("jho1", spec._replace(files=str(tmp_path / "*.pol")), output=out)
+    assert best["K"] in (2, 3, 4) and best["ftype"] == "SMA"
+    fd = read_fitdata(out)
+    assert fd["rms_err"] == pytest.approx(best["rms_err"]) and fd["rms_err"] < 0.03
+    np.testing.assert_allclose(
+        evaluate_fit(fd, [0.8, 3e5]), evaluate_fit(packaged, [0.8, 3e5]), rtol=0.05
+    )
+
+
+def test_regenerate_tail(tmp_path):
+    "the tail entry reads each polar's thickness from its NACA filename"
+    spec = FITS["tail"]
+    packaged = read_fitdata(os.path.join(PACKAGE_DIR, spec.output))
+    for tau in (0.06, 0.09, 0.12):
+        for Re in np.geomspace(5e4, 8e5, 6):
+            cd = evaluate_fit(packaged, [Re, tau])
+            name = "naca00%02d.cl0.Re%dk.pol" % (tau * 100, Re / 1e3)
+            write_polar(tmp_path / name, Re, np.zeros(1), np.atleast_1d(cd))
+    out = str(tmp_path / "fit.csv")
+    best = regenerate("tail", spec._replace(files=str(tmp_path / "*.pol")), output=out)
+    assert best["lb1"] == pytest.approx(0.06) and best["ub1"] == pytest.approx(0.12)
+    assert best["rms_err"] < 0.03
+    np.testing.assert_allclose(
+        evaluate_fit(best, [2e5, 0.1]), evaluate_fit(packaged, [2e5, 0.1]), rtol=0.05
+    )
@@ -0,0 +1,64 @@
+"Tests for re-solving built models with new constants"
+
+import pytest
+
+from gpkitmodels.GP.aircraft.tail.tail_tests import EmpennageSizing
+from gpkitmodels.GP.aircraft.wing.wing_test import WingSizing
+from gpkitmodels.SP.SimPleAC.SimPleAC import SimPleAC
+from gpkitmodels.tools.resolve import Resolver
+
+
+def test_stream():
+    "streamed re-solves match solving the model at each point"
+    m = WingSizing()
+    resolver = Resolver(m, [m.wing.W, m.state.V])
+    points = [{m.wing.W: 30}, {m.wing.W: 60, m.state.V: 40}]
+    sols = list(resolver.stream(iter(points)))
+    for point, sol in zip(points, sols):
+        m.substitutions.update(point)
+        ref = m.solve(verbosity=0)
+        assert sol.cost == pytest.approx(ref.cost, rel=1e-5)
+        S = m.wing.planform.S
+        assert sol[S].magnitude == pytest.approx(ref[S].magnitude, rel=1e-4)
+    assert sols[0][m.state.V].magnitude == 50  # the model's value when built
+    assert m.wing.W.key in sols[0].sens.variables
+    assert not resolver.signomial
+
+
+def test_linked():
+    "linked substitutions follow the params they're computed from"
+    m = WingSizing()
+    lam = m.wing.planform.lam
+    sol = Resolver(m, [lam]).solve({lam: 0.4})
+    assert sol["cbar"][0] == pytest.approx(2 / 1.4)
+    m.substitutions[lam] = 0.4
+    assert sol.cost == pytest.approx(m.solve(verbosity=0).cost, rel=1e-5)
+
+
+def test_empennage():
+    "solve kwargs reach the solver, as for Model.solve"
+    m = EmpennageSizing()
+    cost = Resolver(m, [m.state.V], use_leqs=False).solve({m.state.V: 30}).cost
+    m.substitutions[m.state.V] = 30
+    assert cost == pytest.approx(m.solve(verbosity=0, use_leqs=False).cost, rel=1e-5)
+
+
+def test_errors():
+    "only params can be changed, and only constants can be params"
+    m = WingSizing()
+    with pytest.raises(ValueError, match="not a constant"):
+        Resolver(m, [m.wing.planform.S])
+    with pytest.raises(KeyError):
+        Resolver(m, ["nonexistent"])
+    with pytest.raises(ValueError, match="params"):
+        Resolver(m, [m.wing.W]).solve({m.state.V: 30})
+
+
+def test_signomial():
+    "signomial programs are localsolved on the built model"
+    m = SimPleAC.default()
+    resolver = Resolver(m, ["Range"])
+    sol = resolver.solve({"Range": 2000})
+    assert resolver.signomial
+    m.substitutions["Range"] = 2000
+    assert sol.cost == pytest.approx(m.localsolve(verbosity=0).cost, rel=1e-4)
@@ -0,0 +1,43 @@
+"Tests for robust counterparts from pr uncertainties"
+
+import pytest
+
+from gpkitmodels.GP.aircraft.wing.wing_test import WingSizing
+from gpkitmodels.SP.SimPleAC.SimPleAC import SimPleAC
+from gpkitmodels.tools.montecarlo import MonteCarlo
+from gpkitmodels.tools.robust import counterpart, price_of_robustness
+
+
+def simpleac():
+    "module-level, so process pools can pickle it"
+    return SimPleAC.default()
+
+
+def test_no_uncertainties():
+    "a model without pr uncertainties is its own counterpart"
+    m = WingSizing()
+    rm = counterpart(m)
+    assert rm.is_gp()
+    assert rm.solve(verbosity=0).cost == pytest.approx(m.solve(verbosity=0).cost)
+    with pytest.raises(ValueError, match="uncertainty"):
+        counterpart(m, "polyhedral")
+
+
+def test_simpleac():
+    "robust SimPleAC designs cost more and survive their samples"
+    m = simpleac()
+    assert len(list(counterpart(m).flat())) == len(list(m.flat()))
+    premiums = {
+        (uncertainty, gamma): price_of_robustness(m, [], uncertainty, gamma)["premium"]
+        for uncertainty in ("box", "ellipsoidal")
+        for gamma in (0.0, 0.5, 1.0)
+    }
+    assert premiums["box", 0.0] == pytest.approx(0, abs=1e-4)
+    assert 0 < premiums["ellipsoidal", 0.5] < premiums["ellipsoidal", 1.0]
+    assert premiums["ellipsoidal", 1.0] < premiums["box", 1.0]
+    price = price_of_robustness(m, ["A", "S"], "ellipsoidal")
+    design = {name: price["robust"][name] for name in ("A", "S")}
+    mc = MonteCarlo(simpleac, design=design)
+    assert mc.design["SimPleAC0.S"] == pytest.approx(design["S"].magnitude)
+    *_, stats = mc.run(samples=8, max_workers=1)
+    assert stats["failed"] == 0
@@ -0,0 +1,112 @@
+"Tests for SummingConstraintSet"
+
+import pickle
+
+import pytest
+from gpkit import Model, Var, Variable
+from gpkit.util.globals import NamedVariables
+
+from gpkitmodels.tools.summing_constraintset import (
+    SummingConstraintSet,
+    already_summed,
+    summing_vars,
+)
+from gpkitmodels.tools.template import Template
+
+
+class Part(Model):
+    "a part of unit weight"
+
+    W = Var("lbf", "weight", value=1)
+
+    def setup(self):
+        return []
+
+
+class Wing(Model):
+    "a wing weighing as much as its spar and skin"
+
+    W = Var("lbf", "weight")
+
+    def setup(self):
+        self.spar, self.skin = Part(), Part()
+        parts = [self.spar, self.skin]
+        return [SummingConstraintSet(self.W, "W", parts), parts]
+
+
+class Aircraft(Model):
+    "an aircraft whose weight sums the spar as well as the wing"
+
+    W = Var("lbf", "weight")
+
+    def setup(self):
+        self.wing, self.fuse = Wing(), Part()
+        parts = [self.wing, self.fuse, self.wing.spar]
+        return [SummingConstraintSet(self.W, "W", parts), self.wing, self.fuse]
+
+
+class Box(Model):
+    "a box whose weight sums its parts' only if `summed`"
+
+    W = Var("lbf", "weight")
+
+    def setup(self, summed):
+        self.parts = [Part(), Part()]
+        if not summed:
+            return [self.W >= self.parts[0].W, self.parts]
+        return [SummingConstraintSet(self.W, "W", self.parts), self.parts]
+
+
+def test_no_double_counting():
+    "parts already summed by a submodel are not summed again"
+    m = Aircraft()
+    assert already_summed(m.wing) == {m.wing.spar.W.key, m.wing.skin.W.key}
+    assert m[0].summedvars == {m.wing.W.key, m.fuse.W.key}
+    m.cost = m.W
+    assert m.solve(verbosity=0).cost == pytest.approx(3, rel=1e-4)
+
+
+def test_sets_found_anywhere():
+    "sets built outside a model's setup are found in its constraints too"
+    spar, skin = Part(), Part()
+    W = Variable("W", "lbf", "weight")
+    wing = Model(W, [SummingConstraintSet(W, "W", [spar, skin]), spar, skin])
+    assert already_summed(wing) == {spar.W.key, skin.W.key}
+    assert already_summed([wing, Part()]) == already_summed(wing)
+
+
+def test_summing_vars():
+    "each model's own variable, not its submodels'"
+    m = Aircraft()
+    assert [v.key for v in summing_vars([m.wing, m.fuse], "W")] == [
+        m.wing.W.key,
+        m.fuse.W.key,
+    ]
+
+
+def test_missing_variable():
+    "models without a variable of that name can't be summed"
+    m = Aircraft()
+    with pytest.raises(ValueError):
+        SummingConstraintSet(m.W, "S", [m.wing])
+
+
+def test_index():
+    "each model is indexed once; clones, unpickled and renumbered ones too"
+    m = Aircraft()
+    assert already_summed(m.wing) is already_summed(m.wing)
+    loaded = pickle.loads(pickle.dumps(m))
+    assert already_summed(loaded.wing) == already_summed(m.wing)
+    clone = Template(Wing()).clone()
+    assert already_summed(clone) == {clone.spar.W.key, clone.skin.W.key}
+    modelnums = dict(NamedVariables.modelnums)
+    try:
+        NamedVariables.reset_modelnumbers()
+        summed = Box(summed=True)
+        NamedVariables.reset_modelnumbers()
+        unsummed = Box(summed=False)
+    finally:
+        NamedVariables.modelnums.update(modelnums)
+    assert summed.lineage == unsummed.lineage
+    assert len(already_summed(summed)) == 2
+    assert already_summed(unsummed) == set()
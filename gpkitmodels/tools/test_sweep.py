@@ -0,0 +1,49 @@
+"Tests for parallel substitution sweeps"
+
+import json
+
+import pytest
+from gpkit import Model, Variable
+
+from gpkitmodels.SP.SimPleAC.SimPleAC import SimPleAC
+from gpkitmodels.tools.sweep import grid_points, sweep
+
+
+def simpleac():
+    "SimPleAC sized for minimum fuel"
+    m = SimPleAC()
+    m.cost = m.get_var("W_f")
+    return m
+
+
+def bounded():
+    "x bounded below by a and b"
+    x = Variable("x")
+    a, b = Variable("a", 1), Variable("b", 1)
+    return Model(x, [x >= a, x >= b])
+
+
+def test_grid_points():
+    "dict grids are full factorials, last name fastest"
+    assert grid_points({"a": [1, 2], "b": 3}) == [{"a": 1, "b": 3}, {"a": 2, "b": 3}]
+    assert grid_points([{"a": 1}]) == [{"a": 1}]
+
+
+def test_sweep(tmp_path):
+    "parallel points match serial ones, stream to disk, and failures are kept"
+    grid = {"Range": [1000, 3000], "V_{min}": [25, 1e-3]}
+    out = tmp_path / "sweep.jsonl"
+    records = sweep(simpleac, grid, str(out), ["A"], max_workers=2)
+    assert [r["index"] for r in records] == [0, 1, 2, 3]
+    assert ["error" in r for r in records] == [False, True, False, True]
+    lines = [json.loads(line) for line in out.read_text().splitlines()]
+    assert sorted(r["index"] for r in lines) == [0, 1, 2, 3]
+    serial = sweep(simpleac, [{"Range": 3000, "V_{min}": 25}], max_workers=1)
+    assert records[2]["cost"] == pytest.approx(serial[0]["cost"], rel=1e-4)
+    assert records[2]["outputs"]["A"] > 0
+
+
+def test_points_start_from_factory():
+    "substitutions a point leaves out keep the factory's, not earlier points'"
+    records = sweep(bounded, [{"a": 5}, {"b": 2}], max_workers=1)
+    assert [r["cost"] for r in records] == pytest.approx([5, 2])
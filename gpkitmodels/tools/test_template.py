@@ -0,0 +1,66 @@
+"Tests for cloning submodels from a template"
+
+import pytest
+from gpkit import units
+
+from gpkitmodels.SP.SimPleAC.SimPleAC_mission import Mission, SimPleAC
+from gpkitmodels.tools.template import Template
+from gpkitmodels.tools.warmstart import canonical_names
+
+SUBS = {
+    "h_{cruise_m}": 5000 * units("m"),
+    "Range_m": 3000 * units("km"),
+    "W_{p_m}": 3000 * units("N"),
+    "\\rho_{p_m}": 1500 * units("kg/m^3"),
+    "C_m": 120 * units("1/hr"),
+    "V_{min_m}": 35 * units("m/s"),
+    "T/O factor_m": 2,
+}
+
+
+def test_clone_structure():
+    "a clone matches a second setup, with its own variables"
+    template = Template(Mission(SimPleAC(), 3))
+    clone = template.clone()
+    fresh = Mission(SimPleAC(), 3)
+    num = template.model.lineage[0][1]
+    assert clone.lineage == (("Mission", num + 1),)
+    assert fresh.lineage == (("Mission", num + 2),)
+    assert sorted(canonical_names(clone.vks).values()) == sorted(
+        canonical_names(fresh.vks).values()
+    )
+    assert len(list(clone.flat())) == len(list(fresh.flat()))
+    assert [type(m) for m in clone.walk()] == [type(m) for m in fresh.walk()]
+    assert clone.get_var("W_{f_m}").key.lineage == clone.lineage
+
+
+def test_clone_attributes():
+    "clones have the attributes a setup gives, so gpkit additions are caught"
+    template = Template(Mission(SimPleAC(), 3))
+    clone, fresh = template.clone(), Mission(SimPleAC(), 3)
+    for copied, built in zip((clone, *clone.walk()), (fresh, *fresh.walk())):
+        assert set(vars(copied)) == set(vars(built)), type(built).__name__
+    for copied, built in zip(clone.flat(), fresh.flat()):
+        assert type(copied) is type(built)
+        assert set(vars(copied)) == set(vars(built)), built
+
+
+def test_clone_shares_outside_models():
+    "submodels from outside the template are shared by its clones"
+    aircraft = SimPleAC()
+    template = Template(Mission(aircraft, 3, include_aircraft=False))
+    clone = template.clone()
+    assert clone.aircraft is aircraft
+    shared = set(template.model.vks) & set(clone.vks)
+    assert shared and shared <= set(aircraft.vks)
+
+
+def test_clone_solves():
+    "a clone solves to the template's optimum"
+    template = Template(Mission(SimPleAC(), 3))
+    costs = []
+    for m in (template.model, template.clone()):
+        m.substitutions.update(SUBS)
+        m.cost = m.get_var("W_{f_m}") * units("1/N")
+        costs.append(m.localsolve(verbosity=0).cost)
+    assert costs[1] == pytest.approx(costs[0], rel=1e-4)
@@ -0,0 +1,50 @@
+"Tests for warm-started localsolve"
+
+import pytest
+
+from gpkitmodels.SP.SimPleAC.SimPleAC import SimPleAC
+from gpkitmodels.SP.SimPleAC.SimPleAC_mission import SimPleAC as MissionAircraft
+from gpkitmodels.SP.SimPleAC.SimPleAC_multimission import Multimission
+from gpkitmodels.tools.sweep import sweep
+from gpkitmodels.tools.warmstart import WarmStartStore, canonical_names
+
+
+def simpleac(Range=3000):
+    "SimPleAC sized for minimum fuel at a given range"
+    m = SimPleAC()
+    m.substitutions["Range"] = Range
+    m.cost = m.get_var("W_f")
+    return m
+
+
+def test_canonical_names():
+    "separately built models get the same names, one per variable"
+    a = canonical_names(Multimission(MissionAircraft(), 2, 3).varkeys)
+    b = canonical_names(Multimission(MissionAircraft(), 2, 3).varkeys)
+    assert sorted(a.values()) == sorted(b.values())
+    assert len(set(a.values())) == len(a)
+    assert "Multimission0.Mission1.t_m" in a.values()
+
+
+def test_warm_start():
+    "neighbouring solves start from the nearest solution and take fewer steps"
+    store = WarmStartStore()
+    store.localsolve(simpleac(3000), verbosity=0)
+    store.localsolve(simpleac(1000), verbosity=0)
+    warm = store.localsolve(simpleac(3050), verbosity=0)
+    assert [s["warm"] for s in store.stats] == [False, True, True]
+    assert store.stats[2]["iterations"] < store.stats[0]["iterations"]
+    cold = simpleac(3050).localsolve(verbosity=0)
+    assert warm.cost == pytest.approx(cold.cost, rel=1e-3)
+    summary = store.summary()
+    assert summary["cold"]["solves"] == 1 and summary["warm"]["solves"] == 2
+
+
+def test_sweep_warm_start():
+    "sweeps record SP iterations and can warm start each worker's solves"
+    grid = {"Range": [2000, 2100, 2200]}
+    cold = sweep(simpleac, grid, max_workers=1)
+    warm = sweep(simpleac, grid, max_workers=1, warm_start=True)
+    assert sum(r["iterations"] for r in warm) < sum(r["iterations"] for r in cold)
+    for c, w in zip(cold, warm):
+        assert w["cost"] == pytest.approx(c["cost"], rel=1e-3)
@@ -0,0 +1,59 @@
+"Tests for sensitivity-based what-if answers"
+
+import logging
+
+import pytest
+from gpkit.exceptions import PrimalInfeasible
+
+from gpkitmodels.GP.aircraft.wing.wing_test import WingSizing
+from gpkitmodels.SP.SimPleAC.SimPleAC import SimPleAC
+from gpkitmodels.tools.whatif import WhatIf
+
+
+def test_predict():
+    "small changes are predicted within their error estimate"
+    m = WingSizing()
+    S = m.wing.planform.S
+    whatif = WhatIf(m, [m.wing.W], outputs=[S])
+    answer = whatif.scale({m.wing.W: 1.05})
+    assert not answer["solved"]
+    assert answer == whatif.scale({m.wing.W: 1.05})  # no solves this time
+    m.substitutions[m.wing.W] *= 1.05
+    sol = m.solve(verbosity=0)
+    assert answer["cost"] == pytest.approx(sol.cost, rel=2 * answer["error"] + 1e-4)
+    assert answer["outputs"][S] == pytest.approx(sol[S].magnitude, rel=1e-2)
+
+
+def test_trust_region():
+    "changes outside the trust radius are solved for"
+    m = SimPleAC.default()
+    whatif = WhatIf(m, ["Range"], outputs=["W_f"])
+    answer = whatif.scale({"Range": 1.5})
+    assert answer["solved"] and answer["error"] == 0
+    assert whatif.stats == {"predicted": 0, "solved": 1}
+    m.substitutions["Range"] *= 1.5
+    assert answer["cost"] == pytest.approx(m.localsolve(verbosity=0).cost, rel=1e-3)
+    with pytest.raises(ValueError, match="params"):
+        whatif.scale({"V_{min}": 1.01})
+
+
+def test_infeasible_curve(monkeypatch, caplog):
+    "a param whose trust-radius solves fail is solved for, with a warning"
+    m = WingSizing()
+    whatif = WhatIf(m, [m.wing.W])
+    solve = whatif._solve
+    calls = []
+
+    def infeasible_once(subs):
+        calls.append(subs)
+        if len(calls) == 1:
+            raise PrimalInfeasible("test")
+        return solve(subs)
+
+    monkeypatch.setattr(whatif, "_solve", infeasible_once)
+    with caplog.at_level(logging.WARNING, logger="gpkitmodels"):
+        answer = whatif.scale({m.wing.W: 1.05})
+    assert answer["solved"] and len(calls) == 2
+    assert "no curvature" in caplog.text
+    m.substitutions[m.wing.W] *= 1.05
+    assert answer["cost"] == pytest.approx(m.solve(verbosity=0).cost, rel=1e-4)
@@ -0,0 +1,141 @@
+"""Warm starts for localsolve from previously converged solutions
+
+A WarmStartStore keeps converged solutions grouped by model structure.
+Before a signomial solve it passes the stored solution whose constants
+are nearest (in log space) to the model's as the initial guess `x0`, and
+it counts SP iterations so warm and cold solves can be compared.
+
+    store = WarmStartStore()
+    for Range in ranges:
+        m = make_mission()  # or one model with updated substitutions
+        m.substitutions["Range_m"] = Range
+        sol = store.localsolve(m, verbosity=0)
+    print(store.summary())
+
+Solutions carry over between separately built models of the same
+structure: variables are matched by their lineage with model instance
+numbers replaced by creation order.
+"""
+
+import hashlib
+from collections import OrderedDict, defaultdict
+
+import numpy as np
+
+
+def canonical_names(varkeys):
+    """{VarKey: name} with lineage numbers replaced by creation order
+
+    Two separately built models of the same structure give the same
+    names, e.g. "Multimission0.Mission1.Atmosphere0.h[2]".
+    """
+    varkeys = list(varkeys)
+    nums = defaultdict(set)
+    for vk in varkeys:
+        for i, (name, num) in enumerate(vk.lineage):
+            nums[(vk.lineage[:i], name)].add(num)
+    rank = {
+        group: {n: r for r, n in enumerate(sorted(ns))} for group, ns in nums.items()
+    }
+    names = {}
+    for vk in varkeys:
+        lineage = ".".join(
+            "%s%d" % (name, rank[(vk.lineage[:i], name)][num])
+            for i, (name, num) in enumerate(vk.lineage)
+        )
+        name = (lineage + "." if lineage else "") + vk.name
+        if vk.idx:
+            name += "[%s]" % ",".join(map(str, vk.idx))
+        names[vk] = name
+    return names
+
+
+def _magnitude(value):
+    return getattr(value, "magnitude", value)
+
+
+class WarmStartStore:
+    """Converged solutions by model structure, for warm-starting localsolve
+
+    Arguments
+    ---------
+    maxsize : int
+        solutions kept per structure; the oldest are dropped first
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.entries = defaultdict(OrderedDict)  # structure: {id: (logc, x)}
+        self.stats = []  # {"warm": bool, "iterations": int} per localsolve
+        self._count = 0
+
+    @staticmethod
+    def _describe(model):
+        "structure hash, canonical names, and log-constants of a model"
+        names = canonical_names(model.varkeys)
+        digest = hashlib.sha1()
+        for name in sorted(names.values()):
+            digest.update(name.encode())
+        digest.update(str(len(list(model.flat()))).encode())
+        logc = {}
+        for key, sub in model.substitutions.items():
+            value = _magnitude(sub)
+            if callable(value) or key not in names:
+                continue
+            value = np.asarray(value, dtype=float)
+            if value.size and np.all(value > 0):
+                logc[names[key]] = np.log(value).ravel()
+        return digest.hexdigest(), names, logc
+
+    @staticmethod
+    def _distance(a, b):
+        d = 0.0
+        for name in a.keys() | b.keys():
+            if name not in a or name not in b or a[name].shape != b[name].shape:
+                d += 1e3
+            else:
+                d += float(np.sum((a[name] - b[name]) ** 2))
+        return d
+
+    def x0(self, model, _description=None):
+        "initial guess for model from the nearest stored solution, or None"
+        structure, names, logc = _description or self._describe(model)
+        entries = self.entries.get(structure)
+        if not entries:
+            return None
+        _, x = min(entries.values(), key=lambda e: self._distance(logc, e[0]))
+        return {vk: x[name] for vk, name in names.items() if name in x}
+
+    def add(self, model, sol, _description=None):
+        "store a converged solution of model"
+        structure, names, logc = _description or self._describe(model)
+        x = {names[vk]: _magnitude(v) for vk, v in sol.primal.items() if vk in names}
+        entries = self.entries[structure]
+        entries[self._count] = (logc, x)
+        self._count += 1
+        while len(entries) > self.maxsize:
+            entries.popitem(last=False)
+
+    def localsolve(self, model, **kwargs):
+        "model.localsolve from the nearest stored solution; stores the result"
+        description = self._describe(model)
+        x0 = None if "x0" in kwargs else self.x0(model, description)
+        if x0:
+            kwargs["x0"] = x0
+        sol = model.localsolve(**kwargs)
+        self.stats.append(
+            {"warm": bool(x0), "iterations": len(getattr(model.program, "gps", ()))}
+        )
+        self.add(model, sol, description)
+        return sol
+
+    def summary(self):
+        "mean SP iterations of warm- and cold-started solves"
+        out = {}
+        for warm, label in ((False, "cold"), (True, "warm")):
+            its = [s["iterations"] for s in self.stats if s["warm"] == warm]
+            out[label] = {
+                "solves": len(its),
+                "mean_iterations": float(np.mean(its)) if its else None,
+            }
+        return out
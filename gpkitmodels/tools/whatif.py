@@ -0,0 +1,182 @@
+"""Fast what-if answers from a baseline solution's sensitivities
+
+A solution's `sens.variables` holds d(log cost)/d(log c) for each constant
+c, so a change in constants predicts the cost without a solve:
+
+    log(cost') ~= log(cost) + sum(sens[c] * log(c'/c))
+
+WhatIf answers questions like "what if W_{p_m} is 5% higher" that way:
+
+    whatif = WhatIf(m, ["W_{p_m}", "Range_m"], outputs=["W_{f_m}"])
+    answer = whatif.scale({"W_{p_m}": 1.05})
+    answer["cost"], answer["outputs"]["W_{f_m}"], answer["error"]
+
+The first question about a constant also solves the model with it moved
+each way by the trust radius. Those solves give the free variables'
+log-derivatives, which sensitivities don't, and the curvature behind the
+error estimate: half the curvature times the squared log change, in
+relative terms. Questions outside the trust radius, or with an estimated
+error over `tol`, are answered by a real solve warm-started from the
+baseline instead; answers say which they were. So are all questions about
+a constant whose trust-radius solves were infeasible, which is logged.
+"""
+
+import logging
+import math
+
+import numpy as np
+from gpkit.exceptions import Infeasible
+
+from .resolve import Resolver
+
+logger = logging.getLogger(__name__)
+
+
+class WhatIf:
+    """Predicted cost and outputs of a solved model for changed constants
+
+    Arguments
+    ---------
+    model : Model
+        built model with its cost set
+    params : sequence of str or Variable
+        the constants questions may change
+    outputs : sequence of str or Variable
+        free variables to predict along with the cost
+    sol : Solution
+        the model's baseline solution (default: solve it)
+    trust : float
+        trust radius in log space; larger changes are solved for
+    tol : float
+        largest estimated relative error answered without a solve
+    """
+
+    def __init__(  # noqa: PLR0913
+        self, model, params, outputs=(), sol=None, trust=0.1, tol=0.01
+    ):
+        self.trust, self.tol = trust, tol
+        self.resolver = Resolver(model, params)
+        if sol is None:
+            solve = model.solve if model.is_gp() else model.localsolve
+            sol = solve(verbosity=0)
+        self.sol = sol
+        self.logc = {
+            key: math.log(self.resolver.constants[key]) for key in self.resolver.params
+        }
+        self.sens = {key: float(sol.sens.variables.get(key, 0)) for key in self.logc}
+        self.outputs = {}  # output: its element keys
+        for output in outputs:
+            keys = sorted(model.varkeys.keys(output), key=lambda k: k.idx or ())
+            missing = [key for key in keys if key not in sol.primal]
+            if not keys or missing:
+                raise ValueError("%s is not a free variable of %s" % (output, model))
+            self.outputs[output] = keys
+        self._outkeys = [key for keys in self.outputs.values() for key in keys]
+        self.logx = np.log([sol.primal[key] for key in self._outkeys])
+        self._curves = {}  # key: (cost curvature, output slopes, output curvatures)
+        self.stats = {"predicted": 0, "solved": 0}
+
+    def _curve(self, key):
+        "derivatives of log cost and log outputs along log(key), from two solves"
+        if key not in self._curves:
+            logf = []
+            try:
+                for step in (self.trust, -self.trust):
+                    sol = self._solve({key: math.exp(self.logc[key] + step)})
+                    logf.append(
+                        (
+                            math.log(sol.cost),
+                            np.log([sol.primal[k] for k in self._outkeys]),
+                        )
+                    )
+            except Infeasible as err:
+                logger.warning(
+                    "no curvature for %s: solving at log step %+g failed (%s);"
+                    " questions changing it will be solved",
+                    key,
+                    step,
+                    err,
+                )
+                self._curves[key] = None
+                return None
+            (up, xup), (down, xdown) = logf
+            h2 = self.trust**2
+            self._curves[key] = (
+                (up - 2 * math.log(self.sol.cost) + down) / h2,
+                (xup - xdown) / (2 * self.trust),
+                (xup - 2 * self.logx + xdown) / h2,
+            )
+        return self._curves[key]
+
+    def _solve(self, subs):
+        "solution at subs, warm-started from the baseline"
+        self.resolver.x0 = dict(self.sol.primal)
+        return self.resolver.solve(subs)
+
+    def _answer(self, sol):
+        self.stats["solved"] += 1
+        return {
+            "cost": sol.cost,
+            "outputs": {
+                output: self._shaped([sol.primal[key] for key in keys])
+                for output, keys in self.outputs.items()
+            },
+            "error": 0.0,
+            "solved": True,
+        }
+
+    @staticmethod
+    def _shaped(values):
+        return float(values[0]) if len(values) == 1 else np.array(values)
+
+    def predict(self, subs):
+        """{"cost", "outputs", "error", "solved"} with the params in subs changed
+
+        `error` estimates the prediction's relative error; it is 0 for
+        answers that were solved for.
+        """
+        values = self.resolver.values(subs)
+        steps = {}
+        for key, logc in self.logc.items():
+            step = math.log(values[key]) - logc
+            if step:
+                steps[key] = step
+        if any(abs(step) > self.trust for step in steps.values()):
+            return self._answer(self._solve(subs))
+        dlogc, error = 0.0, 0.0
+        dlogx, xerror = np.zeros(len(self._outkeys)), np.zeros(len(self._outkeys))
+        for key, step in steps.items():
+            curve = self._curve(key)
+            if curve is None:
+                return self._answer(self._solve(subs))
+            ccurv, xslope, xcurv = curve
+            dlogc += self.sens[key] * step
+            error += abs(ccurv) * step**2 / 2
+            dlogx += xslope * step
+            xerror += np.abs(xcurv) * step**2 / 2
+        error = max(error, float(xerror.max(initial=0.0)))
+        if error > self.tol:
+            return self._answer(self._solve(subs))
+        self.stats["predicted"] += 1
+        x = np.exp(self.logx + dlogx)
+        outputs, i = {}, 0
+        for output, keys in self.outputs.items():
+            outputs[output] = self._shaped(x[i : i + len(keys)])
+            i += len(keys)
+        return {
+            "cost": self.sol.cost * math.exp(dlogc),
+            "outputs": outputs,
+            "error": error,
+            "solved": False,
+        }
+
+    def scale(self, factors):
+        "predict with each param in factors multiplied by its factor"
+        model = self.resolver.model
+        subs = {}
+        for name, factor in factors.items():
+            for key in model.varkeys.keys(name):
+                if key not in self.logc:
+                    raise ValueError("%s is not one of this WhatIf's params" % key)
+                subs[key] = math.exp(self.logc[key]) * factor
+        return self.predict(subs)
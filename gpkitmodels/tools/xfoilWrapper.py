@@ -1,50 +1,404 @@
 from __future__ import print_function
 
+import hashlib
+import json
+import os
+import queue
 import subprocess
+import tempfile
+import threading
+import time
 from builtins import range
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 
+XFOIL_EXECUTABLE = "/usr/local/bin/xfoil"
+CONVERGENCE_FAILED = "VISCAL:  Convergence failed\n"
+# not an OPER command: XFOIL answers it with "ENDP command not recognized"
+END_MARKER = "ENDP"
 
-def blind_call(topline, cl, Re, M, max_iter=100, pathname="/usr/local/bin/xfoil"):  # noqa: PLR0913
-
-    proc = subprocess.Popen([pathname], stdout=subprocess.PIPE, stdin=subprocess.PIPE)
-    proc.stdin.write(
-        topline
-        + "oper \n"
-        + "iter %d\n" % (max_iter)
-        + "visc \n"
-        + "%.2e \n" % (Re)
-        + "M \n"
-        + "%.2f \n" % (M)
-        + "a 2.0 \n"
-        + "cl %.4f \n" % (cl)
-        + "\n"
-        + "quit \n"
+
+def xfoil_executable(pathname=None):
+    "XFOIL binary to run: the argument, then $XFOIL_EXECUTABLE, then the default"
+    return pathname or os.environ.get("XFOIL_EXECUTABLE") or XFOIL_EXECUTABLE
+
+
+def xfoil_cache_dir(cache_dir=None):
+    "comparison cache directory: the argument, then $XFOIL_CACHE_DIR, then ~/.cache"
+    if cache_dir:
+        return cache_dir
+    return os.environ.get("XFOIL_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache", "gpkitmodels", "xfoil"
     )
-    stdout_val = proc.communicate()[0]
-    proc.stdin.close()
 
-    if "VISCAL:  Convergence failed\n" in stdout_val:
-        return stdout_val
 
+def airfoil_topline(airfoil):
+    "XFOIL commands that load `airfoil` (a .dat/.txt file or 'nacaXXXX')"
+    if (".dat" in airfoil) or (".txt" in airfoil):
+        return "load " + airfoil + " \n afl \n"
+    if ("naca" == airfoil.lower()[0:4]) and (len(airfoil) == 8):
+        return airfoil + " \n"
+    raise ValueError("invalid airfoil %r" % airfoil)
+
+
+def airfoil_hash(airfoil):
+    "hash of the airfoil geometry: coordinate file contents or NACA digits"
+    if (".dat" in airfoil) or (".txt" in airfoil):
+        with open(airfoil, "rb") as f:
+            data = f.read()
+    else:
+        data = airfoil.lower().replace(" ", "").encode()
+    return hashlib.sha256(data).hexdigest()
+
+
+def parse_point(stdout_val):
+    """Return (cd, cl, cm, alpha) from the last point in XFOIL output
+
+    Returns None if the point did not converge.
+    """
+    if CONVERGENCE_FAILED in stdout_val:
+        return None
     res = {}
-    if "VISCAL:  Convergence failed\n" not in stdout_val:
-        ostr = stdout_val.split()
-        ctr = 0
-        for i in range(0, len(ostr)):
-            ix = len(ostr) - (i + 1)
-            vl = ostr[ix]
-            if vl in ["a", "CL", "CD", "Cm"]:
-                res[vl] = ostr[ix + 2]
-                ctr += 1
-            if ctr >= 4:
-                break
-        cd = res["CD"]
-        cl = res["CL"]
-        # alpha_ret = res['a']
-        cm = res["Cm"]
-        return float(cd), float(cl), float(cm), stdout_val
+    ostr = stdout_val.split()
+    for i in range(0, len(ostr)):
+        ix = len(ostr) - (i + 1)
+        vl = ostr[ix]
+        if vl in ["a", "CL", "CD", "Cm"] and vl not in res:
+            res[vl] = ostr[ix + 2]
+        if len(res) >= 4:
+            break
+    if len(res) < 4:
+        return None
+    return float(res["CD"]), float(res["CL"]), float(res["Cm"]), float(res["a"])
+
+
+def blind_call(  # noqa: PLR0913
+    topline, cl, Re, M, max_iter=100, pathname=None, timeout=None
+):
+    proc = subprocess.Popen(
+        [xfoil_executable(pathname)],
+        stdout=subprocess.PIPE,
+        stdin=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    try:
+        stdout_val = proc.communicate(
+            topline
+            + "oper \n"
+            + "iter %d\n" % (max_iter)
+            + "visc \n"
+            + "%.2e \n" % (Re)
+            + "M \n"
+            + "%.2f \n" % (M)
+            + "a 2.0 \n"
+            + "cl %.4f \n" % (cl)
+            + "\n"
+            + "quit \n",
+            timeout=timeout,
+        )[0]
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.communicate()
+        raise
+
+    point = parse_point(stdout_val)
+    if point is None:
+        return stdout_val
+    cd, cl, cm, _ = point
+    return cd, cl, cm, stdout_val
+
+
+def _cache_name(cl, Re, M):
+    "cache file name, rounded the way blind_call passes the point to XFOIL"
+    return "Re%.2e_M%.2f_CL%.4f.json" % (Re, M, cl)
+
+
+def _read_cache(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cache(path, entry):
+    "write atomically so concurrent comparisons never see partial files"
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(entry, f)
+    os.replace(tmp, path)
+
+
+class XfoilSession:
+    """One long-running XFOIL process for an airfoil at a fixed Mach number
+
+    Arguments
+    ---------
+    airfoil : str
+        coordinate file (.dat/.txt) or NACA designation ("naca0012")
+    M : float
+        Mach number
+    pathname : str
+        XFOIL executable (default: $XFOIL_EXECUTABLE or XFOIL_EXECUTABLE)
+    max_iter : int
+        viscous iteration limit per point
+    timeout : float
+        seconds to wait for a point before restarting XFOIL
+
+    The airfoil is loaded and viscous mode set up once; each operating
+    point is then a single `cl` command, read through to the prompt that
+    ends it. After a convergence failure the boundary layer is
+    reinitialized and the point retried once, so one bad point does not
+    spoil the rest of a sweep. A session is not thread-safe; use one per
+    thread.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self, airfoil, M=0.0, pathname=None, max_iter=100, timeout=60
+    ):
+        self.topline = airfoil_topline(airfoil)
+        self.airfoil = airfoil
+        self.M = M
+        self.pathname = xfoil_executable(pathname)
+        self.max_iter = max_iter
+        self.timeout = timeout
+        self.launches = 0
+        self._proc = None
+        self._lines = None
+        self._Re = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _start(self):
+        self._proc = subprocess.Popen(
+            [self.pathname],
+            stdout=subprocess.PIPE,
+            stdin=subprocess.PIPE,
+            universal_newlines=True,
+            bufsize=1,
+            # gfortran would otherwise hold XFOIL's output in a pipe buffer
+            env=dict(os.environ, GFORTRAN_UNBUFFERED_PRECONNECTED="y"),
+        )
+        self.launches += 1
+        self._lines = queue.Queue()
+        threading.Thread(
+            target=_enqueue_lines, args=(self._proc.stdout, self._lines), daemon=True
+        ).start()
+        self._Re = None
+        self._send(self.topline + "oper \n" + "iter %d\n" % (self.max_iter))
+
+    def _send(self, text):
+        self._proc.stdin.write(text)
+        self._proc.stdin.flush()
+
+    def close(self):
+        "quit XFOIL"
+        if self._proc is None:
+            return
+        try:
+            self._send("\nquit \n")
+            self._proc.stdin.close()
+            self._proc.wait(timeout=self.timeout)
+        except (OSError, subprocess.TimeoutExpired):
+            self._proc.kill()
+            self._proc.wait()
+        self._proc = None
+
+    def _set_re(self, Re):
+        "enter viscous mode on the first point, then change Re in place"
+        key = "%.2e" % Re
+        if self._Re is None:
+            self._send("visc \n%s \nM \n%.2f \n" % (key, self.M))
+        elif key != self._Re:
+            self._send("re %s \n" % key)
+        self._Re = key
+
+    def _run(self, cl):
+        """Send one `cl` command and read its output through the ending prompt
+
+        XFOIL prints the a/CL and Cm/CD lines after every viscous iteration,
+        so the point's result is the last pair, and only the prompt after
+        them ends it. Prompts have no newline, so `cl` is followed by
+        END_MARKER, whose complaint is the first whole line after it.
+
+        Returns parse_point's tuple, None on convergence failure, or raises
+        TimeoutExpired if XFOIL stops responding or exits.
+        """
+        self._send("cl %.4f \n%s \n" % (cl, END_MARKER))
+        deadline = time.monotonic() + self.timeout
+        out = []
+        while True:
+            try:
+                line = self._lines.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                line = None
+            if line is None:
+                raise subprocess.TimeoutExpired(self.pathname, self.timeout)
+            if END_MARKER in line.upper():
+                return parse_point("".join(out))
+            out.append(line)
+
+    def _kill(self):
+        "stop XFOIL and its leftover output; the next point starts a new one"
+        self._proc.kill()
+        self._proc.wait()
+        self._proc = None
+
+    def point(self, cl, Re):
+        """Solve one operating point
+
+        Returns a dict with "converged" and, if converged, "cd", "cl" and
+        "cm"; "timed_out" is set if XFOIL stopped responding to the point.
+        A point that times out is retried once in a restarted XFOIL, and one
+        that fails to converge once after reinitializing the boundary layer.
+        """
+        timed_out = False
+        for _ in range(2):
+            if self._proc is None or self._proc.poll() is not None:
+                self._start()
+            try:
+                self._set_re(Re)
+                res = self._run(cl)
+            except (OSError, subprocess.TimeoutExpired):
+                self._kill()
+                timed_out = True
+                continue
+            if res is not None:
+                cd, cl_, cm, _ = res
+                return {"converged": True, "cd": cd, "cl": cl_, "cm": cm}
+            self._send("init \n")
+        if timed_out:
+            return {"converged": False, "timed_out": True}
+        return {"converged": False}
+
+    def polar(self, cl, Re):
+        """Solve a sweep of cl values at one or more Reynolds numbers
+
+        Returns a dict of arrays "cd", "cl" and "cm" with the broadcast
+        shape of cl and Re; points that did not converge are nan.
+        """
+        cl, Re = np.broadcast_arrays(np.asarray(cl, float), np.asarray(Re, float))
+        out = {k: np.full(cl.shape, np.nan) for k in ("cd", "cl", "cm")}
+        for idx in np.ndindex(cl.shape):
+            entry = self.point(cl[idx], Re[idx])
+            if entry["converged"]:
+                for k, v in out.items():
+                    v[idx] = entry[k]
+        return out
+
+
+def _enqueue_lines(stream, lines):
+    "reader thread: pass XFOIL's stdout line by line, then None at EOF"
+    for line in iter(stream.readline, ""):
+        lines.put(line)
+    lines.put(None)
+
+
+def _solve_points(airfoil, points, M, pathname, max_iter, timeout):  # noqa: PLR0913
+    "solve (cl, Re) points in one XFOIL session; returns cache entries"
+    with XfoilSession(airfoil, M, pathname, max_iter, timeout) as session:
+        return [session.point(cl, Re) for cl, Re in points]
+
+
+def xfoil_drag(  # noqa: PLR0913
+    airfoil,
+    cl,
+    Re,
+    M=0.0,
+    pathname=None,
+    cache_dir=None,
+    max_workers=None,
+    max_iter=100,
+    timeout=60,
+):
+    """XFOIL profile drag at each (cl, Re) point, run in parallel sessions
+
+    Arguments
+    ---------
+    airfoil : str
+        coordinate file (.dat/.txt) or NACA designation ("naca0012")
+    cl, Re : array_like
+        operating points; broadcast against each other
+    M : float
+        Mach number
+    pathname : str
+        XFOIL executable (default: $XFOIL_EXECUTABLE or XFOIL_EXECUTABLE)
+    cache_dir : str or False
+        results are cached per (airfoil geometry, Re, M, cl) in this
+        directory (default: $XFOIL_CACHE_DIR or ~/.cache/gpkitmodels/xfoil);
+        False disables the cache
+    max_workers : int
+        at most this many XFOIL sessions run at once (default: cpu count);
+        the points to run are split between them
+
+    Returns an array of cd with the broadcast shape of cl and Re; points
+    that did not converge are nan. Points that round to the same XFOIL input
+    are only run once, and convergence failures are cached too.
+    """
+    cl, Re = np.broadcast_arrays(np.asarray(cl, float), np.asarray(Re, float))
+    airfoil_topline(airfoil)  # raises ValueError for an unknown airfoil
+    if cache_dir is not False:
+        cache_dir = os.path.join(xfoil_cache_dir(cache_dir), airfoil_hash(airfoil))
+        os.makedirs(cache_dir, exist_ok=True)
+
+    names = [_cache_name(c, r, M) for c, r in zip(cl.flat, Re.flat)]
+    entries = {}
+    todo = {}
+    for name, c, r in zip(names, cl.flat, Re.flat):
+        if name in entries or name in todo:
+            continue
+        entry = _read_cache(os.path.join(cache_dir, name)) if cache_dir else None
+        if entry is None:
+            todo[name] = (c, r)
+        else:
+            entries[name] = entry
+
+    if todo:
+        # sort so each session steps through neighbouring points
+        names_todo = sorted(todo, key=lambda name: todo[name][::-1])
+        nworkers = min(max_workers or os.cpu_count(), len(names_todo))
+        chunks = np.array_split(np.arange(len(names_todo)), nworkers)
+        with ThreadPoolExecutor(nworkers) as pool:
+            futures = [
+                pool.submit(
+                    _solve_points,
+                    airfoil,
+                    [todo[names_todo[i]] for i in chunk],
+                    M,
+                    pathname,
+                    max_iter,
+                    timeout,
+                )
+                for chunk in chunks
+            ]
+            for chunk, future in zip(chunks, futures):
+                for i, entry in zip(chunk, future.result()):
+                    entries[names_todo[i]] = entry
+                    if cache_dir and not entry.pop("timed_out", False):
+                        _write_cache(os.path.join(cache_dir, names_todo[i]), entry)
+
+    cd = [
+        entries[name]["cd"] if entries[name]["converged"] else np.nan for name in names
+    ]
+    return np.array(cd).reshape(cl.shape)
+
+
+def xfoil_comparison(airfoil, cl, Re, cd, **kwargs):
+    """Compare drag coefficients against XFOIL at the same (cl, Re)
+
+    Keyword arguments are passed to `xfoil_drag`.
+
+    Returns (err, cdx): the relative error |cd/cdx - 1| and the XFOIL cd;
+    both are nan where XFOIL did not converge.
+    """
+    cdx = xfoil_drag(airfoil, cl, Re, **kwargs)
+    err = np.abs(np.asarray(cd, float) / cdx - 1)
+    return err, cdx
 
 
 def single_cl(  # noqa: PLR0913
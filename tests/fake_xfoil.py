@@ -0,0 +1,112 @@
+"""Scripted stand-in for the XFOIL executable, for offline tests
+
+Understands the part of the XFOIL command language sent by xfoilWrapper
+(airfoil loading, oper, iter, visc, re, M, a, cl, init, quit) and prints
+operating points in XFOIL's format from a smooth analytic polar. Like
+XFOIL, it prints a CL/CD summary after each of ITERATIONS viscous
+iterations, only the last of which is the converged point, ends each
+command with a prompt without a newline, and complains about commands it
+doesn't know. Points with CL above CLMAX fail to converge and leave the
+boundary layer in a state where every later point fails until `init`;
+points with CL above CLHANG never finish.
+
+If $FAKE_XFOIL_LOG is set, each launch appends a line to that file.
+"""
+
+import os
+import stat
+import sys
+import time
+
+CLMAX = 1.4
+CLHANG = 2.0
+CLALPHA = 0.11  # per degree
+ITERATIONS = 4
+KNOWN = ("load", "afl", "oper", "iter", "visc", "re", "m", "a", "cl", "init")
+
+
+def polar(cl, Re, M):
+    "analytic (cd, cm) at a given cl"
+    cd = (0.0055 + 0.009 * (cl - 0.4) ** 2) * (1e6 / Re) ** 0.25
+    return cd / (1 - M**2) ** 0.5, -0.05 - 0.01 * cl
+
+
+def point(cl, Re, M):
+    "XFOIL-style output for an operating point's viscous iterations"
+    out = []
+    for i in range(1, ITERATIONS + 1):
+        off = (ITERATIONS - i) / ITERATIONS  # the last iteration is converged
+        cd, cm = polar(cl * (1 - 0.3 * off), Re, M)
+        cd *= 1 + off
+        clk = cl * (1 - 0.3 * off)
+        out.append(
+            "   %d   rms: %.4E   max: %.4E   C at   12  1\n"
+            "       a =  %.3f      CL =  %.4f\n"
+            "      Cm = %.4f     CD =  %.5f   =>   CDf =  %.5f    CDp =  %.5f\n"
+            % (i, 0.1 * off, 0.5 * off, clk / CLALPHA, clk, cm, cd, 0.7 * cd, 0.3 * cd)
+        )
+    return "".join(out)
+
+
+def main(stdin=sys.stdin, stdout=sys.stdout):  # noqa: PLR0912
+    "run the command loop"
+    if os.environ.get("FAKE_XFOIL_LOG"):
+        with open(os.environ["FAKE_XFOIL_LOG"], "a") as f:
+            f.write("%d\n" % os.getpid())
+    Re, M = None, 0.0
+    failed = False
+    prompt = " XFOIL   c>  "
+    lines = iter(stdin)
+    stdout.write(prompt)
+    stdout.flush()
+    for line in lines:
+        cmd = line.split()
+        if not cmd:
+            continue
+        key = cmd[0].lower()
+        if key == "quit":
+            break
+        if key == "oper":
+            prompt = " .OPERi   c>  "
+        elif key == "visc":
+            Re = float(cmd[1]) if len(cmd) > 1 else float(next(lines))
+            prompt = " .OPERv   c>  "
+        elif key == "re":
+            Re = float(cmd[1])
+        elif key == "init":
+            failed = False
+        elif key == "m":
+            M = float(cmd[1]) if len(cmd) > 1 else float(next(lines))
+        elif key in ("a", "cl"):
+            value = float(cmd[1])
+            cl = value * CLALPHA if key == "a" else value
+            while cl > CLHANG:
+                time.sleep(1)
+            failed = failed or cl > CLMAX
+            stdout.write(point(cl, Re or 1e12, M))
+            if failed:
+                stdout.write(" VISCAL:  Convergence failed\n")
+        elif key not in KNOWN and not key.startswith("naca"):
+            stdout.write(
+                '\n %s command not recognized.  Type a "?" for command list\n'
+                % key[:4].upper()
+            )
+        stdout.write("\n" + prompt)
+        stdout.flush()
+
+
+def write_executable(path):
+    "write an executable script at `path` that runs this stand-in"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with open(path, "w") as f:
+        f.write(
+            "#!%s\nimport sys\nsys.path.insert(0, %r)\n"
+            "from tests.fake_xfoil import main\nmain()\n"
+            % (sys.executable, os.path.abspath(root))
+        )
+    os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR)
+    return path
+
+
+if __name__ == "__main__":
+    main()
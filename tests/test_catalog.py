@@ -1,18 +1,33 @@
 """Catalog-driven smoke test for gpkit-models."""
 
 import importlib
+import os
+import tomllib
 from pathlib import Path
 
 import pytest
 from gpkit import Model
 from gpkit.tests.test_catalog import catalog_ids, load_catalog, run_catalog_test
 
+from gpkitmodels.tools.modelbudget import measure, over_budget
+
 try:
     from gpkit.tests.test_ir import ir_diff
 except (ImportError, FileNotFoundError):
     ir_diff = None
 
 _CATALOG = load_catalog(Path(__file__))
+with open(Path(__file__).resolve().parents[1] / "catalog.toml", "rb") as _f:
+    _BUDGETS = tomllib.load(_f)
+_TOLERANCES = _BUDGETS.get("budget_tolerances")
+# times were recorded on one machine: unless GPKITMODELS_TIME_BUDGETS is set,
+# only check them for slowdowns far beyond any machine's variation
+_TIMED = bool(os.environ.get("GPKITMODELS_TIME_BUDGETS"))
+_TIME_TOLERANCES = (
+    _TOLERANCES
+    if _TIMED
+    else dict(_TOLERANCES or {}, **_BUDGETS.get("default_time_tolerances", {}))
+)
 
 
 @pytest.mark.parametrize("model_entry", _CATALOG, ids=catalog_ids(_CATALOG))
@@ -25,6 +40,8 @@ def test_catalog_ir_roundtrip(model_entry):
     """gpkit-models catalog model: IR must be identical after round-trip."""
     if ir_diff is None:
         pytest.skip("ir_diff not available (install gpkit-core from source)")
+    if not model_entry.get("ir_roundtrip", True):
+        pytest.skip("linked substitutions can't be stored in the IR")
     mod = importlib.import_module(model_entry["module"])
     cls = getattr(mod, model_entry["class"])
     m = cls.default()
@@ -33,3 +50,19 @@ def test_catalog_ir_roundtrip(model_entry):
     ir2 = m2.to_ir()
     diff = ir_diff(ir1, ir2)
     assert diff is None, f"{cls.__name__} IR changed after round-trip:\n{diff}"
+
+
+@pytest.mark.parametrize("model_entry", _CATALOG, ids=catalog_ids(_CATALOG))
+def test_catalog_size(model_entry):
+    """gpkit-models catalog model: variable count within budget."""
+    measured = measure(model_entry, timed=False)
+    problems = over_budget(model_entry, measured, _TOLERANCES)
+    assert not problems, "\n".join(problems)
+
+
+@pytest.mark.parametrize("model_entry", _CATALOG, ids=catalog_ids(_CATALOG))
+def test_catalog_time(model_entry):
+    """gpkit-models catalog model: setup and solve time within budget."""
+    measured = measure(model_entry, repeat=2 if _TIMED else 1)
+    problems = over_budget(model_entry, measured, _TIME_TOLERANCES)
+    assert not problems, "\n".join(problems)
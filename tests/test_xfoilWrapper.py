@@ -0,0 +1,129 @@
+"Tests for the XFOIL wrappers, run against the scripted stand-in"
+
+import os
+
+import numpy as np
+import pytest
+from gpkit import Model, Variable
+
+from gpkitmodels.GP.aircraft.wing import wing
+from gpkitmodels.tools.fit_constraintset import XfoilFit
+from gpkitmodels.tools.fitdata import fitdata_path, load_fitdata
+from gpkitmodels.tools.xfoilWrapper import (
+    XfoilSession,
+    xfoil_comparison,
+    xfoil_drag,
+)
+from tests import fake_xfoil
+
+
+@pytest.fixture(name="xfoil")
+def fixture_xfoil(tmp_path, monkeypatch):
+    "fake XFOIL on $XFOIL_EXECUTABLE with a private cache and launch log"
+    log = tmp_path / "launches"
+    monkeypatch.setenv(
+        "XFOIL_EXECUTABLE", fake_xfoil.write_executable(str(tmp_path / "xfoil"))
+    )
+    monkeypatch.setenv("XFOIL_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("FAKE_XFOIL_LOG", str(log))
+    return lambda: len(log.read_text().split()) if log.exists() else 0
+
+
+def test_comparison_parallel_and_cached(xfoil):
+    "points are split between sessions, repeat comparisons hit the disk cache"
+    cl = np.array([0.3, 0.5, 0.5, 0.8, 1.6])
+    re = np.array([2e5, 3e5, 3e5, 5e5, 5e5])
+    cd_ref = np.array([fake_xfoil.polar(c, r, 0.0)[0] for c, r in zip(cl, re)])
+    err, cdx = xfoil_comparison("naca0012", cl, re, 1.1 * cd_ref, max_workers=3)
+    assert xfoil() == 3  # one launch per worker
+    assert np.isnan(cdx[-1]) and np.isnan(err[-1])
+    np.testing.assert_allclose(cdx[:-1], cd_ref[:-1], rtol=1e-3)
+    np.testing.assert_allclose(err[:-1], 0.1, rtol=1e-2)
+
+    cdx2 = xfoil_drag("naca0012", cl, re)
+    assert xfoil() == 3  # failures are cached too
+    np.testing.assert_array_equal(cdx2, cdx)
+
+
+def test_session_polar(xfoil):
+    "a polar sweep is one launch and recovers after convergence failures"
+    cl = np.array([0.2, 0.6, 1.6, 0.8, 1.0])
+    with XfoilSession("naca0012") as session:
+        pol = session.polar(cl, 3e5)
+        pol2 = session.polar(cl[:2], [2e5, 4e5])
+    assert xfoil() == 1
+    ok = cl <= fake_xfoil.CLMAX
+    assert np.isnan(pol["cd"][~ok]).all()
+    np.testing.assert_allclose(pol["cl"][ok], cl[ok])
+    np.testing.assert_allclose(
+        pol["cd"][ok], [fake_xfoil.polar(c, 3e5, 0.0)[0] for c in cl[ok]], rtol=1e-3
+    )
+    np.testing.assert_allclose(
+        pol2["cd"],
+        [fake_xfoil.polar(0.2, 2e5, 0.0)[0], fake_xfoil.polar(0.6, 4e5, 0.0)[0]],
+        rtol=1e-3,
+    )
+
+
+def test_session_restarts_after_exit(xfoil):
+    "a session restarts XFOIL if the process dies mid-sweep"
+    session = XfoilSession("naca0012", timeout=5)
+    assert session.point(0.5, 3e5)["converged"]
+    session._proc.kill()  # noqa: SLF001
+    session._proc.wait()  # noqa: SLF001
+    assert session.point(0.6, 3e5)["converged"]
+    session.close()
+    assert xfoil() == 2
+
+
+def test_timeout_restarts_session(xfoil, tmp_path):
+    "a point that hangs is retried once, then later points run in a new XFOIL"
+    cl, re = np.array([0.5, 2.5, 0.6]), np.array([2e5, 3e5, 4e5])
+    cdx = xfoil_drag("naca0012", cl, re, max_workers=1, timeout=1)
+    assert xfoil() == 3  # the first launch, the retry, and the next point's
+    assert np.isnan(cdx[1])
+    np.testing.assert_allclose(
+        cdx[[0, 2]], [fake_xfoil.polar(cl[i], re[i], 0.0)[0] for i in (0, 2)], rtol=1e-3
+    )
+    (cache,) = os.listdir(tmp_path / "cache")
+    assert len(os.listdir(tmp_path / "cache" / cache)) == 2  # timeouts aren't cached
+
+
+def test_without_cache(xfoil, tmp_path):
+    "with cache_dir=False every call runs XFOIL and nothing is written"
+    cl = np.array([0.5, 1.6])
+    for launches in (1, 2):
+        cdx = xfoil_drag("naca0012", cl, 3e5, cache_dir=False)
+        assert xfoil() == launches
+    assert cdx[0] == pytest.approx(fake_xfoil.polar(0.5, 3e5, 0.0)[0], rel=1e-3)
+    assert np.isnan(cdx[1])
+    assert not (tmp_path / "cache").exists()
+
+
+def test_cache_keyed_by_geometry(xfoil, tmp_path):
+    "changing the airfoil coordinates invalidates its cached points"
+    dat = tmp_path / "foil.dat"
+    dat.write_text("foil\n1.0 0.0\n0.0 0.0\n1.0 0.0\n")
+    xfoil_drag(str(dat), 0.5, 3e5)
+    xfoil_drag("naca2412", 0.5, 3e5)
+    xfoil_drag(str(dat), 0.5, 3e5, M=0.3)
+    assert xfoil() == 3
+    xfoil_drag(str(dat), 0.5, 3e5)
+    assert xfoil() == 3
+    dat.write_text("foil\n1.0 0.0\n0.0 0.01\n1.0 0.0\n")
+    xfoil_drag(str(dat), 0.5, 3e5)
+    assert xfoil() == 4
+    assert len(os.listdir(tmp_path / "cache")) == 3
+
+
+def test_xfoilfit_process_result(xfoil):
+    "XfoilFit records drag disagreements with XFOIL as solution warnings"
+    fd = load_fitdata(fitdata_path(wing.__file__, "jho_fitdata.csv"))
+    cd, cl, re = Variable("c_d"), Variable("C_L", 1.0), Variable("Re", 4e5)
+    m = Model(cd, [XfoilFit(fd, cd, [cl, re], airfoil="naca0012")])
+    sol = m.solve(verbosity=0)
+    assert xfoil() == 1
+    cdx = fake_xfoil.polar(1.0, 4e5, 0.0)[0]
+    assert abs(sol[cd].magnitude / cdx - 1) > 0.05
+    (warning,) = sol.meta["warnings"]["Xfoil Drag Error"]
+    assert "Xfoil cd=%.6f" % cdx in warning[0]